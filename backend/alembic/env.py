@@ -11,6 +11,10 @@ from sqlalchemy.ext.asyncio import async_engine_from_config
 from app.core.config import get_settings
 from app.core.database import Base
 from app.modules.conversations import models as conversations_models  # noqa: F401
+from app.modules.jobs import models as jobs_models  # noqa: F401
+from app.modules.podcasts import models as podcasts_models  # noqa: F401
+from app.modules.projects import models as projects_models  # noqa: F401
+from app.modules.quizzes import models as quizzes_models  # noqa: F401
 
 config = context.config
 
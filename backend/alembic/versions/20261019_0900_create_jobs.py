@@ -0,0 +1,102 @@
+"""
+create jobs table
+
+Revision ID: 20261019_0900
+Revises: 20260131_1300
+Create Date: 2026-10-19 09:00:00
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "20261019_0900"
+down_revision = "20260131_1300"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(
+        "CREATE TYPE job_status AS ENUM ('queued', 'running', 'succeeded', 'failed')"
+    )
+
+    op.create_table(
+        "jobs",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("owner_id", postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column("kind", sa.String(length=100), nullable=False),
+        sa.Column(
+            "status",
+            postgresql.ENUM(
+                "queued",
+                "running",
+                "succeeded",
+                "failed",
+                name="job_status",
+                create_type=False,  # ENUM already created above
+            ),
+            nullable=False,
+            server_default=sa.text("'queued'"),
+        ),
+        sa.Column(
+            "payload",
+            postgresql.JSONB(astext_type=sa.Text()),
+            nullable=False,
+            server_default=sa.text("'{}'::jsonb"),
+        ),
+        sa.Column("result", postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("progress", sa.Float(), nullable=False, server_default=sa.text("0")),
+        sa.Column("progress_message", sa.String(length=255), nullable=True),
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        sa.Column("max_attempts", sa.Integer(), nullable=False, server_default=sa.text("5")),
+        sa.Column(
+            "run_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.text("now()"),
+        ),
+        sa.Column("locked_until", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("locked_by", sa.String(length=100), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.text("now()"),
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.text("now()"),
+        ),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+    )
+
+    op.create_index("ix_jobs_owner_id", "jobs", ["owner_id"])
+    # --- Partial index: workers only ever scan unfinished jobs ---
+    op.create_index(
+        "ix_jobs_claimable",
+        "jobs",
+        ["run_at"],
+        postgresql_where=sa.text("status IN ('queued', 'running')"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_jobs_claimable", table_name="jobs")
+    op.drop_index("ix_jobs_owner_id", table_name="jobs")
+    op.drop_table("jobs")
+
+    job_status = postgresql.ENUM(
+        "queued",
+        "running",
+        "succeeded",
+        "failed",
+        name="job_status",
+    )
+    job_status.drop(op.get_bind(), checkfirst=True)
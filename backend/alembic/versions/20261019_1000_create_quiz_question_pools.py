@@ -0,0 +1,71 @@
+"""
+create quiz question pools table
+
+Revision ID: 20261019_1000
+Revises: 20261019_0900
+Create Date: 2026-10-19 10:00:00
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "20261019_1000"
+down_revision = "20261019_0900"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE TYPE quiz_difficulty AS ENUM ('easy', 'medium', 'hard')")
+
+    op.create_table(
+        "quiz_question_pools",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("document_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column(
+            "difficulty",
+            postgresql.ENUM(
+                "easy",
+                "medium",
+                "hard",
+                name="quiz_difficulty",
+                create_type=False,  # ENUM already created above
+            ),
+            nullable=False,
+        ),
+        sa.Column(
+            "questions",
+            postgresql.JSONB(astext_type=sa.Text()),
+            nullable=False,
+            server_default=sa.text("'[]'::jsonb"),
+        ),
+        sa.Column("source_fingerprint", sa.String(length=64), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.text("now()"),
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.text("now()"),
+        ),
+        sa.UniqueConstraint(
+            "document_id",
+            "difficulty",
+            name="uq_quiz_question_pools_document_difficulty",
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("quiz_question_pools")
+
+    quiz_difficulty = postgresql.ENUM("easy", "medium", "hard", name="quiz_difficulty")
+    quiz_difficulty.drop(op.get_bind(), checkfirst=True)
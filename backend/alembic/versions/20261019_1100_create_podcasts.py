@@ -0,0 +1,106 @@
+"""
+create podcasts and podcast segments tables
+
+Revision ID: 20261019_1100
+Revises: 20261019_1000
+Create Date: 2026-10-19 11:00:00
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "20261019_1100"
+down_revision = "20261019_1000"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(
+        "CREATE TYPE podcast_status AS ENUM ('pending', 'generating', 'ready', 'failed')"
+    )
+    op.execute("CREATE TYPE podcast_segment_status AS ENUM ('pending', 'ready')")
+
+    op.create_table(
+        "podcasts",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("owner_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("title", sa.String(length=255), nullable=True),
+        sa.Column("script", sa.Text(), nullable=False),
+        sa.Column(
+            "status",
+            postgresql.ENUM(
+                "pending",
+                "generating",
+                "ready",
+                "failed",
+                name="podcast_status",
+                create_type=False,  # ENUM already created above
+            ),
+            nullable=False,
+            server_default=sa.text("'pending'"),
+        ),
+        sa.Column("segment_count", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.text("now()"),
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.text("now()"),
+        ),
+        sa.Column("first_audio_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("completed_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index("ix_podcasts_owner_id", "podcasts", ["owner_id"])
+
+    op.create_table(
+        "podcast_segments",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column(
+            "podcast_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("podcasts.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("position", sa.Integer(), nullable=False),
+        sa.Column("text", sa.Text(), nullable=False),
+        sa.Column(
+            "status",
+            postgresql.ENUM(
+                "pending",
+                "ready",
+                name="podcast_segment_status",
+                create_type=False,  # ENUM already created above
+            ),
+            nullable=False,
+            server_default=sa.text("'pending'"),
+        ),
+        sa.Column("object_key", sa.String(length=512), nullable=True),
+        sa.Column("content_type", sa.String(length=100), nullable=True),
+        sa.Column("duration_ms", sa.Integer(), nullable=True),
+        sa.Column("byte_size", sa.Integer(), nullable=True),
+        sa.Column("ready_at", sa.DateTime(timezone=True), nullable=True),
+        sa.UniqueConstraint("podcast_id", "position", name="uq_podcast_segments_podcast_position"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("podcast_segments")
+    op.drop_index("ix_podcasts_owner_id", table_name="podcasts")
+    op.drop_table("podcasts")
+
+    for name, values in (
+        ("podcast_segment_status", ("pending", "ready")),
+        ("podcast_status", ("pending", "generating", "ready", "failed")),
+    ):
+        postgresql.ENUM(*values, name=name).drop(op.get_bind(), checkfirst=True)
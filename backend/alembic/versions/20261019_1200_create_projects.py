@@ -0,0 +1,80 @@
+"""
+create projects and project stats, link conversations to projects
+
+Revision ID: 20261019_1200
+Revises: 20261019_1100
+Create Date: 2026-10-19 12:00:00
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "20261019_1200"
+down_revision = "20261019_1100"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "projects",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("owner_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("name", sa.String(length=255), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.text("now()"),
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.text("now()"),
+        ),
+    )
+    op.create_index("ix_projects_owner_id", "projects", ["owner_id"])
+
+    op.create_table(
+        "project_stats",
+        sa.Column(
+            "project_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("projects.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("conversations_count", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        sa.Column("documents_count", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        sa.Column("flashcards_count", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        sa.Column("quizzes_count", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        sa.Column("last_activity_at", sa.DateTime(timezone=True), nullable=True),
+    )
+
+    op.add_column(
+        "conversations",
+        sa.Column(
+            "project_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("projects.id", ondelete="SET NULL"),
+            nullable=True,
+        ),
+    )
+    op.create_index(
+        "ix_conversations_project_updated",
+        "conversations",
+        ["project_id", sa.text("updated_at DESC")],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_conversations_project_updated", table_name="conversations")
+    op.drop_column("conversations", "project_id")
+    op.drop_table("project_stats")
+    op.drop_index("ix_projects_owner_id", table_name="projects")
+    op.drop_table("projects")
@@ -0,0 +1,88 @@
+"""
+conversation retention: archive table, partial indexes over live rows
+
+Revision ID: 20261019_1300
+Revises: 20261019_1200
+Create Date: 2026-10-19 13:00:00
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "20261019_1300"
+down_revision = "20261019_1200"
+branch_labels = None
+depends_on = None
+
+# --- (name, columns) of the indexes rebuilt as partial indexes over non-deleted rows ---
+LIVE_INDEXES = (
+    ("ix_conversations_owner_updated", ["owner_id", sa.text("updated_at DESC")]),
+    ("ix_conversations_owner_status", ["owner_id", "status"]),
+    ("ix_conversations_project_updated", ["project_id", sa.text("updated_at DESC")]),
+)
+
+
+def _swap_index(name: str, columns: list, where: str | None) -> None:
+    # --- Build the replacement first, then swap names: list queries always have an index ---
+    op.create_index(
+        f"{name}_new",
+        "conversations",
+        columns,
+        postgresql_where=sa.text(where) if where else None,
+        postgresql_concurrently=True,
+    )
+    op.drop_index(name, table_name="conversations", postgresql_concurrently=True)
+    op.execute(f"ALTER INDEX {name}_new RENAME TO {name}")
+
+
+def upgrade() -> None:
+    op.create_table(
+        "conversations_archive",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("owner_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("project_id", postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column("title", sa.String(length=255), nullable=True),
+        sa.Column(
+            "status",
+            postgresql.ENUM(name="conversation_status", create_type=False),
+            nullable=False,
+        ),
+        sa.Column("metadata", postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("archived_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("deleted_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column(
+            "moved_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.text("now()"),
+        ),
+    )
+    op.create_index("ix_conversations_archive_owner_id", "conversations_archive", ["owner_id"])
+
+    # --- CONCURRENTLY cannot run inside a transaction; conversations stays writable throughout ---
+    with op.get_context().autocommit_block():
+        for name, columns in LIVE_INDEXES:
+            _swap_index(name, columns, "status <> 'deleted'")
+        op.create_index(
+            "ix_conversations_deleted_at",
+            "conversations",
+            ["deleted_at"],
+            postgresql_where=sa.text("status = 'deleted'"),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_conversations_deleted_at", table_name="conversations", postgresql_concurrently=True)
+        for name, columns in LIVE_INDEXES:
+            _swap_index(name, columns, None)
+
+    op.drop_index("ix_conversations_archive_owner_id", table_name="conversations_archive")
+    op.drop_table("conversations_archive")
@@ -0,0 +1,45 @@
+"""
+conversation summaries: rolling summary of older turns for context compaction
+
+Revision ID: 20261019_1400
+Revises: 20261019_1300
+Create Date: 2026-10-19 14:00:00
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "20261019_1400"
+down_revision = "20261019_1300"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "conversation_summaries",
+        sa.Column(
+            "conversation_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("conversations.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("summary", sa.Text(), nullable=False, server_default=""),
+        sa.Column("summarized_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("summary_tokens", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("requested_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.text("now()"),
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("conversation_summaries")
@@ -0,0 +1,71 @@
+"""
+shared quiz pools: key pools by source fingerprint, deduplicate in-flight jobs
+
+Revision ID: 20261019_1500
+Revises: 20261019_1400
+Create Date: 2026-10-19 15:00:00
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "20261019_1500"
+down_revision = "20261019_1400"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("jobs", sa.Column("dedupe_key", sa.String(length=255), nullable=True))
+    op.create_index(
+        "uq_jobs_in_flight_dedupe",
+        "jobs",
+        ["kind", "dedupe_key"],
+        unique=True,
+        postgresql_where=sa.text("status IN ('queued', 'running') AND dedupe_key IS NOT NULL"),
+    )
+
+    op.add_column(
+        "quiz_question_pools",
+        sa.Column("exhausted", sa.Boolean(), nullable=False, server_default=sa.text("false")),
+    )
+    op.drop_constraint(
+        "uq_quiz_question_pools_document_difficulty",
+        "quiz_question_pools",
+        type_="unique",
+    )
+    op.create_unique_constraint(
+        "uq_quiz_question_pools_document_difficulty_source",
+        "quiz_question_pools",
+        ["document_id", "difficulty", "source_fingerprint"],
+    )
+
+
+def downgrade() -> None:
+    # --- Keep the newest pool per (document, difficulty) so the old constraint holds ---
+    op.execute(
+        """
+        DELETE FROM quiz_question_pools p
+        USING quiz_question_pools newer
+        WHERE p.document_id = newer.document_id
+          AND p.difficulty = newer.difficulty
+          AND (p.updated_at, p.id) < (newer.updated_at, newer.id)
+        """
+    )
+    op.drop_constraint(
+        "uq_quiz_question_pools_document_difficulty_source",
+        "quiz_question_pools",
+        type_="unique",
+    )
+    op.create_unique_constraint(
+        "uq_quiz_question_pools_document_difficulty",
+        "quiz_question_pools",
+        ["document_id", "difficulty"],
+    )
+    op.drop_column("quiz_question_pools", "exhausted")
+
+    op.drop_index("uq_jobs_in_flight_dedupe", table_name="jobs")
+    op.drop_column("jobs", "dedupe_key")
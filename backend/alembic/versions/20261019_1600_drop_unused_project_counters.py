@@ -0,0 +1,33 @@
+"""
+drop project counters nothing maintains (documents, flashcards, quizzes)
+
+Revision ID: 20261019_1600
+Revises: 20261019_1500
+Create Date: 2026-10-19 16:00:00
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "20261019_1600"
+down_revision = "20261019_1500"
+branch_labels = None
+depends_on = None
+
+UNUSED_COUNTERS = ("documents_count", "flashcards_count", "quizzes_count")
+
+
+def upgrade() -> None:
+    for column in UNUSED_COUNTERS:
+        op.drop_column("project_stats", column)
+
+
+def downgrade() -> None:
+    for column in UNUSED_COUNTERS:
+        op.add_column(
+            "project_stats",
+            sa.Column(column, sa.Integer(), nullable=False, server_default=sa.text("0")),
+        )
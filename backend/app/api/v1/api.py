@@ -1,7 +1,21 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 
+from app.api.v1.deps import rate_limit
+from app.api.v1.metrics import router as metrics_router
 from app.modules.conversations.router import router as conversations_router
+from app.modules.jobs.router import router as jobs_router
+from app.modules.podcasts.router import router as podcasts_router
+from app.modules.projects.router import router as projects_router
+from app.modules.quizzes.router import router as quizzes_router
+from app.modules.voice.router import router as voice_router
 
 api_router = APIRouter()
 
-api_router.include_router(conversations_router)
+api_router.include_router(conversations_router, dependencies=[Depends(rate_limit("conversations"))])
+api_router.include_router(jobs_router, dependencies=[Depends(rate_limit("jobs"))])
+api_router.include_router(quizzes_router, dependencies=[Depends(rate_limit("quizzes"))])
+api_router.include_router(podcasts_router, dependencies=[Depends(rate_limit("podcasts"))])
+# --- Voice is one long-lived socket per session; its HTTP route is cheap stats ---
+api_router.include_router(voice_router)
+api_router.include_router(projects_router, dependencies=[Depends(rate_limit("projects"))])
+api_router.include_router(metrics_router, dependencies=[Depends(rate_limit("metrics"))])
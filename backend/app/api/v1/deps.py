@@ -1,13 +1,24 @@
 from __future__ import annotations
 
 import uuid
-from collections.abc import AsyncGenerator
+from collections.abc import AsyncGenerator, Awaitable, Callable
 
-from fastapi import Header
+from fastapi import Depends, Header, Query, Request, WebSocket, WebSocketException, status
+from fastapi.requests import HTTPConnection
 from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import get_settings
 from app.core.database import get_async_session
+from app.core.exceptions import AppException
+from app.core.rate_limit import (
+    RATE_LIMIT_STATE_KEY,
+    RateLimitDecision,
+    RateLimitRule,
+    get_rate_limit_backend,
+    rules_for_group,
+)
+from app.core.security import get_token_verifier
 
 
 class CurrentUser(BaseModel):
@@ -19,8 +30,132 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
         yield session
 
 
-async def get_current_user(x_user_id: str | None = Header(default=None)) -> CurrentUser:
-    # Temporary stub for testing/front-end wiring. Replace with real auth later.
-    if x_user_id:
-        return CurrentUser(id=uuid.UUID(x_user_id))
-    return CurrentUser(id=uuid.UUID("00000000-0000-0000-0000-000000000001"))
+def _resolve_user(authorization: str | None, x_user_id: str | None) -> CurrentUser:
+    settings = get_settings()
+    if authorization:
+        scheme, _, token = authorization.partition(" ")
+        if scheme.lower() != "bearer" or not token:
+            raise AppException(
+                code="UNAUTHORIZED",
+                message="Expected a Bearer token",
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        claims = get_token_verifier().verify(token.strip())
+        try:
+            return CurrentUser(id=uuid.UUID(str(claims["sub"])))
+        except ValueError:
+            raise AppException(
+                code="UNAUTHORIZED",
+                message="Token subject is not a valid user id",
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                headers={"WWW-Authenticate": "Bearer"},
+            ) from None
+    if settings.auth_dev_header_enabled and not settings.is_production:
+        return CurrentUser(id=uuid.UUID(x_user_id or "00000000-0000-0000-0000-000000000001"))
+
+    raise AppException(
+        code="UNAUTHORIZED",
+        message="Authentication required",
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+async def get_current_user(
+    connection: HTTPConnection,
+    authorization: str | None = Header(default=None),
+    x_user_id: str | None = Header(default=None),
+) -> CurrentUser:
+    """
+        Resolves the caller from a `Bearer` JWT (see `app.core.security`). The result is
+        kept on `connection.state`, so every dependency of the request shares one verification.
+        `X-User-Id` is accepted outside prod only when `auth_dev_header_enabled` is opted into.
+        Websocket routes use `get_websocket_user` instead.
+    """
+    cached = getattr(connection.state, "current_user", None)
+    if cached is not None:
+        return cached
+
+    user = _resolve_user(authorization, x_user_id)
+    connection.state.current_user = user
+    return user
+
+
+# --- Browsers cannot set headers on a websocket handshake: `new WebSocket(url, ["bearer", token])` ---
+WS_BEARER_PROTOCOL = "bearer"
+
+
+def websocket_subprotocol(websocket: WebSocket) -> str | None:
+    """
+        Subprotocol to accept with: a browser drops the connection if the one it offered
+        the token under is not echoed back.
+    """
+    return WS_BEARER_PROTOCOL if WS_BEARER_PROTOCOL in websocket.scope.get("subprotocols", ()) else None
+
+
+async def get_websocket_user(
+    websocket: WebSocket,
+    authorization: str | None = Header(default=None),
+    x_user_id: str | None = Header(default=None),
+    access_token: str | None = Query(default=None),
+) -> CurrentUser:
+    """
+        `get_current_user` for websockets. The token comes from the Authorization header,
+        the subprotocol after `bearer` in `Sec-WebSocket-Protocol`, or `?access_token=`.
+        Exception handlers do not run for websockets, so a failure closes the handshake
+        with 1008 (policy violation) instead.
+    """
+    if not authorization:
+        protocols = list(websocket.scope.get("subprotocols", ()))
+        if WS_BEARER_PROTOCOL in protocols[:-1]:
+            access_token = protocols[protocols.index(WS_BEARER_PROTOCOL) + 1]
+        if access_token:
+            authorization = f"Bearer {access_token}"
+    try:
+        user = _resolve_user(authorization, x_user_id)
+    except AppException as exc:
+        raise WebSocketException(code=status.WS_1008_POLICY_VIOLATION, reason=exc.message) from None
+    websocket.state.current_user = user
+    return user
+
+
+def rate_limit(group: str) -> Callable[..., Awaitable[None]]:
+    """
+        Per-owner limiter for a route group: every rule of the group must allow the call.
+        A rejected call is refunded to the rules that allowed it, so a burst of 429s never
+        eats into a daily quota. Rate-limit headers describe the tightest rule and are
+        added by `RateLimitHeadersMiddleware`; 429s go through the error envelope.
+    """
+    async def _rate_limit(
+        request: Request,
+        user: CurrentUser = Depends(get_current_user),
+    ) -> None:
+        settings = get_settings()
+        if not settings.rate_limit_enabled:
+            return
+        backend = get_rate_limit_backend()
+        tightest: RateLimitDecision | None = None
+        consumed: list[tuple[str, RateLimitRule]] = []
+        for rule in rules_for_group(group, settings, method=request.method):
+            key = f"{group}:{rule.name}:{user.id}"
+            decision = await backend.hit(key, rule)
+            if not decision.allowed:
+                for consumed_key, consumed_rule in consumed:
+                    await backend.refund(consumed_key, consumed_rule)
+                raise AppException(
+                    code="RATE_LIMITED",
+                    message=f"Too many requests for '{group}', retry later",
+                    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                    details=[{"group": group, "rule": rule.name, "limit": rule.limit, "period": rule.period}],
+                    headers=decision.headers(),
+                )
+            consumed.append((key, rule))
+            if tightest is None or decision.remaining < tightest.remaining:
+                tightest = decision
+        # --- Routes may stack limiters (router group + route group): report the tightest ---
+        current: RateLimitDecision | None = getattr(request.state, RATE_LIMIT_STATE_KEY, None)
+        if tightest is not None and (current is None or tightest.remaining < current.remaining):
+            setattr(request.state, RATE_LIMIT_STATE_KEY, tightest)
+
+    return _rate_limit
@@ -0,0 +1,52 @@
+from fastapi import APIRouter, Depends
+from pydantic import BaseModel
+
+from app.api.v1.deps import CurrentUser, get_current_user
+from app.core.compression import get_compression_stats
+from app.modules.conversations.context import get_context_stats
+
+router = APIRouter(prefix="/metrics", tags=["metrics"])
+
+
+class CompressionEncodingStats(BaseModel):
+    responses: int
+    streamed: int
+    bytes_in: int
+    bytes_out: int
+    ratio: float
+    cpu_ms: float
+    cpu_us_per_kib: float
+
+
+class CompressionStatsOut(BaseModel):
+    available_encodings: list[str]
+    encodings: dict[str, CompressionEncodingStats]
+    skipped_below_minimum: int
+    skipped_not_compressible: int
+    skipped_not_accepted: int
+
+
+@router.get("/compression", response_model=CompressionStatsOut)
+async def get_compression_metrics(
+    user: CurrentUser = Depends(get_current_user),
+) -> CompressionStatsOut:
+    # --- Per-worker counters: ratio gained vs. CPU spent, by encoding ---
+    return CompressionStatsOut(**get_compression_stats().snapshot())
+
+
+class ContextStatsOut(BaseModel):
+    assembled: int
+    compacted: int
+    prompt_tokens: int
+    full_tokens: int
+    saved_tokens: int
+    saved_ratio: float
+    summary_jobs: int
+
+
+@router.get("/context", response_model=ContextStatsOut)
+async def get_context_metrics(
+    user: CurrentUser = Depends(get_current_user),
+) -> ContextStatsOut:
+    # --- Per-worker estimated prompt tokens sent vs. full history, since start ---
+    return ContextStatsOut(**get_context_stats().snapshot())
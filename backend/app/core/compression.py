@@ -0,0 +1,367 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+import zlib
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Protocol
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:  # --- optional: the `compression` extra (uv sync --extra compression) ---
+    import zstandard
+except ImportError:  # pragma: no cover - depends on the environment
+    zstandard = None
+
+try:  # --- optional: the `compression` extra ---
+    import brotli
+except ImportError:  # pragma: no cover - depends on the environment
+    brotli = None
+
+
+class StreamCompressor(Protocol):
+    def compress(self, data: bytes) -> bytes: ...
+
+    def flush(self) -> bytes:
+        """
+            Emit everything buffered so far as a decodable block, keeping the stream open.
+        """
+        ...
+
+    def finish(self) -> bytes: ...
+
+
+class _GzipStream:
+    def __init__(self, level: int) -> None:
+        self._obj = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._obj.compress(data)
+
+    def flush(self) -> bytes:
+        return self._obj.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._obj.flush()
+
+
+class _BrotliStream:
+    def __init__(self, level: int) -> None:
+        self._obj = brotli.Compressor(quality=level)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._obj.process(data)
+
+    def flush(self) -> bytes:
+        return self._obj.flush()
+
+    def finish(self) -> bytes:
+        return self._obj.finish()
+
+
+class _ZstdStream:
+    def __init__(self, level: int) -> None:
+        self._obj = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._obj.compress(data)
+
+    def flush(self) -> bytes:
+        return self._obj.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        return self._obj.flush()
+
+
+@dataclass(frozen=True)
+class Codec:
+    name: str
+    compress: Callable[[bytes, int], bytes]
+    stream: Callable[[int], StreamCompressor]
+
+
+def _available_codecs() -> dict[str, Codec]:
+    codecs = {
+        "gzip": Codec("gzip", lambda data, level: _one_shot(_GzipStream(level), data), _GzipStream),
+    }
+    if brotli is not None:
+        codecs["br"] = Codec("br", lambda data, level: brotli.compress(data, quality=level), _BrotliStream)
+    if zstandard is not None:
+        codecs["zstd"] = Codec(
+            "zstd",
+            lambda data, level: zstandard.ZstdCompressor(level=level, write_content_size=True).compress(data),
+            _ZstdStream,
+        )
+    return codecs
+
+
+def _one_shot(stream: StreamCompressor, data: bytes) -> bytes:
+    return stream.compress(data) + stream.finish()
+
+
+CODECS = _available_codecs()
+
+# --- Levels per content type. Buffered JSON favours ratio; per-event flushed streams favour latency ---
+DEFAULT_LEVELS: dict[str, dict[str, int]] = {
+    "application/json": {"gzip": 6, "br": 5, "zstd": 6},
+    "application/x-ndjson": {"gzip": 4, "br": 4, "zstd": 3},
+    "text/event-stream": {"gzip": 1, "br": 1, "zstd": 1},
+    "text/": {"gzip": 6, "br": 5, "zstd": 6},
+}
+FALLBACK_LEVELS: dict[str, int] = {"gzip": 5, "br": 4, "zstd": 3}
+
+# --- Content types compressed per chunk with a flush, so each event reaches the client immediately ---
+FLUSH_PER_CHUNK = frozenset({"text/event-stream"})
+
+_COMPRESSIBLE_APPLICATION = frozenset({
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "application/xml",
+    "application/problem+json",
+})
+
+
+def media_type(content_type: str) -> str:
+    return content_type.split(";", 1)[0].strip().lower()
+
+
+def is_compressible(mime: str) -> bool:
+    # --- Audio/images/archives are already compressed: recompressing only burns CPU ---
+    return mime.startswith("text/") or mime in _COMPRESSIBLE_APPLICATION or mime.endswith("+json")
+
+
+def level_for(mime: str, encoding: str, levels: dict[str, dict[str, int]] = DEFAULT_LEVELS) -> int:
+    table = levels.get(mime) or levels.get(mime.split("/", 1)[0] + "/") or FALLBACK_LEVELS
+    return table.get(encoding, FALLBACK_LEVELS[encoding])
+
+
+@lru_cache(maxsize=256)
+def negotiate(accept_encoding: str, preferred: tuple[str, ...]) -> str | None:
+    """
+        Pick the first of `preferred` the client accepts (q > 0). Clients send a handful of
+        distinct headers, so results are memoized per header value.
+    """
+    accepted: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        token, _, params = part.strip().partition(";")
+        token = token.strip().lower()
+        if not token:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[token] = q
+    wildcard = accepted.get("*", 0.0)
+    for name in preferred:
+        if accepted.get(name, wildcard) > 0:
+            return name
+    return None
+
+
+@dataclass
+class EncodingStats:
+    responses: int = 0
+    streamed: int = 0
+    bytes_in: int = 0
+    bytes_out: int = 0
+    cpu_seconds: float = 0.0
+
+    def snapshot(self) -> dict[str, float | int]:
+        return {
+            "responses": self.responses,
+            "streamed": self.streamed,
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "ratio": self.bytes_in / self.bytes_out if self.bytes_out else 0.0,
+            "cpu_ms": self.cpu_seconds * 1000,
+            "cpu_us_per_kib": self.cpu_seconds * 1e6 / (self.bytes_in / 1024) if self.bytes_in else 0.0,
+        }
+
+
+@dataclass
+class CompressionStats:
+    """
+        Process-wide counters: how much was saved (ratio) and what it cost (CPU time spent
+        compressing), per encoding, plus why responses were left uncompressed.
+    """
+    encodings: dict[str, EncodingStats] = field(default_factory=dict)
+    skipped_below_minimum: int = 0
+    skipped_not_compressible: int = 0
+    skipped_not_accepted: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def record(self, encoding: str, *, bytes_in: int, bytes_out: int, cpu_seconds: float, streamed: bool = False) -> None:
+        with self._lock:
+            stats = self.encodings.setdefault(encoding, EncodingStats())
+            stats.bytes_in += bytes_in
+            stats.bytes_out += bytes_out
+            stats.cpu_seconds += cpu_seconds
+            if not streamed:
+                stats.responses += 1
+
+    def record_stream_start(self, encoding: str) -> None:
+        with self._lock:
+            stats = self.encodings.setdefault(encoding, EncodingStats())
+            stats.responses += 1
+            stats.streamed += 1
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "available_encodings": sorted(CODECS),
+                "encodings": {name: stats.snapshot() for name, stats in self.encodings.items()},
+                "skipped_below_minimum": self.skipped_below_minimum,
+                "skipped_not_compressible": self.skipped_not_compressible,
+                "skipped_not_accepted": self.skipped_not_accepted,
+            }
+
+
+_stats = CompressionStats()
+
+
+def get_compression_stats() -> CompressionStats:
+    return _stats
+
+
+def _timed(fn: Callable[[], bytes]) -> tuple[bytes, float]:
+    # --- thread_time: CPU of the calling thread only, unaffected by other requests on the loop ---
+    started = time.thread_time()
+    out = fn()
+    return out, time.thread_time() - started
+
+
+class CompressionMiddleware:
+    """
+        Pure ASGI middleware (no BaseHTTPMiddleware buffering).
+
+        - Single-message bodies under `minimum_size` are passed through untouched.
+        - Streamed bodies are compressed chunk by chunk as they arrive; SSE chunks are
+          flushed individually so events are never held back by the compressor.
+        - Responses that already carry Content-Encoding, or are not text-like, are skipped.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        *,
+        encodings: list[str] | tuple[str, ...] = ("zstd", "br", "gzip"),
+        minimum_size: int = 1_024,
+        offload_size: int = 256 * 1024,
+        levels: dict[str, dict[str, int]] | None = None,
+        stats: CompressionStats | None = None,
+    ) -> None:
+        self.app = app
+        self.encodings = tuple(name for name in encodings if name in CODECS)
+        self.minimum_size = minimum_size
+        self.offload_size = offload_size
+        self.levels = levels or DEFAULT_LEVELS
+        self.stats = stats or get_compression_stats()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self.encodings:
+            await self.app(scope, receive, send)
+            return
+        accept = Headers(scope=scope).get("accept-encoding", "")
+        encoding = negotiate(accept, self.encodings) if accept else None
+        if encoding is None:
+            self.stats.skipped_not_accepted += 1
+            await self.app(scope, receive, send)
+            return
+        responder = _CompressionResponder(self, CODECS[encoding], send)
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressionResponder:
+    def __init__(self, middleware: CompressionMiddleware, codec: Codec, send: Send) -> None:
+        self.middleware = middleware
+        self.codec = codec
+        self.inner_send = send
+        self.start: Message | None = None
+        self.passthrough = False
+        self.stream: StreamCompressor | None = None
+        self.flush_each_chunk = False
+        self.level = 0
+
+    async def send(self, message: Message) -> None:
+        kind = message["type"]
+        if kind == "http.response.start":
+            headers = Headers(raw=message["headers"])
+            mime = media_type(headers.get("content-type", ""))
+            if "content-encoding" in headers:
+                self.passthrough = True
+            elif not is_compressible(mime):
+                self.passthrough = True
+                self.middleware.stats.skipped_not_compressible += 1
+            self.level = level_for(mime, self.codec.name, self.middleware.levels)
+            self.flush_each_chunk = mime in FLUSH_PER_CHUNK
+            # --- Held until the first body message decides buffered vs streamed ---
+            self.start = message
+            if self.passthrough:
+                await self.inner_send(message)
+            return
+        if kind != "http.response.body" or self.passthrough:
+            await self.inner_send(message)
+            return
+
+        body: bytes = message.get("body", b"")
+        more_body: bool = message.get("more_body", False)
+        if self.stream is None and self.start is not None:
+            start, self.start = self.start, None
+            if not more_body:
+                await self._send_buffered(start, body)
+                return
+            self.stream = self.codec.stream(self.level)
+            self.middleware.stats.record_stream_start(self.codec.name)
+            headers = MutableHeaders(raw=start["headers"])
+            self._mark_encoded(headers)
+            del headers["content-length"]
+            await self.inner_send(start)
+
+        stream = self.stream
+        if more_body:
+            out, cpu = _timed(lambda: stream.compress(body) + (stream.flush() if self.flush_each_chunk else b""))
+        else:
+            out, cpu = _timed(lambda: stream.compress(body) + stream.finish())
+        self.middleware.stats.record(
+            self.codec.name, bytes_in=len(body), bytes_out=len(out), cpu_seconds=cpu, streamed=True
+        )
+        if out or not more_body:
+            await self.inner_send({"type": "http.response.body", "body": out, "more_body": more_body})
+
+    async def _send_buffered(self, start: Message, body: bytes) -> None:
+        stats = self.middleware.stats
+        if len(body) < self.middleware.minimum_size:
+            stats.skipped_below_minimum += 1
+            await self.inner_send(start)
+            await self.inner_send({"type": "http.response.body", "body": body, "more_body": False})
+            return
+
+        level = self.level
+
+        def _compress() -> tuple[bytes, float]:
+            return _timed(lambda: self.codec.compress(body, level))
+
+        if len(body) >= self.middleware.offload_size:
+            compressed, cpu = await asyncio.to_thread(_compress)
+        else:
+            compressed, cpu = _compress()
+        stats.record(self.codec.name, bytes_in=len(body), bytes_out=len(compressed), cpu_seconds=cpu)
+
+        headers = MutableHeaders(raw=start["headers"])
+        self._mark_encoded(headers)
+        headers["Content-Length"] = str(len(compressed))
+        await self.inner_send(start)
+        await self.inner_send({"type": "http.response.body", "body": compressed, "more_body": False})
+
+    def _mark_encoded(self, headers: MutableHeaders) -> None:
+        headers["Content-Encoding"] = self.codec.name
+        headers.add_vary_header("Accept-Encoding")
@@ -41,6 +41,102 @@ class Settings(BaseSettings):
     minio_bucket: str = "sanad-ai"
     # --- AI --- 
     gemini_api_key: str | None = None 
+    gemini_model: str = "gemini-2.5-flash"
+    # --- Quizzes ---
+    quiz_questions_per_call: int = 10
+    quiz_generation_concurrency: int = 4
+    quiz_similarity_threshold: float = 0.85
+    # --- Podcasts ---
+    podcast_tts_model: str = "gemini-2.5-flash-preview-tts"
+    podcast_tts_voice: str = "Kore"
+    podcast_tts_concurrency: int = 4
+    podcast_segment_max_chars: int = 600
+    podcast_first_segment_max_chars: int = 200
+    # --- Voice (PCM16 mono) ---
+    voice_sample_rate: int = 16_000
+    voice_frame_ms: int = 20
+    voice_vad_rms_threshold: float = 500.0
+    voice_vad_start_ms: int = 60
+    voice_vad_hangover_ms: int = 400
+    voice_preroll_ms: int = 200
+    voice_max_utterance_ms: int = 15_000
+    voice_inbound_buffer_ms: int = 2_000
+    voice_outbound_queue_frames: int = 100
+    voice_pending_utterances: int = 2
+    # --- GET /voice/latency aggregates all sessions in the worker: keep it off in shared deployments ---
+    voice_latency_stats_enabled: bool = False
+    # --- Auth (HMAC-signed JWT bearer tokens) ---
+    auth_jwt_algorithms: list[str] = Field(default_factory=lambda: ["HS256"])
+    # --- kid -> secret; or a JSON file of the same shape, re-read in the background for rotation ---
+    auth_jwt_keys: dict[str, str] = Field(default_factory=dict)
+    auth_jwt_keys_file: str | None = None
+    auth_jwt_issuer: str | None = None
+    auth_jwt_audience: str | None = None
+    auth_key_refresh_seconds: int = 300
+    auth_token_cache_size: int = 10_000
+    auth_clock_skew_seconds: int = 30
+    # --- Legacy X-User-Id header: off unless opted in (local .env), never honoured in prod ---
+    auth_dev_header_enabled: bool = False
+    # --- Rate Limiting (per owner and route group) ---
+    rate_limit_enabled: bool = True
+    rate_limit_per_minute: int = 120
+    rate_limit_burst: int = 40
+    rate_limit_generation_per_minute: int = 10
+    rate_limit_generation_daily_quota: int = 200
+    rate_limit_max_keys: int = 100_000
+    rate_limit_idle_ttl_seconds: int = 3_600
+    # --- Upper bound on a conversation's serialized metadata, set whole or merge-patched (None = unbounded) ---
+    conversation_metadata_max_bytes: int | None = None
+    # --- Conversation NDJSON export/import (rows per cursor fetch / per COPY+merge batch) ---
+    conversation_export_batch_size: int = 2_000
+    conversation_import_batch_size: int = 5_000
+    # --- Longer NDJSON lines are rejected as invalid rows without being buffered ---
+    conversation_import_max_line_bytes: int = 1_048_576
+    # --- Conversation change feed (SSE) ---
+    conversation_feed_queue_size: int = 256
+    conversation_feed_heartbeat_seconds: float = 15.0
+    conversation_feed_catchup_limit: int = 1_000
+    # --- Replay re-reads this far before the cursor: a write stamped earlier may commit later ---
+    conversation_feed_replay_overlap_seconds: float = 5.0
+    # --- Catch-up query interval for streams opened while LISTEN is unavailable ---
+    conversation_feed_poll_seconds: float = 5.0
+    # --- Conversation context: prompt budget (estimated tokens) and rolling summary cadence ---
+    conversation_context_token_budget: int = 8_000
+    conversation_context_snippet_share: float = 0.3
+    conversation_summary_every_messages: int = 20
+    # --- The newest turns are always sent verbatim and never folded into the summary ---
+    conversation_summary_keep_recent: int = 8
+    conversation_summary_max_tokens: int = 600
+    # --- Request caps for POST /conversations/{id}/context (characters per message or snippet) ---
+    conversation_context_max_messages: int = 500
+    conversation_context_max_snippets: int = 50
+    conversation_context_max_chars: int = 32_000
+    # --- Conversation Retention (soft-deleted rows older than this are archived or purged) ---
+    retention_deleted_after_days: int = 30
+    retention_mode: Literal["archive", "purge"] = "archive"
+    retention_batch_size: int = 500
+    retention_batch_pause_seconds: float = 0.05
+    retention_max_batches: int = 1_000
+    # --- Response Compression (negotiated by Accept-Encoding; zstd/br need their optional packages) ---
+    compression_enabled: bool = True
+    compression_encodings: list[str] = Field(default_factory=lambda: ["zstd", "br", "gzip"])
+    compression_minimum_size: int = 1_024
+    # --- Bodies above this are compressed in a worker thread instead of the event loop ---
+    compression_offload_size: int = 256 * 1024
+    # --- AI Artifacts (compiled DSPy programs, prompt templates), content-addressed ---
+    artifacts_backend: Literal["minio", "local"] = "minio"
+    artifacts_local_dir: str = str(BACKEND_DIR / ".artifacts")
+    artifacts_prefix: str = "artifacts"
+    artifacts_pointer_ttl_seconds: float = 60.0
+    # --- name -> sha256: freeze the versions a deploy uses instead of following `current` ---
+    artifacts_pins: dict[str, str] = Field(default_factory=dict)
+    # --- Background Jobs ---
+    job_worker_concurrency: int = 4
+    job_poll_interval_seconds: float = 5.0
+    job_visibility_timeout_seconds: int = 300
+    job_max_attempts: int = 5
+    job_retry_backoff_base_seconds: float = 2.0
+    job_retry_backoff_max_seconds: float = 600.0
     @property
     def is_production(self) -> bool:
         return self.environment == "prod"
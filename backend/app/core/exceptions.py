@@ -15,6 +15,7 @@ class AppException(Exception):
     message: str
     status_code: int = 400
     details: list[dict[str, Any]] | None = None
+    headers: dict[str, str] | None = None
 
 
 def _error_payload(code: str, message: str, details: list[dict[str, Any]] | None = None) -> dict[str, Any]:
@@ -27,6 +28,7 @@ def register_exception_handlers(app: FastAPI) -> None:
         return JSONResponse(
             status_code=exc.status_code,
             content=_error_payload(exc.code, exc.message, exc.details),
+            headers=exc.headers,
         )
 
     @app.exception_handler(RequestValidationError)
@@ -43,6 +45,7 @@ def register_exception_handlers(app: FastAPI) -> None:
         return JSONResponse(
             status_code=exc.status_code,
             content=_error_payload("HTTP_ERROR", str(exc.detail)),
+            headers=getattr(exc, "headers", None),
         )
 
     @app.exception_handler(Exception)
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+
+import asyncpg
+from loguru import logger
+from sqlalchemy import func, select
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+
+NotificationCallback = Callable[[str, str], Awaitable[None] | None]
+
+
+def asyncpg_dsn(database_url: str | None = None) -> str:
+    """
+        Convert the SQLAlchemy URL (postgresql+asyncpg://) into a plain asyncpg DSN.
+    """
+    url = make_url(database_url or get_settings().database_url)
+    return url.set(drivername="postgresql").render_as_string(hide_password=False)
+
+
+async def notify(db: AsyncSession, channel: str, payload: str = "") -> None:
+    """
+        Queue a NOTIFY on the current transaction.
+        Postgres only delivers it on commit, so listeners never see rolled-back writes.
+    """
+    await db.execute(select(func.pg_notify(channel, payload)))
+
+
+class PgListener:
+    """
+        One dedicated LISTEN connection shared by every subscriber in the process.
+
+        Pooled sessions cannot hold LISTEN state, so the listener owns a raw asyncpg
+        connection and reconnects (re-issuing LISTEN) if it drops.
+    """
+
+    def __init__(self, dsn: str | None = None, *, reconnect_delay: float = 1.0) -> None:
+        self._dsn = dsn
+        self._reconnect_delay = reconnect_delay
+        self._conn: asyncpg.Connection | None = None
+        self._callbacks: dict[str, list[NotificationCallback]] = {}
+        self._lock = asyncio.Lock()
+        self._closed = False
+        # --- Strong refs: the loop only keeps weak ones, an unreferenced task can vanish mid-run ---
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    @property
+    def is_connected(self) -> bool:
+        return self._conn is not None and not self._conn.is_closed()
+
+    async def start(self) -> None:
+        async with self._lock:
+            self._closed = False
+            if self.is_connected:
+                return
+            await self._connect()
+
+    async def stop(self) -> None:
+        async with self._lock:
+            self._closed = True
+            if self._conn is not None and not self._conn.is_closed():
+                await self._conn.close()
+            self._conn = None
+        # --- Outside the lock: a reconnect task may be waiting on it ---
+        current = asyncio.current_task()
+        tasks = [task for task in self._tasks if task is not current]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def subscribe(self, channel: str, callback: NotificationCallback) -> None:
+        async with self._lock:
+            first = channel not in self._callbacks
+            self._callbacks.setdefault(channel, []).append(callback)
+            if first and self.is_connected:
+                await self._conn.add_listener(channel, self._dispatch)
+
+    async def unsubscribe(self, channel: str, callback: NotificationCallback) -> None:
+        async with self._lock:
+            callbacks = self._callbacks.get(channel, [])
+            if callback in callbacks:
+                callbacks.remove(callback)
+            if not callbacks and channel in self._callbacks:
+                del self._callbacks[channel]
+                if self.is_connected:
+                    await self._conn.remove_listener(channel, self._dispatch)
+
+    # --- Internals ---
+    def _spawn(self, coro: Awaitable[None], what: str) -> None:
+        task = asyncio.ensure_future(coro)
+        self._tasks.add(task)
+
+        def _done(task: asyncio.Task[None]) -> None:
+            self._tasks.discard(task)
+            if not task.cancelled() and task.exception() is not None:
+                logger.opt(exception=task.exception()).error("{} failed", what)
+
+        task.add_done_callback(_done)
+
+    async def _connect(self) -> None:
+        self._conn = await asyncpg.connect(self._dsn or asyncpg_dsn())
+        self._conn.add_termination_listener(self._on_terminated)
+        for channel in self._callbacks:
+            await self._conn.add_listener(channel, self._dispatch)
+
+    def _dispatch(self, _conn: asyncpg.Connection, _pid: int, channel: str, payload: str) -> None:
+        for callback in list(self._callbacks.get(channel, ())):
+            try:
+                result = callback(channel, payload)
+                if asyncio.iscoroutine(result):
+                    self._spawn(result, f"Notification callback for channel {channel}")
+            except Exception:
+                logger.exception("Notification callback failed for channel {}", channel)
+
+    def _on_terminated(self, _conn: asyncpg.Connection) -> None:
+        if not self._closed:
+            self._spawn(self._reconnect(), "LISTEN reconnect")
+
+    async def _reconnect(self) -> None:
+        delay = self._reconnect_delay
+        while not self._closed:
+            try:
+                async with self._lock:
+                    if self._closed or self.is_connected:
+                        return
+                    await self._connect()
+                logger.info("LISTEN connection re-established")
+                return
+            except (OSError, asyncpg.PostgresError) as exc:
+                logger.warning("LISTEN reconnect failed ({}); retrying in {}s", exc, delay)
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 30.0)
@@ -0,0 +1,289 @@
+from __future__ import annotations
+
+import math
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Literal, Protocol
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import Settings, get_settings
+
+Algorithm = Literal["token_bucket", "sliding_window"]
+
+
+@dataclass(frozen=True)
+class RateLimitRule:
+    """
+        `limit` requests per `period` seconds.
+        token_bucket: smooth refill, bursts up to `burst` (defaults to `limit`).
+        sliding_window: two-window weighted counter, suited to quotas (e.g. per day).
+    """
+    name: str
+    limit: int
+    period: float
+    algorithm: Algorithm = "token_bucket"
+    burst: int | None = None
+
+
+@dataclass(frozen=True)
+class RateLimitDecision:
+    allowed: bool
+    limit: int
+    remaining: int
+    reset_after: float
+    retry_after: float = 0.0
+
+    def headers(self) -> dict[str, str]:
+        headers = {
+            "RateLimit-Limit": str(self.limit),
+            "RateLimit-Remaining": str(self.remaining),
+            "RateLimit-Reset": str(math.ceil(self.reset_after)),
+        }
+        if not self.allowed:
+            headers["Retry-After"] = str(max(1, math.ceil(self.retry_after)))
+        return headers
+
+
+class TokenBucket:
+    __slots__ = ("tokens", "updated")
+
+    def __init__(self, capacity: float, now: float) -> None:
+        self.tokens = capacity
+        self.updated = now
+
+    def hit(self, rule: RateLimitRule, now: float, cost: int = 1) -> RateLimitDecision:
+        capacity = rule.burst or rule.limit
+        rate = rule.limit / rule.period
+        self.tokens = min(capacity, self.tokens + (now - self.updated) * rate)
+        self.updated = now
+        allowed = self.tokens >= cost
+        if allowed:
+            self.tokens -= cost
+        return RateLimitDecision(
+            allowed=allowed,
+            limit=capacity,
+            remaining=int(self.tokens),
+            reset_after=(capacity - self.tokens) / rate,
+            retry_after=0.0 if allowed else (cost - self.tokens) / rate,
+        )
+
+    def refund(self, rule: RateLimitRule, cost: int = 1) -> None:
+        self.tokens = min(rule.burst or rule.limit, self.tokens + cost)
+
+
+class SlidingWindowCounter:
+    """
+        Approximate sliding window: previous window's count weighted by its remaining overlap.
+        O(1) memory per key, unlike a log of timestamps.
+    """
+    __slots__ = ("window_start", "current", "previous")
+
+    def __init__(self, now: float) -> None:
+        self.window_start = now
+        self.current = 0
+        self.previous = 0
+
+    def hit(self, rule: RateLimitRule, now: float, cost: int = 1) -> RateLimitDecision:
+        period = rule.period
+        elapsed = now - self.window_start
+        if elapsed >= period:
+            windows = int(elapsed // period)
+            self.previous = self.current if windows == 1 else 0
+            self.current = 0
+            self.window_start += windows * period
+            elapsed = now - self.window_start
+
+        weight = 1.0 - elapsed / period
+        estimate = self.previous * weight + self.current
+        allowed = estimate + cost <= rule.limit
+        if allowed:
+            self.current += cost
+            estimate += cost
+
+        retry_after = 0.0
+        if not allowed:
+            excess = estimate + cost - rule.limit
+            if self.previous and excess <= self.previous * weight:
+                # --- The previous window's weight decays by previous/period per second ---
+                retry_after = excess * period / self.previous
+            else:
+                retry_after = period - elapsed
+        return RateLimitDecision(
+            allowed=allowed,
+            limit=rule.limit,
+            remaining=max(0, int(rule.limit - estimate)),
+            reset_after=period - elapsed,
+            retry_after=retry_after,
+        )
+
+    def refund(self, rule: RateLimitRule, cost: int = 1) -> None:
+        self.current = max(0, self.current - cost)
+
+
+class RateLimitBackend(Protocol):
+    """
+        Storage for limiter state. The in-process backend is per worker; multi-worker
+        deployments plug a shared implementation in with `set_rate_limit_backend`.
+    """
+
+    async def hit(self, key: str, rule: RateLimitRule, cost: int = 1) -> RateLimitDecision: ...
+
+    async def refund(self, key: str, rule: RateLimitRule, cost: int = 1) -> None:
+        """
+            Give back an allowed hit, when a later rule of the same call rejected it.
+        """
+
+
+class LocalRateLimitBackend:
+    """
+        In-memory backend (and the fake for tests). Keys live in LRU ordered dicts, one per
+        TTL: idle keys expire after max(`idle_ttl`, rule period) and the total is capped at
+        `max_keys`. Within one dict, access order is expiry order, so expiry only looks at heads.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_keys: int,
+        idle_ttl: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_keys = max_keys
+        self.idle_ttl = idle_ttl
+        self.clock = clock
+        # --- ttl -> key -> (expires_at, state) ---
+        self._states: dict[float, OrderedDict[str, tuple[float, TokenBucket | SlidingWindowCounter]]] = {}
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _ttl(self, rule: RateLimitRule) -> float:
+        return max(self.idle_ttl, rule.period)
+
+    async def hit(self, key: str, rule: RateLimitRule, cost: int = 1) -> RateLimitDecision:
+        now = self.clock()
+        states = self._states.setdefault(self._ttl(rule), OrderedDict())
+        entry = states.pop(key, None)
+        if entry is None:
+            state = (
+                TokenBucket(rule.burst or rule.limit, now)
+                if rule.algorithm == "token_bucket"
+                else SlidingWindowCounter(now)
+            )
+            self._size += 1
+        else:
+            state = entry[1]
+        decision = state.hit(rule, now, cost)
+        states[key] = (now + self._ttl(rule), state)
+        self._evict(now)
+        return decision
+
+    async def refund(self, key: str, rule: RateLimitRule, cost: int = 1) -> None:
+        entry = self._states.get(self._ttl(rule), {}).get(key)
+        if entry is not None:
+            entry[1].refund(rule, cost)
+
+    def _evict(self, now: float) -> None:
+        # --- Oldest-accessed entries are at the front of each dict: amortized O(1) per hit ---
+        for states in self._states.values():
+            while states and now >= next(iter(states.values()))[0]:
+                states.popitem(last=False)
+                self._size -= 1
+        while self._size > self.max_keys:
+            # --- Over the cap: drop whichever head expires soonest ---
+            states = min((s for s in self._states.values() if s), key=lambda s: next(iter(s.values()))[0])
+            states.popitem(last=False)
+            self._size -= 1
+
+
+# --- Writes to these groups start expensive AI generation: tighter limit plus a daily quota ---
+GENERATION_GROUPS = frozenset({"quizzes", "podcasts", "conversations.context"})
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+def rules_for_group(
+    group: str,
+    settings: Settings | None = None,
+    *,
+    method: str = "GET",
+) -> list[RateLimitRule]:
+    settings = settings or get_settings()
+    if group in GENERATION_GROUPS and method.upper() not in SAFE_METHODS:
+        return [
+            RateLimitRule(
+                name="generation-daily",
+                limit=settings.rate_limit_generation_daily_quota,
+                period=86_400,
+                algorithm="sliding_window",
+            ),
+            RateLimitRule(
+                name="generation-minute",
+                limit=settings.rate_limit_generation_per_minute,
+                period=60,
+            ),
+        ]
+    return [
+        RateLimitRule(
+            name="minute",
+            limit=settings.rate_limit_per_minute,
+            period=60,
+            burst=settings.rate_limit_burst,
+        )
+    ]
+
+
+_backend: RateLimitBackend | None = None
+
+
+def get_rate_limit_backend() -> RateLimitBackend:
+    global _backend
+    if _backend is None:
+        settings = get_settings()
+        _backend = LocalRateLimitBackend(
+            max_keys=settings.rate_limit_max_keys,
+            idle_ttl=settings.rate_limit_idle_ttl_seconds,
+        )
+    return _backend
+
+
+def set_rate_limit_backend(backend: RateLimitBackend | None) -> None:
+    global _backend
+    _backend = backend
+
+
+# --- Request-state key the `rate_limit` dependency leaves its tightest decision under ---
+RATE_LIMIT_STATE_KEY = "rate_limit_decision"
+
+
+class RateLimitHeadersMiddleware:
+    """
+        Pure ASGI middleware that adds the RateLimit-* headers of a successful call at
+        `http.response.start`, the one message every response sends. Headers set on the
+        dependency's injected `Response` never reach a StreamingResponse a route returns.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def _send(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                decision = scope.get("state", {}).get(RATE_LIMIT_STATE_KEY)
+                if decision is not None:
+                    headers = MutableHeaders(scope=message)
+                    for name, value in decision.headers().items():
+                        # --- A 429 already carries the rejecting rule's headers ---
+                        if name not in headers:
+                            headers[name] = value
+            await send(message)
+
+        await self.app(scope, receive, _send)
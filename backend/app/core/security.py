@@ -0,0 +1,224 @@
+from __future__ import annotations
+
+import asyncio
+import base64
+import hashlib
+import hmac
+import json
+import os
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any
+
+from fastapi import status
+from loguru import logger
+
+from app.core.config import Settings, get_settings
+from app.core.exceptions import AppException
+
+_HASHES: dict[str, Callable[..., Any]] = {
+    "HS256": hashlib.sha256,
+    "HS384": hashlib.sha384,
+    "HS512": hashlib.sha512,
+}
+
+
+def _b64url_decode(segment: str) -> bytes:
+    return base64.urlsafe_b64decode(segment + "=" * (-len(segment) % 4))
+
+
+def _b64url_encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _unauthorized(message: str) -> AppException:
+    return AppException(
+        code="UNAUTHORIZED",
+        message=message,
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+def issue_token(claims: dict[str, Any], *, key: str, kid: str | None = None, algorithm: str = "HS256") -> str:
+    """
+        Sign a JWT. Used by tests, benchmarks and local tooling; production tokens come from the IdP.
+    """
+    header: dict[str, Any] = {"alg": algorithm, "typ": "JWT"}
+    if kid is not None:
+        header["kid"] = kid
+    signing_input = ".".join(
+        _b64url_encode(json.dumps(part, separators=(",", ":")).encode("utf-8")) for part in (header, claims)
+    )
+    signature = hmac.new(key.encode("utf-8"), signing_input.encode("ascii"), _HASHES[algorithm]).digest()
+    return f"{signing_input}.{_b64url_encode(signature)}"
+
+
+@dataclass(frozen=True)
+class KeySet:
+    keys: dict[str, bytes]
+    version: int
+
+
+class KeyProvider:
+    """
+        Holds the verification keys in memory. Keys are read once at startup; when a keys
+        file is configured `run_refresh` re-reads it in the background (only if it changed),
+        so rotation never touches the request path.
+    """
+
+    def __init__(self, settings: Settings) -> None:
+        self._static = {kid: secret.encode("utf-8") for kid, secret in settings.auth_jwt_keys.items()}
+        self._path = settings.auth_jwt_keys_file
+        self._interval = settings.auth_key_refresh_seconds
+        self._mtime: float | None = None
+        self._keyset = KeySet(keys=dict(self._static), version=0)
+        if self._path:
+            self.reload()
+
+    @property
+    def keyset(self) -> KeySet:
+        return self._keyset
+
+    def reload(self) -> bool:
+        """
+            Re-read the keys file if its mtime changed. Returns True when keys were replaced.
+        """
+        if not self._path:
+            return False
+        try:
+            mtime = os.stat(self._path).st_mtime
+            if mtime == self._mtime:
+                return False
+            with open(self._path, encoding="utf-8") as fh:
+                loaded = {kid: str(secret).encode("utf-8") for kid, secret in json.load(fh).items()}
+        except (OSError, ValueError, AttributeError) as exc:
+            logger.warning("Could not load JWT keys from {}: {}", self._path, exc)
+            return False
+        self._mtime = mtime
+        self._keyset = KeySet(keys={**self._static, **loaded}, version=self._keyset.version + 1)
+        logger.info("Loaded {} JWT verification key(s) (version {})", len(self._keyset.keys), self._keyset.version)
+        return True
+
+    async def run_refresh(self) -> None:
+        while True:
+            await asyncio.sleep(self._interval)
+            await asyncio.to_thread(self.reload)
+
+
+class TokenVerifier:
+    """
+        Verifies HS* JWTs and caches the verified claims in a bounded LRU keyed by the
+        SHA-256 of the token. A cached entry is reused until the token expires or the
+        key set rotates, so steady-state cost is one hash plus a dict lookup.
+    """
+
+    def __init__(
+        self,
+        keys: KeyProvider,
+        *,
+        algorithms: list[str],
+        issuer: str | None = None,
+        audience: str | None = None,
+        leeway: float = 30,
+        cache_size: int = 10_000,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        unknown = set(algorithms) - set(_HASHES)
+        if unknown:
+            raise ValueError(f"Unsupported JWT algorithms: {sorted(unknown)}")
+        self.keys = keys
+        self.algorithms = frozenset(algorithms)
+        self.issuer = issuer
+        self.audience = audience
+        self.leeway = leeway
+        self.cache_size = cache_size
+        self.clock = clock
+        # --- sha256(token) -> (claims, exp, keyset version) ---
+        self._cache: OrderedDict[bytes, tuple[dict[str, Any], float, int]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def verify(self, token: str) -> dict[str, Any]:
+        now = self.clock()
+        version = self.keys.keyset.version
+        cache_key = hashlib.sha256(token.encode("utf-8")).digest()
+        cached = self._cache.get(cache_key)
+        if cached is not None:
+            claims, exp, cached_version = cached
+            if cached_version == version and now < exp + self.leeway:
+                self._cache.move_to_end(cache_key)
+                self.hits += 1
+                return claims
+            del self._cache[cache_key]
+
+        self.misses += 1
+        claims = self._verify_uncached(token, now)
+        self._cache[cache_key] = (claims, float(claims["exp"]), version)
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return claims
+
+    def _verify_uncached(self, token: str, now: float) -> dict[str, Any]:
+        try:
+            header_b64, payload_b64, signature_b64 = token.split(".")
+            header = json.loads(_b64url_decode(header_b64))
+            signature = _b64url_decode(signature_b64)
+            # --- UnicodeEncodeError is a ValueError: non-ASCII segments are malformed, not a 500 ---
+            signing_input = f"{header_b64}.{payload_b64}".encode("ascii")
+        except (ValueError, TypeError):
+            raise _unauthorized("Malformed token") from None
+        if not isinstance(header, dict) or not isinstance(header.get("kid"), (str, type(None))):
+            raise _unauthorized("Malformed token")
+
+        algorithm = header.get("alg")
+        if algorithm not in self.algorithms:
+            raise _unauthorized("Unsupported token algorithm")
+
+        keys = self.keys.keyset.keys
+        kid = header.get("kid")
+        candidates = [keys[kid]] if kid in keys else ([] if kid is not None else list(keys.values()))
+        if not any(
+            hmac.compare_digest(hmac.new(key, signing_input, _HASHES[algorithm]).digest(), signature)
+            for key in candidates
+        ):
+            raise _unauthorized("Invalid token signature")
+
+        try:
+            claims = json.loads(_b64url_decode(payload_b64))
+        except ValueError:
+            raise _unauthorized("Malformed token") from None
+        if not isinstance(claims, dict) or "sub" not in claims or not isinstance(claims.get("exp"), (int, float)):
+            raise _unauthorized("Token must carry 'sub' and 'exp' claims")
+        if now >= claims["exp"] + self.leeway:
+            raise _unauthorized("Token expired")
+        if isinstance(claims.get("nbf"), (int, float)) and now + self.leeway < claims["nbf"]:
+            raise _unauthorized("Token not yet valid")
+        if self.issuer is not None and claims.get("iss") != self.issuer:
+            raise _unauthorized("Invalid token issuer")
+        if self.audience is not None:
+            aud = claims.get("aud")
+            if self.audience not in (aud if isinstance(aud, list) else [aud]):
+                raise _unauthorized("Invalid token audience")
+        return claims
+
+
+@lru_cache
+def get_key_provider() -> KeyProvider:
+    return KeyProvider(get_settings())
+
+
+@lru_cache
+def get_token_verifier() -> TokenVerifier:
+    settings = get_settings()
+    return TokenVerifier(
+        get_key_provider(),
+        algorithms=settings.auth_jwt_algorithms,
+        issuer=settings.auth_jwt_issuer,
+        audience=settings.auth_jwt_audience,
+        leeway=settings.auth_clock_skew_seconds,
+        cache_size=settings.auth_token_cache_size,
+    )
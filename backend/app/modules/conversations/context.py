@@ -0,0 +1,370 @@
+from __future__ import annotations
+
+import uuid
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Any, Protocol
+
+from loguru import logger
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import get_settings
+from app.core.database import async_session_maker
+from app.modules.conversations.repository import ConversationsRepository
+from app.modules.conversations.schemas import (
+    ContextMessage,
+    ConversationContextOut,
+    ConversationContextRequest,
+    ConversationSummaryJob,
+)
+from app.modules.conversations.service import ConversationsService
+from app.modules.jobs.service import JobsService
+from app.services.artifacts import ArtifactRegistry, get_artifact_registry
+
+SUMMARIZE_JOB_KIND = "conversations.summarize"
+
+# --- Per-part framing (role marker, separators) on top of the text itself ---
+PART_OVERHEAD_TOKENS = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """
+        Local estimate, no tokenizer or API round trip: about 4 ASCII characters per
+        token and 2 for other scripts (Arabic, CJK...), which tokenize denser.
+        Errs high rather than low so an assembled prompt stays within budget.
+    """
+    if not text:
+        return 0
+    ascii_chars = len(text.encode("ascii", "ignore"))
+    return (ascii_chars + 2 * (len(text) - ascii_chars) + 3) // 4
+
+
+def part_tokens(text: str) -> int:
+    return estimate_tokens(text) + PART_OVERHEAD_TOKENS
+
+
+@dataclass
+class AssembledContext:
+    summary: str | None
+    messages: list[ContextMessage]
+    snippets: list[str]
+    summarized_count: int
+    dropped_messages: int
+    dropped_snippets: int
+    prompt_tokens: int
+    # --- What sending the whole history and every snippet would have cost ---
+    full_tokens: int
+
+    @property
+    def saved_tokens(self) -> int:
+        return max(0, self.full_tokens - self.prompt_tokens)
+
+
+def assemble_context(
+    *,
+    messages: Sequence[ContextMessage],
+    snippets: Sequence[str] = (),
+    summary: str | None = None,
+    summarized_count: int = 0,
+    budget: int,
+    snippet_share: float,
+) -> AssembledContext:
+    """
+        Fit summary + recent turns + snippets into `budget` estimated tokens.
+
+        History that fits is sent as is. Otherwise the summary stands in for the turns it
+        covers, snippets (most relevant first) get at most `snippet_share` of the budget,
+        and the rest goes to the newest turns, kept contiguous back from the latest one.
+        The latest turn is always sent, even if it alone exceeds the budget.
+    """
+    message_costs = [part_tokens(m.content) for m in messages]
+    snippet_costs = [part_tokens(s) for s in snippets]
+    full_tokens = sum(message_costs) + sum(snippet_costs)
+    if full_tokens <= budget or not messages:
+        return AssembledContext(
+            summary=None,
+            messages=list(messages),
+            snippets=list(snippets),
+            summarized_count=0,
+            dropped_messages=0,
+            dropped_snippets=0,
+            prompt_tokens=full_tokens,
+            full_tokens=full_tokens,
+        )
+
+    # --- A summary of more turns than were sent belongs to some other history: ignore it ---
+    if not summary or not 0 < summarized_count < len(messages):
+        summary, summarized_count = None, 0
+    summary_cost = part_tokens(summary) if summary else 0
+    remaining = budget - summary_cost - message_costs[-1]
+
+    chosen_snippets: list[str] = []
+    snippet_room = min(int(budget * snippet_share), remaining)
+    for snippet, cost in zip(snippets, snippet_costs):
+        # --- Skip, don't stop: a shorter, less relevant snippet may still fit ---
+        if cost <= snippet_room:
+            chosen_snippets.append(snippet)
+            snippet_room -= cost
+            remaining -= cost
+
+    start = len(messages) - 1
+    while start > summarized_count and message_costs[start - 1] <= remaining:
+        start -= 1
+        remaining -= message_costs[start]
+
+    prompt_tokens = budget - remaining
+    return AssembledContext(
+        summary=summary,
+        messages=list(messages[start:]),
+        snippets=chosen_snippets,
+        summarized_count=summarized_count,
+        dropped_messages=start - summarized_count,
+        dropped_snippets=len(snippets) - len(chosen_snippets),
+        prompt_tokens=prompt_tokens,
+        full_tokens=full_tokens,
+    )
+
+
+@dataclass
+class ContextStats:
+    """
+        Process-wide counters for prompt assembly: estimated tokens sent vs. what the
+        uncompacted history would have cost.
+    """
+    assembled: int = 0
+    compacted: int = 0
+    prompt_tokens: int = 0
+    full_tokens: int = 0
+    summary_jobs: int = 0
+
+    def record(self, context: AssembledContext) -> None:
+        self.assembled += 1
+        self.compacted += context.prompt_tokens < context.full_tokens
+        self.prompt_tokens += context.prompt_tokens
+        self.full_tokens += context.full_tokens
+
+    def snapshot(self) -> dict[str, Any]:
+        saved = max(0, self.full_tokens - self.prompt_tokens)
+        return {
+            "assembled": self.assembled,
+            "compacted": self.compacted,
+            "prompt_tokens": self.prompt_tokens,
+            "full_tokens": self.full_tokens,
+            "saved_tokens": saved,
+            "saved_ratio": saved / self.full_tokens if self.full_tokens else 0.0,
+            "summary_jobs": self.summary_jobs,
+        }
+
+
+_stats = ContextStats()
+
+
+def get_context_stats() -> ContextStats:
+    return _stats
+
+
+class EmptySummaryError(RuntimeError):
+    """
+        The model returned no summary text. Retryable: the summary request is already
+        claimed, so dropping the job would stall summaries for another `every` messages.
+    """
+
+
+# --- Built-in prompt; a template published under SUMMARY_PROMPT_NAME replaces it ---
+SUMMARY_PROMPT_NAME = "conversations.summary"
+SUMMARY_PROMPT = (
+    "You maintain the running summary of a conversation between a user and an assistant. "
+    "Update it with the new turns below. Keep facts, decisions, open questions, names and "
+    "numbers the assistant may need later; drop small talk. Reply with the summary only, "
+    "in the conversation's language.\n\n"
+    "CURRENT SUMMARY:\n{summary}\n\nNEW TURNS:\n{transcript}"
+)
+
+
+class Summarizer(Protocol):
+    async def summarize(self, *, summary: str, messages: Sequence[ContextMessage], max_tokens: int) -> str: ...
+
+
+class GeminiSummarizer:
+    """
+        Folds new turns into the running summary; the old summary is input, so each call
+        only pays for the turns added since the last one. The client and the artifact
+        registry are looked up on first use and then shared, so one instance can live at
+        module scope in the worker.
+    """
+
+    def __init__(
+        self,
+        *,
+        model: str | None = None,
+        api_key: str | None = None,
+        registry: ArtifactRegistry | None = None,
+    ) -> None:
+        settings = get_settings()
+        self.model = model or settings.gemini_model
+        self._api_key = api_key or settings.gemini_api_key
+        self._client = None
+        self._registry = registry
+
+    @property
+    def registry(self) -> ArtifactRegistry:
+        if self._registry is None:
+            self._registry = get_artifact_registry()
+        return self._registry
+
+    @property
+    def client(self):
+        if self._client is None:
+            from google import genai
+
+            self._client = genai.Client(api_key=self._api_key)
+        return self._client
+
+    async def summarize(self, *, summary: str, messages: Sequence[ContextMessage], max_tokens: int) -> str:
+        transcript = "\n".join(f"{m.role.upper()}: {m.content}" for m in messages)
+        template = await self.registry.get_prompt_or(SUMMARY_PROMPT_NAME, SUMMARY_PROMPT)
+        prompt = template.format(summary=summary or "(none)", transcript=transcript)
+        response = await self.client.aio.models.generate_content(
+            model=self.model,
+            contents=prompt,
+            config={"max_output_tokens": max_tokens},
+        )
+        return (response.text or "").strip()
+
+
+class ConversationContext:
+    """
+        Builds the prompt context for a conversation turn and keeps its rolling summary
+        current. Turns are not stored server-side: callers send the history, and only the
+        turns not yet summarized travel to the background job.
+    """
+
+    def __init__(
+        self,
+        repo: ConversationsRepository | None = None,
+        conversations: ConversationsService | None = None,
+        jobs: JobsService | None = None,
+        session_factory: async_sessionmaker[AsyncSession] = async_session_maker,
+        stats: ContextStats | None = None,
+    ) -> None:
+        self.repo = repo or ConversationsRepository()
+        self.conversations = conversations or ConversationsService(self.repo)
+        self.jobs = jobs or JobsService()
+        self.session_factory = session_factory
+        self.stats = stats or get_context_stats()
+
+    async def build(
+        self,
+        db: AsyncSession,
+        *,
+        owner_id: uuid.UUID,
+        conversation_id: uuid.UUID,
+        payload: ConversationContextRequest,
+    ) -> ConversationContextOut:
+        settings = get_settings()
+        await self.conversations.get_conversation(db, owner_id=owner_id, conversation_id=conversation_id)
+        row = await self.repo.get_summary(db, conversation_id=conversation_id)
+        context = assemble_context(
+            messages=payload.messages,
+            snippets=payload.snippets,
+            summary=row.summary if row is not None else None,
+            summarized_count=row.summarized_count if row is not None else 0,
+            budget=payload.token_budget or settings.conversation_context_token_budget,
+            snippet_share=settings.conversation_context_snippet_share,
+        )
+        self.stats.record(context)
+        job_id = await self.schedule_summary(
+            db,
+            owner_id=owner_id,
+            conversation_id=conversation_id,
+            messages=payload.messages,
+        )
+        return ConversationContextOut(
+            summary=context.summary,
+            messages=context.messages,
+            snippets=context.snippets,
+            summarized_count=context.summarized_count,
+            dropped_messages=context.dropped_messages,
+            dropped_snippets=context.dropped_snippets,
+            prompt_tokens=context.prompt_tokens,
+            full_tokens=context.full_tokens,
+            saved_tokens=context.saved_tokens,
+            summary_job_id=job_id,
+        )
+
+    async def schedule_summary(
+        self,
+        db: AsyncSession,
+        *,
+        owner_id: uuid.UUID,
+        conversation_id: uuid.UUID,
+        messages: Sequence[ContextMessage],
+    ) -> uuid.UUID | None:
+        """
+            Queue a summary job once `every` turns beyond the summary have aged out of the
+            `keep_recent` window. The claim and the job insert commit together, so
+            concurrent requests for one conversation queue it once.
+        """
+        settings = get_settings()
+        every = settings.conversation_summary_every_messages
+        through = len(messages) - settings.conversation_summary_keep_recent
+        if through < every:
+            return None
+        base_count = await self.repo.request_summary(
+            db, conversation_id=conversation_id, through=through, every=every
+        )
+        if base_count is None or base_count >= through:
+            await db.rollback()
+            return None
+        job = await self.jobs.enqueue_job(
+            db,
+            kind=SUMMARIZE_JOB_KIND,
+            owner_id=owner_id,
+            payload=ConversationSummaryJob(
+                conversation_id=conversation_id,
+                base_count=base_count,
+                messages=list(messages[base_count:through]),
+            ).model_dump(mode="json"),
+        )
+        self.stats.summary_jobs += 1
+        return job.id
+
+    async def refresh_summary(self, job: ConversationSummaryJob, summarizer: Summarizer) -> bool:
+        """
+            Fold the job's turns into the stored summary. The model call runs with no
+            session open; the write is a compare-and-set on `base_count`.
+        """
+        async with self.session_factory() as db:
+            row = await self.repo.get_summary(db, conversation_id=job.conversation_id)
+            if row is None or row.summarized_count != job.base_count:
+                return False
+            current = row.summary
+
+        settings = get_settings()
+        summary = (
+            await summarizer.summarize(
+                summary=current,
+                messages=job.messages,
+                max_tokens=settings.conversation_summary_max_tokens,
+            )
+        ).strip()
+        if not summary:
+            raise EmptySummaryError(f"Empty summary for conversation {job.conversation_id}")
+        summarized_count = job.base_count + len(job.messages)
+        async with self.session_factory() as db:
+            applied = await self.repo.apply_summary(
+                db,
+                conversation_id=job.conversation_id,
+                base_count=job.base_count,
+                summarized_count=summarized_count,
+                summary=summary,
+                summary_tokens=estimate_tokens(summary),
+            )
+        if applied:
+            logger.info(
+                "Conversation {} summary now covers {} messages ({} tokens)",
+                job.conversation_id,
+                summarized_count,
+                estimate_tokens(summary),
+            )
+        return applied
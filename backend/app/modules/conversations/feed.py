@@ -0,0 +1,336 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+import uuid
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+
+from loguru import logger
+from sqlalchemy import Text, cast, func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import get_settings
+from app.core.database import async_session_maker
+from app.core.notifications import PgListener
+from app.modules.conversations.models import ConversationStatus
+from app.modules.conversations.repository import ConversationsRepository
+
+CHANGES_CHANNEL = "conversation_changes"
+
+
+@dataclass(frozen=True, slots=True)
+class ChangeEvent:
+    id: uuid.UUID
+    owner_id: uuid.UUID
+    status: ConversationStatus
+    updated_at: datetime
+
+    @property
+    def cursor(self) -> str:
+        return f"{self.updated_at.isoformat()},{self.id}"
+
+    @classmethod
+    def from_payload(cls, payload: str) -> ChangeEvent:
+        data = json.loads(payload)
+        return cls(
+            id=uuid.UUID(data["id"]),
+            owner_id=uuid.UUID(data["owner_id"]),
+            status=ConversationStatus(data["status"]),
+            updated_at=datetime.fromisoformat(data["updated_at"]),
+        )
+
+    def to_sse(self) -> bytes:
+        data = json.dumps({"id": str(self.id), "status": self.status.value, "updated_at": self.updated_at.isoformat()})
+        return f"id: {self.cursor}\nevent: change\ndata: {data}\n\n".encode("utf-8")
+
+
+def parse_cursor(cursor: str) -> tuple[datetime, uuid.UUID]:
+    """
+        Inverse of `ChangeEvent.cursor`; raises ValueError on anything else.
+    """
+    updated_at, _, conversation_id = cursor.rpartition(",")
+    return datetime.fromisoformat(updated_at), uuid.UUID(conversation_id)
+
+
+async def publish_change(
+    db: AsyncSession,
+    *,
+    conversation_id: uuid.UUID,
+    owner_id: uuid.UUID,
+    status: ConversationStatus,
+) -> None:
+    """
+        Queue a change event on the current transaction; delivered only if it commits.
+        updated_at is the transaction's now(), the same value the write stamps on the row,
+        so the event cursor matches what a later catch-up query reads back. now() is the
+        transaction's start, not its commit: see the replay overlap in `stream`.
+    """
+    payload = func.json_build_object(
+        "id", str(conversation_id),
+        "owner_id", str(owner_id),
+        "status", status.value,
+        "updated_at", func.now(),
+    )
+    await db.execute(select(func.pg_notify(CHANGES_CHANNEL, cast(payload, Text))))
+
+
+async def publish_reset(db: AsyncSession, *, owner_id: uuid.UUID, reason: str) -> None:
+    """
+        Tell the owner's clients to refetch instead of following per-row events. For bulk
+        writes (imports): one notification per batch rather than one per row, and imported
+        rows keep their own updated_at, so cursor replay could not find them anyway.
+    """
+    payload = json.dumps({"owner_id": str(owner_id), "reset": reason})
+    await db.execute(select(func.pg_notify(CHANGES_CHANNEL, payload)))
+
+
+def _reset(reason: str) -> bytes:
+    return f"event: reset\ndata: {json.dumps({'reason': reason})}\n\n".encode("utf-8")
+
+
+class _Subscriber:
+    __slots__ = ("queue", "reset_reason")
+
+    def __init__(self, maxsize: int) -> None:
+        # --- None only wakes the reader up to notice `reset_reason` ---
+        self.queue: asyncio.Queue[ChangeEvent | None] = asyncio.Queue(maxsize)
+        self.reset_reason: str | None = None
+
+
+class ConversationFeed:
+    """
+        Fans change events out to this worker's connected clients.
+
+        One LISTEN connection per process (started with the first subscriber) feeds
+        per-owner in-memory queues. A client that falls behind is not buffered without
+        bound: it gets a `reset` event and resumes from its last cursor on reconnect.
+        Bulk imports send a `reset` too (see `publish_reset`) instead of per-row events.
+        Retention sends nothing: it only archives or purges rows that were soft-deleted
+        earlier, and that delete already produced their last event.
+
+        If LISTEN cannot be started, streams fall back to re-running the replay query
+        every `conversation_feed_poll_seconds` instead of failing.
+    """
+
+    def __init__(
+        self,
+        repo: ConversationsRepository | None = None,
+        session_factory: async_sessionmaker[AsyncSession] = async_session_maker,
+        listener: PgListener | None = None,
+    ) -> None:
+        self.repo = repo or ConversationsRepository()
+        self.session_factory = session_factory
+        self.listener = listener
+        self._subscribers: dict[uuid.UUID, set[_Subscriber]] = {}
+        self._start_lock = asyncio.Lock()
+        self._listening = False
+        self._subscribed = False
+
+    @property
+    def subscriber_count(self) -> int:
+        return sum(len(subs) for subs in self._subscribers.values())
+
+    async def _ensure_listening(self) -> None:
+        async with self._start_lock:
+            if self._listening:
+                return
+            self.listener = self.listener or PgListener()
+            # --- Subscribe once: a start that failed is retried by the next stream ---
+            if not self._subscribed:
+                await self.listener.subscribe(CHANGES_CHANNEL, self._on_notify)
+                self._subscribed = True
+            await self.listener.start()
+            self._listening = True
+
+    async def stop(self) -> None:
+        async with self._start_lock:
+            if self._subscribed and self.listener is not None:
+                await self.listener.unsubscribe(CHANGES_CHANNEL, self._on_notify)
+            if self._listening and self.listener is not None:
+                await self.listener.stop()
+            self._listening = False
+            self._subscribed = False
+
+    def _on_notify(self, _channel: str, payload: str) -> None:
+        try:
+            data = json.loads(payload)
+            if "reset" in data:
+                self.reset(uuid.UUID(data["owner_id"]), str(data["reset"]))
+                return
+            event = ChangeEvent.from_payload(payload)
+        except (ValueError, KeyError, TypeError):
+            logger.warning("Ignoring malformed conversation change payload: {}", payload)
+            return
+        self.dispatch(event)
+
+    def dispatch(self, event: ChangeEvent) -> None:
+        for subscriber in self._subscribers.get(event.owner_id, ()):
+            if subscriber.reset_reason is not None:
+                continue
+            try:
+                subscriber.queue.put_nowait(event)
+            except asyncio.QueueFull:
+                subscriber.reset_reason = "lagging"
+
+    def reset(self, owner_id: uuid.UUID, reason: str) -> None:
+        for subscriber in self._subscribers.get(owner_id, ()):
+            if subscriber.reset_reason is not None:
+                continue
+            subscriber.reset_reason = reason
+            # --- A full queue wakes the reader anyway ---
+            with contextlib.suppress(asyncio.QueueFull):
+                subscriber.queue.put_nowait(None)
+
+    async def _changes(
+        self,
+        *,
+        owner_id: uuid.UUID,
+        updated_at: datetime,
+        conversation_id: uuid.UUID,
+    ) -> list[ChangeEvent] | None:
+        """
+            Changes after the cursor, oldest first; None if there are more than
+            `conversation_feed_catchup_limit` of them.
+        """
+        limit = get_settings().conversation_feed_catchup_limit
+        async with self.session_factory() as db:
+            rows = await self.repo.changes_since(
+                db,
+                owner_id=owner_id,
+                updated_at=updated_at,
+                conversation_id=conversation_id,
+                limit=limit,
+            )
+        if len(rows) > limit:
+            return None
+        return [
+            ChangeEvent(id=row_id, owner_id=owner_id, status=status, updated_at=row_updated_at)
+            for row_id, status, row_updated_at in rows
+        ]
+
+    async def _poll(
+        self,
+        *,
+        owner_id: uuid.UUID,
+        since: datetime,
+        seen: set[tuple[uuid.UUID, datetime]],
+    ) -> AsyncIterator[bytes]:
+        """
+            Replay-only stream for when LISTEN is down: the catch-up query, re-run with the
+            same overlap, drops what was already sent.
+        """
+        settings = get_settings()
+        overlap = timedelta(seconds=settings.conversation_feed_replay_overlap_seconds)
+        while True:
+            await asyncio.sleep(settings.conversation_feed_poll_seconds)
+            events = await self._changes(owner_id=owner_id, updated_at=since - overlap, conversation_id=uuid.UUID(int=0))
+            if events is None:
+                yield _reset("too_far_behind")
+                return
+            sent = False
+            for event in events:
+                if (event.id, event.updated_at) in seen:
+                    continue
+                seen.add((event.id, event.updated_at))
+                since = max(since, event.updated_at)
+                sent = True
+                yield event.to_sse()
+            seen = {key for key in seen if key[1] >= since - overlap}
+            if not sent:
+                yield b": keepalive\n\n"
+
+    def _unsubscribe(self, owner_id: uuid.UUID, subscriber: _Subscriber) -> None:
+        subs = self._subscribers.get(owner_id)
+        if subs is not None:
+            subs.discard(subscriber)
+            if not subs:
+                del self._subscribers[owner_id]
+
+    async def stream(
+        self,
+        *,
+        owner_id: uuid.UUID,
+        cursor: str | None = None,
+    ) -> AsyncIterator[bytes]:
+        """
+            SSE byte stream for one client. Subscribes first, then replays changes after
+            `cursor` from the database, so nothing committed in between is missed; live
+            events already replayed are dropped.
+
+            Cursors are transaction start times, so a write that started before the
+            client's last event but committed after it sorts behind the cursor. Replay
+            therefore starts `conversation_feed_replay_overlap_seconds` earlier: delivery
+            is at-least-once, and a change inside the overlap may be sent again.
+        """
+        settings = get_settings()
+        subscriber = _Subscriber(settings.conversation_feed_queue_size)
+        self._subscribers.setdefault(owner_id, set()).add(subscriber)
+        try:
+            try:
+                await self._ensure_listening()
+                live = True
+            except Exception:
+                logger.opt(exception=True).warning("Conversation feed cannot LISTEN; polling instead")
+                self._unsubscribe(owner_id, subscriber)
+                live = False
+            yield b"retry: 3000\n: connected\n\n"
+
+            since = datetime.now(timezone.utc)
+            replayed: set[tuple[uuid.UUID, datetime]] = set()
+            if cursor is not None:
+                try:
+                    updated_at, conversation_id = parse_cursor(cursor)
+                except ValueError:
+                    yield _reset("invalid_cursor")
+                    return
+                since = updated_at
+                overlap = settings.conversation_feed_replay_overlap_seconds
+                if overlap > 0:
+                    updated_at -= timedelta(seconds=overlap)
+                    conversation_id = uuid.UUID(int=0)
+                events = await self._changes(owner_id=owner_id, updated_at=updated_at, conversation_id=conversation_id)
+                if events is None:
+                    # --- Too far behind to replay: the client should refetch the list ---
+                    yield _reset("too_far_behind")
+                    return
+                for event in events:
+                    replayed.add((event.id, event.updated_at))
+                    since = max(since, event.updated_at)
+                    yield event.to_sse()
+
+            if not live:
+                async for chunk in self._poll(owner_id=owner_id, since=since, seen=replayed):
+                    yield chunk
+                return
+
+            while True:
+                if subscriber.reset_reason is not None:
+                    yield _reset(subscriber.reset_reason)
+                    return
+                try:
+                    event = await asyncio.wait_for(
+                        subscriber.queue.get(),
+                        timeout=settings.conversation_feed_heartbeat_seconds,
+                    )
+                except asyncio.TimeoutError:
+                    # --- Keeps proxies from closing an idle stream ---
+                    yield b": keepalive\n\n"
+                    continue
+                if event is None or (event.id, event.updated_at) in replayed:
+                    continue
+                yield event.to_sse()
+        finally:
+            self._unsubscribe(owner_id, subscriber)
+
+
+_feed: ConversationFeed | None = None
+
+
+def get_conversation_feed() -> ConversationFeed:
+    global _feed
+    if _feed is None:
+        _feed = ConversationFeed()
+    return _feed
@@ -1,12 +1,14 @@
 import enum
 import uuid
-from datetime import datetime, timezone
+from datetime import datetime
 
-from sqlalchemy import DateTime, Enum, Index, String, func
+from sqlalchemy import DateTime, Enum, ForeignKey, Index, Integer, String, Text, and_, func, literal_column, text
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.core.database import Base
+# --- Registers the projects table so the project_id foreign key resolves ---
+from app.modules.projects import models as projects_models  # noqa: F401
 
 class ConversationStatus(str, enum.Enum):
     active = "active"
@@ -21,6 +23,13 @@ class Conversation(Base):
     # --- MVP: auth is not implemented, but we still model ownership cleanly ---
     owner_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), index=True)
 
+    # --- Optional grouping; project stats are kept in sync by the service layer ---
+    project_id: Mapped[uuid.UUID | None] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("projects.id", ondelete="SET NULL"),
+        nullable=True,
+    )
+
     title: Mapped[str | None] = mapped_column(String(255), nullable=True)
     status: Mapped[ConversationStatus] = mapped_column(
         Enum(ConversationStatus, name="conversation_status"),
@@ -47,7 +56,101 @@ class Conversation(Base):
 
     def soft_delete(self) -> None:
         self.status = ConversationStatus.deleted
-        self.deleted_at = datetime.now(timezone.utc)
+        # --- Stamped by the database at flush: same clock as updated_at ---
+        self.deleted_at = func.now()
+
+# --- Inlined literal, not a bind parameter: the planner can only use the partial indexes
+#     below when the query predicate textually implies their WHERE clause ---
+NOT_DELETED = Conversation.status != literal_column("'deleted'")
+IS_DELETED = Conversation.status == literal_column("'deleted'")
+
+
+def status_is(status: ConversationStatus):
+    """
+        Literal status filter that also implies the partial index predicate
+        (status <> 'deleted' or status = 'deleted'), even under a generic plan.
+    """
+    if status == ConversationStatus.deleted:
+        return IS_DELETED
+    # --- Enum value, never user text: safe to inline ---
+    return and_(NOT_DELETED, Conversation.status == literal_column(f"'{status.value}'"))
+
+# --- Live rows only: soft-deleted conversations never bloat the list/dashboard indexes ---
+Index(
+    "ix_conversations_owner_updated",
+    Conversation.owner_id,
+    Conversation.updated_at.desc(),
+    postgresql_where=text("status <> 'deleted'"),
+)
+Index(
+    "ix_conversations_owner_status",
+    Conversation.owner_id,
+    Conversation.status,
+    postgresql_where=text("status <> 'deleted'"),
+)
+Index(
+    "ix_conversations_project_updated",
+    Conversation.project_id,
+    Conversation.updated_at.desc(),
+    postgresql_where=text("status <> 'deleted'"),
+)
+# --- Retention scan (and the ?status=deleted listing) only touches deleted rows ---
+Index(
+    "ix_conversations_deleted_at",
+    Conversation.deleted_at,
+    postgresql_where=text("status = 'deleted'"),
+)
+
+
+class ConversationArchive(Base):
+    """
+        Cold storage for soft-deleted conversations past the retention age.
+        Same columns as `conversations`, no foreign keys, so archiving never contends with live rows.
+    """
+    __tablename__ = "conversations_archive"
 
-Index("ix_conversations_owner_updated", Conversation.owner_id, Conversation.updated_at.desc())
-Index("ix_conversations_owner_status", Conversation.owner_id, Conversation.status)
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True)
+    owner_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), index=True)
+    project_id: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True), nullable=True)
+    title: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    status: Mapped[ConversationStatus] = mapped_column(
+        Enum(ConversationStatus, name="conversation_status"),
+        nullable=False,
+    )
+    metadata_: Mapped[dict | None] = mapped_column("metadata", JSONB, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    archived_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    deleted_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    moved_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+    )
+
+
+class ConversationSummary(Base):
+    """
+        Rolling summary of a conversation's older turns, one row per conversation.
+        Kept out of `conversations` so background summary updates never bump
+        updated_at or emit change-feed events.
+    """
+    __tablename__ = "conversation_summaries"
+
+    conversation_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("conversations.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    summary: Mapped[str] = mapped_column(Text, nullable=False, default="", server_default="")
+    # --- Messages [0, summarized_count) are folded into `summary` ---
+    summarized_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    summary_tokens: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    # --- Highest message count a summary job was queued for; dedupes concurrent requests ---
+    requested_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+        onupdate=func.now(),
+    )
@@ -1,15 +1,149 @@
 # --- Standard Library Imports ---
 import uuid
+from collections.abc import AsyncIterator, Sequence
+from datetime import datetime
+from typing import Any
 
 # --- Third-Party Imports ---
-from sqlalchemy import select, func
+from sqlalchemy import (
+    ColumnElement,
+    Select,
+    Text,
+    case,
+    cast,
+    delete,
+    func,
+    insert,
+    literal,
+    literal_column,
+    select,
+    text,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, array
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 # --- Local Imports ---
-from app.modules.conversations.models import Conversation, ConversationStatus
+from app.modules.conversations.models import (
+    IS_DELETED,
+    NOT_DELETED,
+    Conversation,
+    ConversationArchive,
+    ConversationStatus,
+    ConversationSummary,
+    status_is,
+)
+
+# --- Columns copied verbatim into the archive table ---
+_ARCHIVED_COLUMNS = (
+    "id",
+    "owner_id",
+    "project_id",
+    "title",
+    "status",
+    "metadata",
+    "created_at",
+    "updated_at",
+    "archived_at",
+    "deleted_at",
+)
 
 UNSET = object()
 
+# --- Import staging: per-connection temp table, emptied by every commit ---
+IMPORT_STAGING_TABLE = "conversation_import_staging"
+IMPORT_COLUMNS = (
+    "id",
+    "project_id",
+    "title",
+    "status",
+    "metadata",
+    "created_at",
+    "updated_at",
+    "archived_at",
+    "deleted_at",
+)
+_CREATE_STAGING = text(f"""
+    CREATE TEMP TABLE IF NOT EXISTS {IMPORT_STAGING_TABLE} (
+        id uuid,
+        project_id uuid,
+        title text,
+        status text,
+        metadata jsonb,
+        created_at timestamptz,
+        updated_at timestamptz,
+        archived_at timestamptz,
+        deleted_at timestamptz
+    ) ON COMMIT DELETE ROWS
+""")
+# --- prev: project of rows about to be overwritten (pre-statement snapshot), so stats of
+#     both old and new projects get refreshed. Ids owned by someone else are left untouched. ---
+_MERGE_STAGED = text(f"""
+    WITH prev AS (
+        SELECT c.project_id
+        FROM conversations c
+        JOIN {IMPORT_STAGING_TABLE} s ON s.id = c.id
+        WHERE c.owner_id = :owner_id AND c.project_id IS NOT NULL
+    ),
+    merged AS (
+        INSERT INTO conversations (
+            id, owner_id, project_id, title, status, metadata,
+            created_at, updated_at, archived_at, deleted_at
+        )
+        SELECT
+            s.id, :owner_id, p.id, s.title, s.status::conversation_status, s.metadata,
+            COALESCE(s.created_at, now()), COALESCE(s.updated_at, s.created_at, now()),
+            s.archived_at, s.deleted_at
+        FROM {IMPORT_STAGING_TABLE} s
+        LEFT JOIN projects p ON p.id = s.project_id AND p.owner_id = :owner_id
+        ON CONFLICT (id) DO UPDATE SET
+            project_id = EXCLUDED.project_id,
+            title = EXCLUDED.title,
+            status = EXCLUDED.status,
+            metadata = EXCLUDED.metadata,
+            updated_at = EXCLUDED.updated_at,
+            archived_at = EXCLUDED.archived_at,
+            deleted_at = EXCLUDED.deleted_at
+        WHERE conversations.owner_id = EXCLUDED.owner_id
+        RETURNING (xmax = 0) AS inserted, project_id
+    )
+    SELECT
+        (SELECT count(*) FROM merged WHERE inserted) AS inserted,
+        (SELECT count(*) FROM merged WHERE NOT inserted) AS updated,
+        ARRAY(
+            SELECT project_id FROM merged WHERE project_id IS NOT NULL
+            UNION
+            SELECT project_id FROM prev
+        ) AS project_ids
+""")
+
+
+def merge_patch_expr(target: ColumnElement[Any], patch: dict[str, Any]) -> ColumnElement[Any]:
+    """
+    Build an SQL expression applying an RFC 7396 merge patch to the JSONB `target`:
+    null removes a key (`-`), objects merge recursively, anything else replaces (`||`).
+    A non-object target (including NULL) is treated as `{}`, as the RFC specifies.
+    """
+    merged = case(
+        (func.jsonb_typeof(target) == "object", target),
+        else_=literal_column("'{}'::jsonb"),
+    )
+    removed = [key for key, value in patch.items() if value is None]
+    if removed:
+        merged = merged.op("-", return_type=JSONB)(cast(array(removed), ARRAY(Text)))
+    replaced = {key: value for key, value in patch.items() if value is not None and not isinstance(value, dict)}
+    if replaced:
+        merged = merged.op("||", return_type=JSONB)(literal(replaced, JSONB))
+    nested = [(key, value) for key, value in patch.items() if isinstance(value, dict)]
+    if nested:
+        pairs: list[Any] = []
+        for key, value in nested:
+            pairs += [key, merge_patch_expr(target.op("->", return_type=JSONB)(key), value)]
+        merged = merged.op("||", return_type=JSONB)(func.jsonb_build_object(*pairs, type_=JSONB))
+    return merged
+
 
 # --- Conversations Repository Class ---
 class ConversationsRepository:
@@ -25,11 +159,20 @@ class ConversationsRepository:
         owner_id: uuid.UUID,
         title: str | None,
         metadata: dict | None,
+        project_id: uuid.UUID | None = None,
+        conversation_id: uuid.UUID | None = None,
     ) -> Conversation:
         """
             Create a new conversation in the database.
+            `conversation_id` lets callers reference the row (e.g. in a NOTIFY) before the commit.
         """
-        conv = Conversation(owner_id=owner_id, title=title, metadata_=metadata)
+        conv = Conversation(
+            id=conversation_id or uuid.uuid4(),
+            owner_id=owner_id,
+            title=title,
+            metadata_=metadata,
+            project_id=project_id,
+        )
         db.add(conv)
         await db.commit()
         await db.refresh(conv)
@@ -56,7 +199,7 @@ class ConversationsRepository:
 
         # --- Exclude deleted conversations unless explicitly requested ---
         if not include_deleted:
-            stmt = stmt.where(Conversation.status != ConversationStatus.deleted)
+            stmt = stmt.where(NOT_DELETED)
 
         res = await db.execute(stmt)
         return res.scalar_one_or_none()
@@ -81,9 +224,9 @@ class ConversationsRepository:
         # --- Apply status filter ---
         # Default behavior: do not show deleted unless explicitly asked
         if status is None:
-            base = base.where(Conversation.status != ConversationStatus.deleted)
+            base = base.where(NOT_DELETED)
         else:
-            base = base.where(Conversation.status == status)
+            base = base.where(status_is(status))
 
         # --- Calculate total count for pagination metadata ---
         count_stmt = select(func.count()).select_from(base.subquery())
@@ -108,6 +251,7 @@ class ConversationsRepository:
         title: str | None | object = UNSET,
         status: ConversationStatus | None | object = UNSET,
         metadata: dict | None | object = UNSET,
+        project_id: uuid.UUID | None | object = UNSET,
     ) -> Conversation:
         """
         Update conversation fields.
@@ -120,12 +264,46 @@ class ConversationsRepository:
             conversation.status = status
         if metadata is not UNSET:
             conversation.metadata_ = metadata
+        if project_id is not UNSET:
+            conversation.project_id = project_id
 
         # --- Persist changes ---
         await db.commit()
         await db.refresh(conversation)
         return conversation
 
+    # --- UPDATE Operation: Merge-Patch Metadata ---
+    async def merge_metadata(
+        self,
+        db: AsyncSession,
+        *,
+        owner_id: uuid.UUID,
+        conversation_id: uuid.UUID,
+        patch: dict[str, Any],
+        max_bytes: int | None = None,
+    ) -> Conversation | None:
+        """
+        Apply an RFC 7396 merge patch to `metadata` in a single UPDATE ... RETURNING.
+        The merge reads the row being updated, so concurrent patches serialize on the row
+        lock and none is lost. Returns None when the conversation is missing/deleted or the
+        merged document would exceed `max_bytes`. Does not commit: the caller does.
+        """
+        merged = merge_patch_expr(Conversation.metadata_, patch)
+        stmt = update(Conversation).where(
+            Conversation.id == conversation_id,
+            Conversation.owner_id == owner_id,
+            NOT_DELETED,
+        )
+        if max_bytes is not None:
+            # --- Repeated rather than read from a subquery: it must see the locked row version ---
+            stmt = stmt.where(func.octet_length(cast(merged, Text)) <= max_bytes)
+        stmt = (
+            stmt.values({Conversation.metadata_: merged})
+            .returning(Conversation)
+            .execution_options(populate_existing=True)
+        )
+        return (await db.execute(stmt)).scalar_one_or_none()
+
     # --- DELETE Operation: Soft Delete ---
     async def soft_delete(
         self,
@@ -139,3 +317,234 @@ class ConversationsRepository:
         """
         conversation.soft_delete()
         await db.commit()
+
+    # --- CHANGE FEED: Catch Up After a Reconnect ---
+    async def changes_since(
+        self,
+        db: AsyncSession,
+        *,
+        owner_id: uuid.UUID,
+        updated_at: datetime,
+        conversation_id: uuid.UUID,
+        limit: int,
+    ) -> Sequence[tuple[uuid.UUID, ConversationStatus, datetime]]:
+        """
+        (id, status, updated_at) of the owner's conversations changed after the cursor,
+        oldest first. Live and deleted rows are read separately so each side uses its
+        partial index; at most `limit` + 1 rows are returned so callers can detect overflow.
+        """
+        columns = (Conversation.id, Conversation.status, Conversation.updated_at)
+        after_cursor = tuple_(Conversation.updated_at, Conversation.id) > tuple_(
+            literal(updated_at, Conversation.updated_at.type),
+            literal(conversation_id, Conversation.id.type),
+        )
+        live = (
+            select(*columns)
+            .where(Conversation.owner_id == owner_id, NOT_DELETED, after_cursor)
+            .order_by(Conversation.updated_at, Conversation.id)
+            .limit(limit + 1)
+        )
+        # --- Soft delete stamps deleted_at and updated_at in the same transaction ---
+        deleted = (
+            select(*columns)
+            .where(
+                Conversation.owner_id == owner_id,
+                IS_DELETED,
+                Conversation.deleted_at >= updated_at,
+                after_cursor,
+            )
+            .order_by(Conversation.updated_at, Conversation.id)
+            .limit(limit + 1)
+        )
+        rows = [tuple(row) for stmt in (live, deleted) for row in (await db.execute(stmt)).all()]
+        rows.sort(key=lambda row: (row[2], row[0]))
+        return rows[: limit + 1]
+
+    # --- EXPORT: Stream One Owner's Conversations as NDJSON Lines ---
+    @staticmethod
+    def export_stmt(*, owner_id: uuid.UUID, include_deleted: bool = False) -> Select:
+        """
+        Postgres renders each row as a JSON line, so the app only joins strings: no ORM
+        objects and no per-row Python serialization on the export hot path.
+        """
+        document = func.json_build_object(
+            "id", Conversation.id,
+            "project_id", Conversation.project_id,
+            "title", Conversation.title,
+            "status", Conversation.status,
+            "metadata", Conversation.metadata_,
+            "created_at", Conversation.created_at,
+            "updated_at", Conversation.updated_at,
+            "archived_at", Conversation.archived_at,
+            "deleted_at", Conversation.deleted_at,
+        )
+        stmt = select(cast(document, Text)).where(Conversation.owner_id == owner_id)
+        if not include_deleted:
+            stmt = stmt.where(NOT_DELETED)
+        return stmt.order_by(Conversation.created_at, Conversation.id)
+
+    async def stream_export(
+        self,
+        db: AsyncSession,
+        *,
+        owner_id: uuid.UUID,
+        include_deleted: bool = False,
+        batch_size: int = 1_000,
+    ) -> AsyncIterator[Sequence[str]]:
+        """
+        Yield batches of NDJSON lines from a server-side cursor; memory stays at one batch.
+        """
+        stmt = self.export_stmt(owner_id=owner_id, include_deleted=include_deleted)
+        result = await db.stream_scalars(stmt.execution_options(yield_per=batch_size))
+        async for lines in result.partitions():
+            yield lines
+
+    # --- IMPORT: COPY into Staging, then Merge ---
+    async def stage_import_rows(
+        self,
+        db: AsyncSession,
+        *,
+        records: Sequence[tuple[Any, ...]],
+    ) -> None:
+        """
+        Bulk-load validated rows (in IMPORT_COLUMNS order) with asyncpg binary COPY on the
+        session's own connection, inside its transaction. Does not commit.
+        """
+        await db.execute(_CREATE_STAGING)
+        connection = await db.connection()
+        raw = await connection.get_raw_connection()
+        await raw.driver_connection.copy_records_to_table(
+            IMPORT_STAGING_TABLE,
+            records=records,
+            columns=list(IMPORT_COLUMNS),
+        )
+
+    async def merge_staged(
+        self,
+        db: AsyncSession,
+        *,
+        owner_id: uuid.UUID,
+    ) -> tuple[int, int, Sequence[uuid.UUID]]:
+        """
+        Upsert staged rows for `owner_id` in one statement.
+        Returns (inserted, updated, affected project ids). Does not commit.
+        """
+        row = (await db.execute(_MERGE_STAGED, {"owner_id": owner_id})).one()
+        return int(row.inserted), int(row.updated), list(row.project_ids or [])
+
+    # --- RETENTION: Move or Purge Expired Soft-Deleted Rows ---
+    @staticmethod
+    def purge_deleted_stmt(*, deleted_before: datetime, batch_size: int, archive: bool = True):
+        """
+        One statement per batch. Rows are picked oldest-first with SKIP LOCKED, so concurrent
+        purgers and user writes never wait on each other. With `archive`, DELETE ... RETURNING
+        feeds the INSERT into `conversations_archive`: a row is never lost or duplicated.
+        """
+        doomed = (
+            select(Conversation.id)
+            .where(
+                IS_DELETED,
+                Conversation.deleted_at < deleted_before,
+            )
+            .order_by(Conversation.deleted_at)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+            .cte("doomed")
+        )
+        removed = delete(Conversation).where(Conversation.id.in_(select(doomed.c.id)))
+        if not archive:
+            return removed.returning(Conversation.id)
+
+        table = Conversation.__table__
+        moved = removed.returning(*(table.c[name] for name in _ARCHIVED_COLUMNS)).cte("moved")
+        return (
+            insert(ConversationArchive)
+            .from_select(list(_ARCHIVED_COLUMNS), select(*(moved.c[name] for name in _ARCHIVED_COLUMNS)))
+            .returning(ConversationArchive.id)
+        )
+
+    async def purge_deleted_batch(
+        self,
+        db: AsyncSession,
+        *,
+        deleted_before: datetime,
+        batch_size: int,
+        archive: bool = True,
+    ) -> int:
+        """
+        Archive (or hard-delete) up to `batch_size` conversations soft-deleted before
+        `deleted_before`. Commits per batch to keep locks short; returns rows processed.
+        """
+        stmt = self.purge_deleted_stmt(deleted_before=deleted_before, batch_size=batch_size, archive=archive)
+        processed = len((await db.execute(stmt)).all())
+        await db.commit()
+        return processed
+
+    # --- CONTEXT: Rolling Summary ---
+    async def get_summary(
+        self,
+        db: AsyncSession,
+        *,
+        conversation_id: uuid.UUID,
+    ) -> ConversationSummary | None:
+        res = await db.execute(
+            select(ConversationSummary).where(ConversationSummary.conversation_id == conversation_id)
+        )
+        return res.scalar_one_or_none()
+
+    @staticmethod
+    def request_summary_stmt(*, conversation_id: uuid.UUID, through: int, every: int):
+        """
+        Claim the right to queue a summary job covering messages [0, through).
+        Succeeds (returns a row) only if no job was queued within the last `every`
+        messages, so concurrent turns of one conversation queue a single job.
+        """
+        stmt = pg_insert(ConversationSummary).values(conversation_id=conversation_id, requested_count=through)
+        return stmt.on_conflict_do_update(
+            index_elements=[ConversationSummary.conversation_id],
+            set_={"requested_count": stmt.excluded.requested_count},
+            where=ConversationSummary.requested_count + every <= stmt.excluded.requested_count,
+        ).returning(ConversationSummary.summarized_count)
+
+    async def request_summary(
+        self,
+        db: AsyncSession,
+        *,
+        conversation_id: uuid.UUID,
+        through: int,
+        every: int,
+    ) -> int | None:
+        """
+        See `request_summary_stmt`. Returns the current summarized_count when claimed,
+        None otherwise. Does not commit: the job insert commits both together.
+        """
+        stmt = self.request_summary_stmt(conversation_id=conversation_id, through=through, every=every)
+        return (await db.execute(stmt)).scalar_one_or_none()
+
+    async def apply_summary(
+        self,
+        db: AsyncSession,
+        *,
+        conversation_id: uuid.UUID,
+        base_count: int,
+        summarized_count: int,
+        summary: str,
+        summary_tokens: int,
+    ) -> bool:
+        """
+        Store a summary built on top of the one covering `base_count` messages.
+        Compare-and-set on summarized_count: a job that raced a newer one (or retried
+        after it) is dropped instead of overwriting fresher state. Commits.
+        """
+        stmt = (
+            update(ConversationSummary)
+            .where(
+                ConversationSummary.conversation_id == conversation_id,
+                ConversationSummary.summarized_count == base_count,
+            )
+            .values(summary=summary, summarized_count=summarized_count, summary_tokens=summary_tokens)
+            .returning(ConversationSummary.conversation_id)
+        )
+        applied = (await db.execute(stmt)).first() is not None
+        await db.commit()
+        return applied
@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from loguru import logger
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import get_settings
+from app.core.database import async_session_maker
+from app.core.logging import configure_logging
+from app.modules.conversations.repository import ConversationsRepository
+from app.modules.conversations.schemas import RetentionMode
+
+RETENTION_JOB_KIND = "conversations.retention"
+
+
+@dataclass(frozen=True)
+class RetentionBatch:
+    index: int
+    rows: int
+    seconds: float
+
+
+@dataclass
+class RetentionReport:
+    mode: RetentionMode
+    deleted_before: datetime
+    batches: list[RetentionBatch] = field(default_factory=list)
+
+    @property
+    def total_rows(self) -> int:
+        return sum(batch.rows for batch in self.batches)
+
+    @property
+    def total_seconds(self) -> float:
+        return sum(batch.seconds for batch in self.batches)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "mode": self.mode,
+            "deleted_before": self.deleted_before.isoformat(),
+            "batches": len(self.batches),
+            "rows": self.total_rows,
+            "seconds": self.total_seconds,
+            "max_batch_seconds": max((batch.seconds for batch in self.batches), default=0.0),
+        }
+
+
+class ConversationRetention:
+    """
+        Drains expired soft-deleted conversations in small batches, one short transaction
+        each, pausing between batches so the purge never holds long locks or starves
+        foreground queries.
+    """
+
+    def __init__(
+        self,
+        repo: ConversationsRepository | None = None,
+        session_factory: async_sessionmaker[AsyncSession] = async_session_maker,
+    ) -> None:
+        self.repo = repo or ConversationsRepository()
+        self.session_factory = session_factory
+
+    async def run(
+        self,
+        *,
+        older_than: timedelta | None = None,
+        mode: RetentionMode | None = None,
+        batch_size: int | None = None,
+        max_batches: int | None = None,
+        pause_seconds: float | None = None,
+        now: datetime | None = None,
+        on_batch: Callable[[RetentionBatch], Awaitable[None]] | None = None,
+    ) -> RetentionReport:
+        settings = get_settings()
+        older_than = older_than if older_than is not None else timedelta(days=settings.retention_deleted_after_days)
+        mode = mode or settings.retention_mode
+        batch_size = batch_size or settings.retention_batch_size
+        max_batches = max_batches or settings.retention_max_batches
+        pause_seconds = settings.retention_batch_pause_seconds if pause_seconds is None else pause_seconds
+        if mode not in ("archive", "purge"):
+            raise ValueError(f"Unknown retention mode: {mode!r}")
+        if older_than < timedelta(0):
+            raise ValueError("older_than must not be negative")
+
+        report = RetentionReport(mode=mode, deleted_before=(now or datetime.now(timezone.utc)) - older_than)
+        for index in range(max_batches):
+            started = time.perf_counter()
+            async with self.session_factory() as db:
+                rows = await self.repo.purge_deleted_batch(
+                    db,
+                    deleted_before=report.deleted_before,
+                    batch_size=batch_size,
+                    # --- Only an explicit purge skips the archive copy ---
+                    archive=mode != "purge",
+                )
+            batch = RetentionBatch(index=index, rows=rows, seconds=time.perf_counter() - started)
+            report.batches.append(batch)
+            logger.info(
+                "Conversation retention ({}) batch {}: {} rows in {:.1f} ms",
+                mode,
+                index,
+                rows,
+                batch.seconds * 1000,
+            )
+            if on_batch is not None:
+                await on_batch(batch)
+            if rows < batch_size:
+                break
+            if pause_seconds > 0:
+                await asyncio.sleep(pause_seconds)
+
+        logger.info(
+            "Conversation retention ({}) done: {} rows in {} batches, {:.1f} ms",
+            mode,
+            report.total_rows,
+            len(report.batches),
+            report.total_seconds * 1000,
+        )
+        return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Archive or purge expired soft-deleted conversations")
+    parser.add_argument("--mode", choices=["archive", "purge"], default=None)
+    parser.add_argument("--older-than-days", type=int, default=None)
+    parser.add_argument("--batch-size", type=int, default=None)
+    parser.add_argument("--max-batches", type=int, default=None)
+    args = parser.parse_args()
+
+    configure_logging(get_settings())
+    older_than = timedelta(days=args.older_than_days) if args.older_than_days is not None else None
+    asyncio.run(
+        ConversationRetention().run(
+            older_than=older_than,
+            mode=args.mode,
+            batch_size=args.batch_size,
+            max_batches=args.max_batches,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,21 +1,32 @@
 import math
 import uuid
-from fastapi import APIRouter, Depends, Query, Response, status
+from typing import Any
+
+from fastapi import APIRouter, Body, Depends, Header, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.v1.deps import get_db, get_current_user, CurrentUser
+from app.api.v1.deps import get_db, get_current_user, rate_limit, CurrentUser
+from app.modules.conversations.context import ConversationContext
+from app.modules.conversations.feed import get_conversation_feed
 from app.modules.conversations.models import ConversationStatus
 from app.modules.conversations.schemas import (
     ConversationCreate,
     ConversationUpdate,
     ConversationOut,
     ConversationListResponse,
+    ConversationImportReport,
+    ConversationContextRequest,
+    ConversationContextOut,
     Pagination,
 )
 from app.modules.conversations.service import ConversationsService
+from app.modules.conversations.transfer import ConversationTransfer, iter_lines
 
 router = APIRouter(prefix="/conversations", tags=["conversations"])
 service = ConversationsService()
+transfer = ConversationTransfer()
+context = ConversationContext()
 
 
 @router.get("", response_model=ConversationListResponse)
@@ -59,6 +70,42 @@ async def create_conversation(
     return ConversationOut.model_validate(conv)
 
 
+# --- Declared before /{conversation_id} so "export" is not parsed as an id ---
+@router.get("/export", response_class=StreamingResponse)
+async def export_conversations(
+    include_deleted: bool = Query(default=False),
+    user: CurrentUser = Depends(get_current_user),
+) -> StreamingResponse:
+    return StreamingResponse(
+        transfer.export_ndjson(owner_id=user.id, include_deleted=include_deleted),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": 'attachment; filename="conversations.ndjson"'},
+    )
+
+
+@router.get("/changes", response_class=StreamingResponse)
+async def stream_conversation_changes(
+    cursor: str | None = Query(default=None, description="Resume after this event id"),
+    last_event_id: str | None = Header(default=None),
+    user: CurrentUser = Depends(get_current_user),
+) -> StreamingResponse:
+    # --- SSE: browsers resend the last `id:` as Last-Event-ID when they reconnect ---
+    return StreamingResponse(
+        get_conversation_feed().stream(owner_id=user.id, cursor=last_event_id or cursor),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.post("/import", response_model=ConversationImportReport)
+async def import_conversations(
+    request: Request,
+    user: CurrentUser = Depends(get_current_user),
+) -> ConversationImportReport:
+    # --- Body is consumed as a stream: one NDJSON line per conversation, never fully buffered ---
+    return await transfer.import_ndjson(owner_id=user.id, lines=iter_lines(request.stream()))
+
+
 @router.get("/{conversation_id}", response_model=ConversationOut)
 async def get_conversation(
     conversation_id: uuid.UUID,
@@ -85,6 +132,44 @@ async def update_conversation(
     return ConversationOut.model_validate(conv)
 
 
+@router.patch("/{conversation_id}/metadata", response_model=ConversationOut)
+async def merge_conversation_metadata(
+    conversation_id: uuid.UUID,
+    # --- RFC 7396 merge patch (application/merge-patch+json): keys are set, null removes ---
+    patch: dict[str, Any] = Body(...),
+    db: AsyncSession = Depends(get_db),
+    user: CurrentUser = Depends(get_current_user),
+) -> ConversationOut:
+    conv = await service.merge_metadata(
+        db,
+        owner_id=user.id,
+        conversation_id=conversation_id,
+        patch=patch,
+    )
+    return ConversationOut.model_validate(conv)
+
+
+# --- May queue an LLM summary job: charged to the generation quota on top of the router limit ---
+@router.post(
+    "/{conversation_id}/context",
+    response_model=ConversationContextOut,
+    dependencies=[Depends(rate_limit("conversations.context"))],
+)
+async def build_conversation_context(
+    conversation_id: uuid.UUID,
+    payload: ConversationContextRequest,
+    db: AsyncSession = Depends(get_db),
+    user: CurrentUser = Depends(get_current_user),
+) -> ConversationContextOut:
+    # --- Summary + recent turns + snippets within the token budget; may queue a summary refresh ---
+    return await context.build(
+        db,
+        owner_id=user.id,
+        conversation_id=conversation_id,
+        payload=payload,
+    )
+
+
 @router.delete("/{conversation_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_conversation(
     conversation_id: uuid.UUID,
@@ -1,7 +1,10 @@
-from datetime import datetime
+from datetime import datetime, timezone
 import uuid
+from typing import Literal
 
 from pydantic import BaseModel, Field, ConfigDict, field_validator
+
+from app.core.config import get_settings
 from app.modules.conversations.models import ConversationStatus
 
 class Pagination(BaseModel):
@@ -15,6 +18,7 @@ class Pagination(BaseModel):
 class ConversationCreate(BaseModel):
     title: str | None = Field(default=None , max_length=255)
     metadata: dict | None = None
+    project_id: uuid.UUID | None = None
 
     @field_validator("title")
     @classmethod
@@ -30,6 +34,7 @@ class ConversationUpdate(BaseModel):
     title: str | None = Field(default=None , max_length=255)
     status: ConversationStatus | None = None
     metadata: dict | None = None
+    project_id: uuid.UUID | None = None
 
     @field_validator("title")
     @classmethod
@@ -46,6 +51,7 @@ class ConversationOut(BaseModel):
 
     id: uuid.UUID
     owner_id: uuid.UUID
+    project_id: uuid.UUID | None = None
     title: str | None 
     status: ConversationStatus 
     # --- Let's get some metadata --- 
@@ -62,3 +68,106 @@ class ConversationOut(BaseModel):
 class ConversationListResponse(BaseModel):
     data: list[ConversationOut]
     pagination: Pagination
+
+class ConversationImportRow(ConversationCreate):
+    """
+        One NDJSON line of an import: the create rules plus the fields an export carries.
+        owner_id is never read from the file; rows always land on the importing owner.
+    """
+    id: uuid.UUID | None = None
+    status: ConversationStatus = ConversationStatus.active
+    created_at: datetime | None = None
+    updated_at: datetime | None = None
+    archived_at: datetime | None = None
+    deleted_at: datetime | None = None
+
+    @field_validator("created_at", "updated_at", "archived_at", "deleted_at")
+    @classmethod
+    def assume_utc(cls, v: datetime | None) -> datetime | None:
+        if v is not None and v.tzinfo is None:
+            return v.replace(tzinfo=timezone.utc)
+        return v
+
+class ConversationImportError(BaseModel):
+    line: int
+    message: str
+
+class ConversationImportReport(BaseModel):
+    received: int
+    inserted: int
+    updated: int
+    # --- Valid rows whose id already belongs to another owner ---
+    skipped: int
+    invalid: int
+    batches: int
+    seconds: float
+    errors: list[ConversationImportError]
+
+RetentionMode = Literal["archive", "purge"]
+
+class ConversationRetentionJob(BaseModel):
+    """
+        Payload of a retention job. Unknown keys are rejected: a misspelled field must
+        not fall back to a default on a path that deletes data.
+    """
+    model_config = ConfigDict(extra="forbid")
+
+    mode: RetentionMode | None = None
+    older_than_days: int | None = Field(default=None, ge=0)
+    batch_size: int | None = Field(default=None, ge=1)
+
+class ContextMessage(BaseModel):
+    role: Literal["user", "model"]
+    content: str
+
+class ConversationContextRequest(BaseModel):
+    """
+        The full turn history (oldest first, ending with the new user turn) plus
+        retrieved snippets, most relevant first.
+    """
+    messages: list[ContextMessage] = Field(min_length=1)
+    snippets: list[str] = Field(default_factory=list)
+    token_budget: int | None = Field(default=None, ge=256)
+
+    # --- Bounded: the unsummarized part of `messages` is copied into a job payload ---
+    @field_validator("messages")
+    @classmethod
+    def limit_messages(cls, v: list[ContextMessage]) -> list[ContextMessage]:
+        settings = get_settings()
+        if len(v) > settings.conversation_context_max_messages:
+            raise ValueError(f"at most {settings.conversation_context_max_messages} messages")
+        if any(len(m.content) > settings.conversation_context_max_chars for m in v):
+            raise ValueError(f"message content is limited to {settings.conversation_context_max_chars} characters")
+        return v
+
+    @field_validator("snippets")
+    @classmethod
+    def limit_snippets(cls, v: list[str]) -> list[str]:
+        settings = get_settings()
+        if len(v) > settings.conversation_context_max_snippets:
+            raise ValueError(f"at most {settings.conversation_context_max_snippets} snippets")
+        if any(len(s) > settings.conversation_context_max_chars for s in v):
+            raise ValueError(f"snippets are limited to {settings.conversation_context_max_chars} characters")
+        return v
+
+class ConversationContextOut(BaseModel):
+    summary: str | None
+    messages: list[ContextMessage]
+    snippets: list[str]
+    # --- Messages [0, summarized_count) are represented by `summary` ---
+    summarized_count: int
+    dropped_messages: int
+    dropped_snippets: int
+    prompt_tokens: int
+    full_tokens: int
+    saved_tokens: int
+    summary_job_id: uuid.UUID | None = None
+
+class ConversationSummaryJob(BaseModel):
+    """
+        Payload of a summary job: only the turns not yet folded in, never the full history.
+    """
+    conversation_id: uuid.UUID
+    # --- summarized_count the new turns extend; stale jobs are dropped on mismatch ---
+    base_count: int = Field(ge=0)
+    messages: list[ContextMessage] = Field(min_length=1)
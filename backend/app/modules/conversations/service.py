@@ -1,17 +1,44 @@
+import json
 import uuid
 from datetime import datetime, timezone
+from typing import Any
 
 from fastapi import HTTPException, status
+from sqlalchemy import func
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import get_settings
+from app.modules.conversations.feed import publish_change
+
 # --- We Import the need Models , Repositories , Schemas --- 
 from app.modules.conversations.models import Conversation, ConversationStatus
 from app.modules.conversations.repository import ConversationsRepository
 from app.modules.conversations.schemas import ConversationCreate, ConversationUpdate
+from app.modules.projects.service import ProjectsService
 
 class ConversationsService:
-    def __init__(self, repo: ConversationsRepository | None = None ) -> None:
+    def __init__(
+        self,
+        repo: ConversationsRepository | None = None,
+        projects: ProjectsService | None = None,
+    ) -> None:
         self.repo = repo or ConversationsRepository()
+        self.projects = projects or ProjectsService()
+
+    @staticmethod
+    def _check_metadata_size(metadata: dict | None) -> None:
+        """
+            The bound `merge_metadata` applies in SQL, for a full replacement. jsonb text
+            uses the same separators as json.dumps, so the byte counts agree.
+        """
+        max_bytes = get_settings().conversation_metadata_max_bytes
+        if max_bytes is None or metadata is None:
+            return
+        if len(json.dumps(metadata, ensure_ascii=False).encode("utf-8")) > max_bytes:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"Metadata would exceed {max_bytes} bytes",
+            )
     
     async def create_conversation(
         self,
@@ -20,12 +47,24 @@ class ConversationsService:
         owner_id: uuid.UUID,
         payload: ConversationCreate,
     ) -> Conversation:
+        self._check_metadata_size(payload.metadata)
+        # --- Project aggregates are updated in the same transaction as the insert ---
+        await self.projects.ensure_owned(db, owner_id=owner_id, project_id=payload.project_id)
+        await self.projects.record_membership_change(
+            db, kind="conversations", before=None, after=payload.project_id
+        )
+        # --- Change events ride the write's transaction: published iff it commits ---
+        conversation_id = uuid.uuid4()
+        await publish_change(
+            db, conversation_id=conversation_id, owner_id=owner_id, status=ConversationStatus.active
+        )
         return await self.repo.create(
             db,
             owner_id=owner_id,
             title=payload.title,
             metadata=payload.metadata,
-
+            project_id=payload.project_id,
+            conversation_id=conversation_id,
         )
     async def get_conversation(
         self,
@@ -79,7 +118,8 @@ class ConversationsService:
 
         if new_status == ConversationStatus.deleted:
             conv.status = ConversationStatus.deleted
-            conv.deleted_at = now
+            # --- Database clock, like updated_at and the change-feed cursor it is compared with ---
+            conv.deleted_at = func.now()
             return
 
         raise HTTPException(status_code=409, detail="Invalid status transition")
@@ -91,7 +131,10 @@ class ConversationsService:
         conversation_id: uuid.UUID,
         payload: ConversationUpdate
     ) -> Conversation:
+        if "metadata" in payload.model_fields_set:
+            self._check_metadata_size(payload.metadata)
         conv = await self.get_conversation(db, owner_id=owner_id, conversation_id=conversation_id)
+        project_before = conv.project_id
         update_fields: dict[str, object] = {}
 
         # --- Apply Title update ---
@@ -109,8 +152,60 @@ class ConversationsService:
             self._apply_status_transition(conv, payload.status)
             update_fields["status"] = conv.status
 
+        # --- Apply project move ---
+        if "project_id" in payload.model_fields_set and payload.project_id != conv.project_id:
+            await self.projects.ensure_owned(db, owner_id=owner_id, project_id=payload.project_id)
+            conv.project_id = payload.project_id
+            update_fields["project_id"] = conv.project_id
+
+        # --- Keep project aggregates in step (deleted conversations are not counted) ---
+        project_after = None if conv.status == ConversationStatus.deleted else conv.project_id
+        await self.projects.record_membership_change(
+            db,
+            kind="conversations",
+            before=project_before,
+            after=project_after,
+            touched=project_after or project_before,
+        )
+        await publish_change(db, conversation_id=conv.id, owner_id=owner_id, status=conv.status)
+
         # --- Let's Persist via repo ---
         return await self.repo.update(db, conversation=conv, **update_fields)
+    async def merge_metadata(
+        self,
+        db: AsyncSession,
+        *,
+        owner_id: uuid.UUID,
+        conversation_id: uuid.UUID,
+        patch: dict[str, Any],
+    ) -> Conversation:
+        # --- One UPDATE merges server-side: no read-modify-write round trip, no lost updates ---
+        max_bytes = get_settings().conversation_metadata_max_bytes
+        conv = await self.repo.merge_metadata(
+            db,
+            owner_id=owner_id,
+            conversation_id=conversation_id,
+            patch=patch,
+            max_bytes=max_bytes,
+        )
+        if conv is None:
+            await db.rollback()
+            # --- Rare path: find out whether the row is missing or the result too large ---
+            await self.get_conversation(db, owner_id=owner_id, conversation_id=conversation_id)
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"Merged metadata would exceed {max_bytes} bytes",
+            )
+        await self.projects.record_membership_change(
+            db,
+            kind="conversations",
+            before=conv.project_id,
+            after=conv.project_id,
+            touched=conv.project_id,
+        )
+        await publish_change(db, conversation_id=conv.id, owner_id=owner_id, status=conv.status)
+        await db.commit()
+        return conv
     async def delete_conversation(
         self,
         db: AsyncSession,
@@ -120,4 +215,8 @@ class ConversationsService:
         ) -> None:
         conv = await self.get_conversation(db, owner_id=owner_id, conversation_id=conversation_id)
         self._apply_status_transition(conv, ConversationStatus.deleted)
+        await self.projects.record_membership_change(
+            db, kind="conversations", before=conv.project_id, after=None
+        )
+        await publish_change(db, conversation_id=conv.id, owner_id=owner_id, status=conv.status)
         await self.repo.update(db, conversation=conv, status=conv.status)
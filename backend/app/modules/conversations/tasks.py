@@ -0,0 +1,52 @@
+from datetime import timedelta
+
+from app.modules.conversations.context import SUMMARIZE_JOB_KIND, ConversationContext, GeminiSummarizer
+from app.modules.conversations.retention import RETENTION_JOB_KIND, ConversationRetention, RetentionBatch
+from app.modules.conversations.schemas import ConversationRetentionJob, ConversationSummaryJob
+from app.modules.jobs.registry import PermanentJobError, job_handler
+from app.modules.jobs.worker import JobContext
+
+retention = ConversationRetention()
+context = ConversationContext()
+# --- One Gemini client per worker process, shared by every summary job ---
+summarizer = GeminiSummarizer()
+
+
+@job_handler(RETENTION_JOB_KIND)
+async def run_retention(ctx: JobContext, payload: dict) -> dict:
+    try:
+        job = ConversationRetentionJob.model_validate(payload)
+    except ValueError as exc:
+        raise PermanentJobError(f"Invalid retention payload: {exc}") from exc
+
+    rows = 0
+
+    async def _progress(batch: RetentionBatch) -> None:
+        nonlocal rows
+        rows += batch.rows
+        # --- Total is unknown up front: report rows so far, progress stays indeterminate ---
+        await ctx.report_progress(0.0, f"{rows} rows in {batch.index + 1} batches")
+
+    report = await retention.run(
+        older_than=timedelta(days=job.older_than_days) if job.older_than_days is not None else None,
+        mode=job.mode,
+        batch_size=job.batch_size,
+        on_batch=_progress,
+    )
+    return report.as_dict()
+
+
+@job_handler(SUMMARIZE_JOB_KIND)
+async def refresh_summary(ctx: JobContext, payload: dict) -> dict:
+    try:
+        job = ConversationSummaryJob.model_validate(payload)
+    except ValueError as exc:
+        raise PermanentJobError(f"Invalid summary payload: {exc}") from exc
+
+    # --- EmptySummaryError propagates: the worker retries with backoff ---
+    applied = await context.refresh_summary(job, summarizer)
+    return {
+        "conversation_id": str(job.conversation_id),
+        "summarized_count": job.base_count + len(job.messages),
+        "applied": applied,
+    }
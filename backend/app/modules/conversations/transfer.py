@@ -0,0 +1,237 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+import uuid
+from collections.abc import AsyncIterator
+from typing import Any, BinaryIO
+
+from loguru import logger
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import get_settings
+from app.core.database import async_session_maker
+from app.core.logging import configure_logging
+from app.modules.conversations.feed import publish_reset
+from app.modules.conversations.repository import ConversationsRepository
+from app.modules.conversations.schemas import (
+    ConversationImportError,
+    ConversationImportReport,
+    ConversationImportRow,
+)
+from app.modules.projects.repository import ProjectsRepository
+
+READ_CHUNK = 256 * 1024
+
+
+async def iter_lines(chunks: AsyncIterator[bytes], max_line_bytes: int | None = None) -> AsyncIterator[bytes]:
+    """
+        Re-split an arbitrary byte stream (request body, file reads) into lines.
+
+        At most `max_line_bytes + 1` bytes of a line are kept (default
+        `conversation_import_max_line_bytes`): a longer line is yielded cut to that
+        length, so the caller can reject it, and the rest is skipped up to its newline.
+    """
+    limit = max_line_bytes or get_settings().conversation_import_max_line_bytes
+    pending = bytearray()
+    async for chunk in chunks:
+        *complete, tail = chunk.split(b"\n")
+        for piece in complete:
+            pending += piece[: limit + 1 - len(pending)]
+            yield bytes(pending)
+            pending.clear()
+        pending += tail[: limit + 1 - len(pending)]
+    if pending:
+        yield bytes(pending)
+
+
+def import_record(row: ConversationImportRow) -> tuple[Any, ...]:
+    """
+        A validated row as a COPY record, in `IMPORT_COLUMNS` order.
+    """
+    return (
+        row.id or uuid.uuid4(),
+        row.project_id,
+        row.title,
+        row.status.value,
+        json.dumps(row.metadata) if row.metadata is not None else None,
+        row.created_at,
+        row.updated_at,
+        row.archived_at,
+        row.deleted_at,
+    )
+
+
+def _error_message(exc: ValueError) -> str:
+    if isinstance(exc, ValidationError):
+        return "; ".join(
+            f"{'.'.join(str(part) for part in err['loc']) or 'line'}: {err['msg']}" for err in exc.errors()
+        )
+    return str(exc)
+
+
+class ConversationTransfer:
+    """
+        Bulk move of one owner's conversations in and out as NDJSON.
+
+        - Export streams from a server-side cursor, one batch of lines in memory at a time.
+        - Import validates each line with the `ConversationCreate` rules, COPYs a batch into
+          a temp staging table and merges it in one statement, committing per batch.
+          It bypasses `ConversationsService`, so instead of per-row change events each
+          batch sends the owner's feed clients one `reset` to refetch.
+    """
+
+    def __init__(
+        self,
+        repo: ConversationsRepository | None = None,
+        projects_repo: ProjectsRepository | None = None,
+        session_factory: async_sessionmaker[AsyncSession] = async_session_maker,
+        *,
+        max_errors: int = 100,
+    ) -> None:
+        self.repo = repo or ConversationsRepository()
+        self.projects_repo = projects_repo or ProjectsRepository()
+        self.session_factory = session_factory
+        self.max_errors = max_errors
+
+    async def export_ndjson(
+        self,
+        *,
+        owner_id: uuid.UUID,
+        include_deleted: bool = False,
+        batch_size: int | None = None,
+    ) -> AsyncIterator[bytes]:
+        # --- Own session: a StreamingResponse outlives the request's dependencies ---
+        batch_size = batch_size or get_settings().conversation_export_batch_size
+        async with self.session_factory() as db:
+            async for lines in self.repo.stream_export(
+                db,
+                owner_id=owner_id,
+                include_deleted=include_deleted,
+                batch_size=batch_size,
+            ):
+                yield ("\n".join(lines) + "\n").encode("utf-8")
+
+    async def import_ndjson(
+        self,
+        *,
+        owner_id: uuid.UUID,
+        lines: AsyncIterator[bytes],
+        batch_size: int | None = None,
+    ) -> ConversationImportReport:
+        batch_size = batch_size or get_settings().conversation_import_batch_size
+        started = time.perf_counter()
+        report = ConversationImportReport(
+            received=0, inserted=0, updated=0, skipped=0, invalid=0, batches=0, seconds=0.0, errors=[]
+        )
+        # --- Keyed by id: a repeated id within one batch would abort the upsert ---
+        batch: dict[uuid.UUID, tuple[Any, ...]] = {}
+        max_line_bytes = get_settings().conversation_import_max_line_bytes
+        line_no = 0
+        async for line in lines:
+            line_no += 1
+            if not line.strip():
+                continue
+            report.received += 1
+            try:
+                if len(line) > max_line_bytes:
+                    raise ValueError(f"line is longer than {max_line_bytes} bytes")
+                record = import_record(ConversationImportRow.model_validate_json(line))
+            except ValueError as exc:
+                report.invalid += 1
+                if len(report.errors) < self.max_errors:
+                    report.errors.append(ConversationImportError(line=line_no, message=_error_message(exc)))
+                continue
+            batch[record[0]] = record
+            if len(batch) >= batch_size:
+                await self._flush(owner_id, batch, report)
+        if batch:
+            await self._flush(owner_id, batch, report)
+        report.seconds = time.perf_counter() - started
+        return report
+
+    async def _flush(
+        self,
+        owner_id: uuid.UUID,
+        batch: dict[uuid.UUID, tuple[Any, ...]],
+        report: ConversationImportReport,
+    ) -> None:
+        started = time.perf_counter()
+        async with self.session_factory() as db:
+            await self.repo.stage_import_rows(db, records=list(batch.values()))
+            inserted, updated, project_ids = await self.repo.merge_staged(db, owner_id=owner_id)
+            await self.projects_repo.refresh_stats(db, project_ids=project_ids)
+            if inserted or updated:
+                await publish_reset(db, owner_id=owner_id, reason="import")
+            await db.commit()
+        report.batches += 1
+        report.inserted += inserted
+        report.updated += updated
+        report.skipped += len(batch) - inserted - updated
+        logger.info(
+            "Conversation import batch {}: {} rows ({} inserted, {} updated) in {:.1f} ms",
+            report.batches,
+            len(batch),
+            inserted,
+            updated,
+            (time.perf_counter() - started) * 1000,
+        )
+        batch.clear()
+
+
+async def _read_chunks(fh: BinaryIO) -> AsyncIterator[bytes]:
+    while chunk := await asyncio.to_thread(fh.read, READ_CHUNK):
+        yield chunk
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Export or import an owner's conversations as NDJSON")
+    sub = parser.add_subparsers(dest="command", required=True)
+    export = sub.add_parser("export")
+    export.add_argument("--owner-id", type=uuid.UUID, required=True)
+    export.add_argument("--include-deleted", action="store_true")
+    export.add_argument("--output", default="-", help="file path, or - for stdout")
+    load = sub.add_parser("import")
+    load.add_argument("--owner-id", type=uuid.UUID, required=True)
+    load.add_argument("--batch-size", type=int, default=None)
+    load.add_argument("input", help="file path, or - for stdin")
+    args = parser.parse_args()
+
+    configure_logging(get_settings())
+    transfer = ConversationTransfer()
+
+    async def _export() -> None:
+        async def _write(out: BinaryIO) -> None:
+            async for chunk in transfer.export_ndjson(owner_id=args.owner_id, include_deleted=args.include_deleted):
+                await asyncio.to_thread(out.write, chunk)
+
+        if args.output == "-":
+            await _write(sys.stdout.buffer)
+            return
+        with await asyncio.to_thread(open, args.output, "wb") as out:
+            await _write(out)
+
+    async def _import() -> None:
+        async def _load(fh: BinaryIO) -> ConversationImportReport:
+            return await transfer.import_ndjson(
+                owner_id=args.owner_id,
+                lines=iter_lines(_read_chunks(fh)),
+                batch_size=args.batch_size,
+            )
+
+        if args.input == "-":
+            report = await _load(sys.stdin.buffer)
+        else:
+            with await asyncio.to_thread(open, args.input, "rb") as fh:
+                report = await _load(fh)
+        print(report.model_dump_json(indent=2))
+
+    asyncio.run(_export() if args.command == "export" else _import())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+import enum
+import uuid
+from datetime import datetime
+
+from sqlalchemy import DateTime, Enum, Float, Index, Integer, String, Text, func, text
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base
+
+class JobStatus(str, enum.Enum):
+    queued = "queued"
+    running = "running"
+    succeeded = "succeeded"
+    failed = "failed"
+
+class Job(Base):
+    __tablename__ = "jobs"
+
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+
+    # --- Nullable: system jobs (retention, compaction, ...) have no owner ---
+    owner_id: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True), nullable=True, index=True)
+
+    kind: Mapped[str] = mapped_column(String(100), nullable=False)
+    status: Mapped[JobStatus] = mapped_column(
+        Enum(JobStatus, name="job_status"),
+        nullable=False,
+        default=JobStatus.queued,
+    )
+    payload: Mapped[dict] = mapped_column(JSONB, nullable=False, default=dict)
+    result: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
+
+    # --- Progress reported by the handler (0.0 .. 1.0) ---
+    progress: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    progress_message: Mapped[str | None] = mapped_column(String(255), nullable=True)
+
+    # --- Jobs whose result is shared (e.g. a quiz pool): one in flight per (kind, key) ---
+    dedupe_key: Mapped[str | None] = mapped_column(String(255), nullable=True)
+
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    max_attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=5)
+
+    # --- Scheduling / visibility timeout ---
+    run_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    locked_until: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    locked_by: Mapped[str | None] = mapped_column(String(100), nullable=True)
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+        onupdate=func.now(),
+    )
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
+# --- Only unfinished jobs are ever scanned by workers, keep the claim index small ---
+Index(
+    "ix_jobs_claimable",
+    Job.run_at,
+    postgresql_where=text("status IN ('queued', 'running')"),
+)
+
+# --- Enqueueing a shared job while one is unfinished hands back the existing job ---
+IN_FLIGHT_DEDUPE = "status IN ('queued', 'running') AND dedupe_key IS NOT NULL"
+
+Index(
+    "uq_jobs_in_flight_dedupe",
+    Job.kind,
+    Job.dedupe_key,
+    unique=True,
+    postgresql_where=text(IN_FLIGHT_DEDUPE),
+)
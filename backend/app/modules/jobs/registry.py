@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+from collections.abc import Awaitable, Callable
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from app.modules.jobs.worker import JobContext
+
+JobHandler = Callable[["JobContext", dict[str, Any]], Awaitable[dict[str, Any] | None]]
+
+_HANDLERS: dict[str, JobHandler] = {}
+
+
+class PermanentJobError(Exception):
+    """
+        Raise from a handler when retrying cannot help (bad payload, missing entity...).
+    """
+
+
+def job_handler(kind: str) -> Callable[[JobHandler], JobHandler]:
+    """
+        Register a coroutine as the handler for a job kind.
+
+        @job_handler("quizzes.generate")
+        async def generate(ctx: JobContext, payload: dict) -> dict | None: ...
+    """
+    def decorator(func: JobHandler) -> JobHandler:
+        if kind in _HANDLERS and _HANDLERS[kind] is not func:
+            raise ValueError(f"Job handler already registered for kind '{kind}'")
+        _HANDLERS[kind] = func
+        return func
+
+    return decorator
+
+
+def get_handler(kind: str) -> JobHandler | None:
+    return _HANDLERS.get(kind)
+
+
+def registered_kinds() -> list[str]:
+    return sorted(_HANDLERS)
@@ -0,0 +1,298 @@
+# --- Standard Library Imports ---
+import uuid
+from datetime import datetime, timedelta
+
+# --- Third-Party Imports ---
+from sqlalchemy import and_, func, or_, select, text, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# --- Local Imports ---
+from app.core.notifications import notify
+from app.modules.jobs.models import IN_FLIGHT_DEDUPE, Job, JobStatus
+
+JOBS_CHANNEL = "jobs"
+
+
+# --- Jobs Repository Class ---
+class JobsRepository:
+    """
+        Repository for the Postgres-backed job queue.
+        Workers claim rows with FOR UPDATE SKIP LOCKED so they never block each other.
+    """
+
+    # --- CREATE Operation ---
+    async def enqueue(
+        self,
+        db: AsyncSession,
+        *,
+        kind: str,
+        payload: dict,
+        owner_id: uuid.UUID | None,
+        max_attempts: int,
+        run_at: datetime | None = None,
+        dedupe_key: str | None = None,
+    ) -> Job:
+        """
+            Insert a queued job and wake idle workers via NOTIFY (delivered on commit).
+            With a `dedupe_key`, an unfinished job of the same kind and key is returned
+            instead of inserting a second one.
+        """
+        if dedupe_key is not None:
+            return await self._enqueue_deduped(
+                db,
+                kind=kind,
+                payload=payload,
+                owner_id=owner_id,
+                max_attempts=max_attempts,
+                run_at=run_at,
+                dedupe_key=dedupe_key,
+            )
+
+        job = Job(
+            kind=kind,
+            payload=payload,
+            owner_id=owner_id,
+            max_attempts=max_attempts,
+            status=JobStatus.queued,
+        )
+        if run_at is not None:
+            job.run_at = run_at
+        db.add(job)
+        await db.flush()
+        await notify(db, JOBS_CHANNEL, kind)
+        await db.commit()
+        await db.refresh(job)
+        return job
+
+    async def _enqueue_deduped(
+        self,
+        db: AsyncSession,
+        *,
+        kind: str,
+        payload: dict,
+        owner_id: uuid.UUID | None,
+        max_attempts: int,
+        run_at: datetime | None,
+        dedupe_key: str,
+    ) -> Job:
+        values: dict[str, object] = {
+            "id": uuid.uuid4(),
+            "kind": kind,
+            "payload": payload,
+            "owner_id": owner_id,
+            "max_attempts": max_attempts,
+            "status": JobStatus.queued,
+            "dedupe_key": dedupe_key,
+        }
+        if run_at is not None:
+            values["run_at"] = run_at
+        insert_stmt = (
+            insert(Job)
+            .values(**values)
+            .on_conflict_do_nothing(
+                index_elements=[Job.kind, Job.dedupe_key],
+                index_where=text(IN_FLIGHT_DEDUPE),
+            )
+            .returning(Job)
+        )
+        in_flight = select(Job).where(
+            Job.kind == kind,
+            Job.dedupe_key == dedupe_key,
+            Job.status.in_([JobStatus.queued, JobStatus.running]),
+        )
+        while True:
+            job = (await db.execute(insert_stmt)).scalar_one_or_none()
+            if job is not None:
+                await notify(db, JOBS_CHANNEL, kind)
+                break
+            job = (await db.execute(in_flight)).scalar_one_or_none()
+            # --- None: the conflicting job finished in between, insert again ---
+            if job is not None:
+                break
+        await db.commit()
+        return job
+
+    # --- READ Operation: Get Single Job ---
+    async def get_by_id(
+        self,
+        db: AsyncSession,
+        *,
+        job_id: uuid.UUID,
+        owner_id: uuid.UUID | None = None,
+    ) -> Job | None:
+        """
+            Retrieve a job by ID, optionally scoped to an owner. Deduplicated jobs are
+            shared by every caller they were handed to, so they are not owner-scoped.
+        """
+        stmt = select(Job).where(Job.id == job_id)
+        if owner_id is not None:
+            stmt = stmt.where(or_(Job.owner_id == owner_id, Job.dedupe_key.is_not(None)))
+        res = await db.execute(stmt)
+        return res.scalar_one_or_none()
+
+    # --- CLAIM Operation ---
+    async def claim(
+        self,
+        db: AsyncSession,
+        *,
+        worker_id: str,
+        limit: int,
+        visibility_timeout: timedelta,
+        kinds: list[str] | None = None,
+    ) -> list[Job]:
+        """
+            Atomically claim up to `limit` runnable jobs.
+            Runnable = queued and due, or running with an expired visibility timeout
+            (the previous worker died) and attempts left.
+        """
+        now = func.now()
+        candidates = (
+            select(Job.id)
+            .where(
+                or_(
+                    and_(Job.status == JobStatus.queued, Job.run_at <= now),
+                    and_(
+                        Job.status == JobStatus.running,
+                        Job.locked_until < now,
+                        Job.attempts < Job.max_attempts,
+                    ),
+                )
+            )
+            .order_by(Job.run_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        if kinds:
+            candidates = candidates.where(Job.kind.in_(kinds))
+
+        stmt = (
+            update(Job)
+            .where(Job.id.in_(candidates.scalar_subquery()))
+            .values(
+                status=JobStatus.running,
+                attempts=Job.attempts + 1,
+                locked_by=worker_id,
+                locked_until=now + visibility_timeout,
+                updated_at=now,
+            )
+            .returning(Job)
+            .execution_options(synchronize_session=False)
+        )
+        jobs = list((await db.execute(stmt)).scalars().all())
+        await db.commit()
+        return jobs
+
+    # --- UPDATE Operation: Progress / Heartbeat ---
+    async def heartbeat(
+        self,
+        db: AsyncSession,
+        *,
+        job_id: uuid.UUID,
+        worker_id: str,
+        visibility_timeout: timedelta,
+        progress: float | None = None,
+        progress_message: str | None = None,
+    ) -> bool:
+        """
+            Extend the visibility timeout and optionally record progress.
+            Returns False if the job is no longer owned by this worker.
+        """
+        values: dict[str, object] = {
+            "locked_until": func.now() + visibility_timeout,
+            "updated_at": func.now(),
+        }
+        if progress is not None:
+            values["progress"] = max(0.0, min(1.0, progress))
+        if progress_message is not None:
+            values["progress_message"] = progress_message[:255]
+
+        stmt = (
+            update(Job)
+            .where(Job.id == job_id, Job.locked_by == worker_id, Job.status == JobStatus.running)
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+        res = await db.execute(stmt)
+        await db.commit()
+        return res.rowcount == 1
+
+    # --- UPDATE Operation: Success ---
+    async def complete(
+        self,
+        db: AsyncSession,
+        *,
+        job_id: uuid.UUID,
+        worker_id: str,
+        result: dict | None,
+    ) -> bool:
+        stmt = (
+            update(Job)
+            .where(Job.id == job_id, Job.locked_by == worker_id, Job.status == JobStatus.running)
+            .values(
+                status=JobStatus.succeeded,
+                result=result,
+                error=None,
+                progress=1.0,
+                locked_until=None,
+                finished_at=func.now(),
+                updated_at=func.now(),
+            )
+            .execution_options(synchronize_session=False)
+        )
+        res = await db.execute(stmt)
+        await db.commit()
+        return res.rowcount == 1
+
+    # --- UPDATE Operation: Failure (retry or give up) ---
+    async def fail(
+        self,
+        db: AsyncSession,
+        *,
+        job: Job,
+        worker_id: str,
+        error: str,
+        retry_delay: timedelta | None,
+    ) -> JobStatus:
+        """
+            Record a failed attempt.
+            `retry_delay=None` (or no attempts left) marks the job permanently failed.
+        """
+        retry = retry_delay is not None and job.attempts < job.max_attempts
+        values: dict[str, object] = {"error": error, "locked_until": None, "updated_at": func.now()}
+        if retry:
+            values.update(status=JobStatus.queued, run_at=func.now() + retry_delay)
+        else:
+            values.update(status=JobStatus.failed, finished_at=func.now())
+
+        stmt = (
+            update(Job)
+            .where(Job.id == job.id, Job.locked_by == worker_id, Job.status == JobStatus.running)
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+        await db.execute(stmt)
+        await db.commit()
+        return JobStatus.queued if retry else JobStatus.failed
+
+    # --- UPDATE Operation: Sweep jobs whose worker died on the last attempt ---
+    async def fail_exhausted(self, db: AsyncSession) -> int:
+        stmt = (
+            update(Job)
+            .where(
+                Job.status == JobStatus.running,
+                Job.locked_until < func.now(),
+                Job.attempts >= Job.max_attempts,
+            )
+            .values(
+                status=JobStatus.failed,
+                error="Visibility timeout exceeded on final attempt",
+                locked_until=None,
+                finished_at=func.now(),
+                updated_at=func.now(),
+            )
+            .execution_options(synchronize_session=False)
+        )
+        res = await db.execute(stmt)
+        await db.commit()
+        return res.rowcount
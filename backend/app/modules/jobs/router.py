@@ -0,0 +1,21 @@
+import uuid
+
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.v1.deps import get_db, get_current_user, CurrentUser
+from app.modules.jobs.schemas import JobOut
+from app.modules.jobs.service import JobsService
+
+router = APIRouter(prefix="/jobs", tags=["jobs"])
+service = JobsService()
+
+
+@router.get("/{job_id}", response_model=JobOut)
+async def get_job(
+    job_id: uuid.UUID,
+    db: AsyncSession = Depends(get_db),
+    user: CurrentUser = Depends(get_current_user),
+) -> JobOut:
+    job = await service.get_job(db, owner_id=user.id, job_id=job_id)
+    return JobOut.model_validate(job)
@@ -0,0 +1,31 @@
+from datetime import datetime
+import uuid
+
+from pydantic import BaseModel, ConfigDict, Field
+
+from app.modules.jobs.models import JobStatus
+
+class JobOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: uuid.UUID
+    kind: str
+    status: JobStatus
+    progress: float
+    progress_message: str | None
+    attempts: int
+    max_attempts: int
+    result: dict | None
+    error: str | None
+    run_at: datetime
+    created_at: datetime
+    updated_at: datetime
+    finished_at: datetime | None
+
+class JobAccepted(BaseModel):
+    """
+        Returned by endpoints that hand work off to the queue (HTTP 202).
+    """
+    job_id: uuid.UUID
+    status: JobStatus
+    status_url: str = Field(description="Poll this endpoint for progress")
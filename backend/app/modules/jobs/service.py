@@ -0,0 +1,46 @@
+import uuid
+from datetime import datetime
+
+from fastapi import HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.modules.jobs.models import Job
+from app.modules.jobs.repository import JobsRepository
+
+class JobsService:
+    def __init__(self, repo: JobsRepository | None = None) -> None:
+        self.repo = repo or JobsRepository()
+
+    async def enqueue_job(
+        self,
+        db: AsyncSession,
+        *,
+        kind: str,
+        payload: dict,
+        owner_id: uuid.UUID | None = None,
+        max_attempts: int | None = None,
+        run_at: datetime | None = None,
+        dedupe_key: str | None = None,
+    ) -> Job:
+        return await self.repo.enqueue(
+            db,
+            kind=kind,
+            payload=payload,
+            owner_id=owner_id,
+            max_attempts=max_attempts or get_settings().job_max_attempts,
+            run_at=run_at,
+            dedupe_key=dedupe_key,
+        )
+
+    async def get_job(
+        self,
+        db: AsyncSession,
+        *,
+        owner_id: uuid.UUID,
+        job_id: uuid.UUID,
+    ) -> Job:
+        job = await self.repo.get_by_id(db, job_id=job_id, owner_id=owner_id)
+        if not job:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
+        return job
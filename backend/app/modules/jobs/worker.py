@@ -0,0 +1,280 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import importlib
+import os
+import random
+import signal
+import socket
+import uuid
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Any
+
+from loguru import logger
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import get_settings
+from app.core.database import async_session_maker
+from app.core.logging import configure_logging
+from app.core.notifications import PgListener
+from app.modules.jobs.models import Job
+from app.modules.jobs.registry import PermanentJobError, get_handler, registered_kinds
+from app.modules.jobs.repository import JOBS_CHANNEL, JobsRepository
+
+# --- Modules whose import registers @job_handler functions ---
+HANDLER_MODULES: tuple[str, ...] = (
+    "app.modules.conversations.tasks",
+    "app.modules.podcasts.tasks",
+    "app.modules.quizzes.tasks",
+)
+
+
+def compute_backoff(attempt: int, *, base: float, cap: float, jitter: bool = True) -> float:
+    """
+        Exponential backoff for the n-th failed attempt (1-based), capped.
+        Jitter spreads retries of jobs that failed together (e.g. an LLM outage).
+    """
+    delay = min(cap, base * (2 ** max(0, attempt - 1)))
+    if jitter:
+        delay *= random.uniform(0.5, 1.0)
+    return delay
+
+
+@dataclass
+class JobContext:
+    """
+        Handed to every job handler: job identity plus progress reporting.
+    """
+    job_id: uuid.UUID
+    kind: str
+    attempt: int
+    max_attempts: int
+    owner_id: uuid.UUID | None
+    _worker: JobWorker = field(repr=False)
+
+    @property
+    def is_last_attempt(self) -> bool:
+        return self.attempt >= self.max_attempts
+
+    async def report_progress(self, progress: float, message: str | None = None) -> None:
+        await self._worker.heartbeat(self.job_id, progress=progress, message=message)
+
+
+class JobWorker:
+    """
+        Async worker: claims jobs with SKIP LOCKED, runs up to `concurrency` at once,
+        wakes on LISTEN/NOTIFY and falls back to polling every `poll_interval` seconds.
+    """
+
+    def __init__(
+        self,
+        *,
+        session_maker: async_sessionmaker[AsyncSession] | None = None,
+        repo: JobsRepository | None = None,
+        concurrency: int | None = None,
+        poll_interval: float | None = None,
+        visibility_timeout: float | None = None,
+        kinds: list[str] | None = None,
+        worker_id: str | None = None,
+        listener: PgListener | None = None,
+        use_listen: bool = True,
+    ) -> None:
+        settings = get_settings()
+        self.session_maker = session_maker or async_session_maker
+        self.repo = repo or JobsRepository()
+        self.concurrency = concurrency or settings.job_worker_concurrency
+        self.poll_interval = poll_interval or settings.job_poll_interval_seconds
+        self.visibility_timeout = timedelta(
+            seconds=visibility_timeout or settings.job_visibility_timeout_seconds
+        )
+        # --- No kinds (None or []) means every registered kind: an empty filter would idle forever ---
+        self.kinds = kinds or registered_kinds()
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self.listener = listener
+        self.use_listen = use_listen
+
+        self._backoff_base = settings.job_retry_backoff_base_seconds
+        self._backoff_cap = settings.job_retry_backoff_max_seconds
+        self._tasks: set[asyncio.Task[None]] = set()
+        self._wakeup = asyncio.Event()
+
+    # --- Main loop ---
+    async def run(self, stop_event: asyncio.Event | None = None) -> None:
+        stop = stop_event or asyncio.Event()
+        await self._start_listener()
+        logger.info(
+            "Job worker {} started (concurrency={}, kinds={})",
+            self.worker_id,
+            self.concurrency,
+            self.kinds,
+        )
+        try:
+            while not stop.is_set():
+                # --- Clear before claiming so a NOTIFY arriving mid-claim is not lost ---
+                self._wakeup.clear()
+                try:
+                    claimed = await self.run_once()
+                except Exception:
+                    logger.exception("Job claim failed")
+                    claimed = 0
+                if claimed and len(self._tasks) < self.concurrency:
+                    continue
+                await self._sleep(stop)
+        finally:
+            await self._stop_listener()
+            if self._tasks:
+                await asyncio.gather(*self._tasks, return_exceptions=True)
+            logger.info("Job worker {} stopped", self.worker_id)
+
+    async def run_once(self) -> int:
+        """
+            Claim as many jobs as there are free slots and start them.
+            Returns the number of jobs claimed.
+        """
+        free = self.concurrency - len(self._tasks)
+        if free <= 0 or not self.kinds:
+            return 0
+        async with self.session_maker() as db:
+            await self.repo.fail_exhausted(db)
+            jobs = await self.repo.claim(
+                db,
+                worker_id=self.worker_id,
+                limit=free,
+                visibility_timeout=self.visibility_timeout,
+                kinds=self.kinds,
+            )
+        for job in jobs:
+            task = asyncio.create_task(self._execute(job))
+            self._tasks.add(task)
+            task.add_done_callback(self._on_task_done)
+        return len(jobs)
+
+    async def heartbeat(
+        self,
+        job_id: uuid.UUID,
+        *,
+        progress: float | None = None,
+        message: str | None = None,
+    ) -> bool:
+        async with self.session_maker() as db:
+            return await self.repo.heartbeat(
+                db,
+                job_id=job_id,
+                worker_id=self.worker_id,
+                visibility_timeout=self.visibility_timeout,
+                progress=progress,
+                progress_message=message,
+            )
+
+    # --- Execution ---
+    async def _execute(self, job: Job) -> None:
+        handler = get_handler(job.kind)
+        if handler is None:
+            await self._fail(job, f"No handler registered for kind '{job.kind}'", retry=False)
+            return
+
+        ctx = JobContext(
+            job_id=job.id,
+            kind=job.kind,
+            attempt=job.attempts,
+            max_attempts=job.max_attempts,
+            owner_id=job.owner_id,
+            _worker=self,
+        )
+        heartbeat = asyncio.create_task(self._heartbeat_loop(job.id))
+        try:
+            result: dict[str, Any] | None = await handler(ctx, dict(job.payload or {}))
+        except PermanentJobError as exc:
+            logger.warning("Job {} ({}) failed permanently: {}", job.id, job.kind, exc)
+            await self._fail(job, str(exc), retry=False)
+        except Exception as exc:
+            logger.exception("Job {} ({}) attempt {} failed", job.id, job.kind, job.attempts)
+            await self._fail(job, f"{type(exc).__name__}: {exc}", retry=True)
+        else:
+            async with self.session_maker() as db:
+                done = await self.repo.complete(db, job_id=job.id, worker_id=self.worker_id, result=result)
+            if not done:
+                logger.warning("Job {} lost its lease before completing", job.id)
+        finally:
+            heartbeat.cancel()
+
+    async def _fail(self, job: Job, error: str, *, retry: bool) -> None:
+        delay = None
+        if retry:
+            delay = timedelta(
+                seconds=compute_backoff(job.attempts, base=self._backoff_base, cap=self._backoff_cap)
+            )
+        async with self.session_maker() as db:
+            await self.repo.fail(db, job=job, worker_id=self.worker_id, error=error[:2000], retry_delay=delay)
+
+    async def _heartbeat_loop(self, job_id: uuid.UUID) -> None:
+        interval = max(1.0, self.visibility_timeout.total_seconds() / 3)
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                if not await self.heartbeat(job_id):
+                    return
+            except Exception:
+                logger.exception("Heartbeat failed for job {}", job_id)
+
+    def _on_task_done(self, task: asyncio.Task[None]) -> None:
+        self._tasks.discard(task)
+        # --- A slot freed up: claim immediately instead of waiting for the next poll ---
+        self._wakeup.set()
+
+    # --- Wakeup plumbing ---
+    async def _sleep(self, stop: asyncio.Event) -> None:
+        waiters = [asyncio.create_task(stop.wait()), asyncio.create_task(self._wakeup.wait())]
+        try:
+            await asyncio.wait(waiters, timeout=self.poll_interval, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for waiter in waiters:
+                waiter.cancel()
+
+    def _on_notify(self, _channel: str, payload: str) -> None:
+        if not payload or payload in self.kinds:
+            self._wakeup.set()
+
+    async def _start_listener(self) -> None:
+        if not self.use_listen:
+            return
+        try:
+            self.listener = self.listener or PgListener()
+            await self.listener.subscribe(JOBS_CHANNEL, self._on_notify)
+            await self.listener.start()
+        except Exception as exc:
+            logger.warning("LISTEN unavailable ({}); falling back to polling", exc)
+            self.listener = None
+
+    async def _stop_listener(self) -> None:
+        if self.listener is not None:
+            await self.listener.unsubscribe(JOBS_CHANNEL, self._on_notify)
+            await self.listener.stop()
+
+
+# --- CLI entry point: python -m app.modules.jobs.worker ---
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run the background job worker")
+    parser.add_argument("--concurrency", type=int, default=None)
+    parser.add_argument("--kinds", nargs="+", default=None, help="Only process these job kinds")
+    args = parser.parse_args()
+
+    configure_logging(get_settings())
+    for module in HANDLER_MODULES:
+        importlib.import_module(module)
+
+    async def _run() -> None:
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, stop.set)
+        worker = JobWorker(concurrency=args.concurrency, kinds=args.kinds)
+        await worker.run(stop)
+
+    asyncio.run(_run())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+import enum
+import uuid
+from datetime import datetime
+
+from sqlalchemy import DateTime, Enum, ForeignKey, Integer, String, Text, UniqueConstraint, func
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from app.core.database import Base
+
+class PodcastStatus(str, enum.Enum):
+    pending = "pending"
+    generating = "generating"
+    ready = "ready"
+    failed = "failed"
+
+class SegmentStatus(str, enum.Enum):
+    pending = "pending"
+    ready = "ready"
+
+class Podcast(Base):
+    __tablename__ = "podcasts"
+
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    owner_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), index=True)
+
+    title: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    script: Mapped[str] = mapped_column(Text, nullable=False)
+    status: Mapped[PodcastStatus] = mapped_column(
+        Enum(PodcastStatus, name="podcast_status"),
+        nullable=False,
+        default=PodcastStatus.pending,
+    )
+    segment_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+        onupdate=func.now(),
+    )
+    # --- When segment 0 became playable: time-to-first-audio = first_audio_at - created_at ---
+    first_audio_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    completed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    segments: Mapped[list["PodcastSegment"]] = relationship(
+        back_populates="podcast",
+        order_by="PodcastSegment.position",
+        cascade="all, delete-orphan",
+        lazy="raise",
+    )
+
+class PodcastSegment(Base):
+    __tablename__ = "podcast_segments"
+    __table_args__ = (
+        UniqueConstraint("podcast_id", "position", name="uq_podcast_segments_podcast_position"),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    podcast_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("podcasts.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    position: Mapped[int] = mapped_column(Integer, nullable=False)
+    text: Mapped[str] = mapped_column(Text, nullable=False)
+    status: Mapped[SegmentStatus] = mapped_column(
+        Enum(SegmentStatus, name="podcast_segment_status"),
+        nullable=False,
+        default=SegmentStatus.pending,
+    )
+    object_key: Mapped[str | None] = mapped_column(String(512), nullable=True)
+    content_type: Mapped[str | None] = mapped_column(String(100), nullable=True)
+    duration_ms: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    byte_size: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    ready_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    podcast: Mapped[Podcast] = relationship(back_populates="segments")
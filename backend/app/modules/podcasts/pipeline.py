@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import asyncio
+import re
+import time
+from collections.abc import Awaitable, Callable, Sequence
+from dataclasses import dataclass, field
+
+from app.core.config import get_settings
+from app.modules.podcasts.tts import SynthesizedAudio, TextToSpeech
+from app.services.storage import ObjectStorage
+
+SegmentReadyCallback = Callable[[int, str, SynthesizedAudio], Awaitable[None]]
+
+_SENTENCE_RE = re.compile(r"(?<=[.!?…])\s+")
+
+
+def _pack(units: list[str], limit: int) -> tuple[str, list[str]]:
+    """
+        Greedily take units until `limit` chars; returns (segment, remaining units).
+        A single unit longer than the limit becomes its own segment.
+    """
+    taken: list[str] = []
+    size = 0
+    while units:
+        unit = units[0]
+        extra = len(unit) + (1 if taken else 0)
+        if taken and size + extra > limit:
+            break
+        taken.append(units.pop(0))
+        size += extra
+    return " ".join(taken), units
+
+
+def split_script(
+    script: str,
+    *,
+    max_chars: int | None = None,
+    first_max_chars: int | None = None,
+) -> list[str]:
+    """
+        Split a script into TTS segments on paragraph / speaker-turn and sentence boundaries.
+
+        The first segment is kept short so it synthesizes fast: it bounds time-to-first-audio.
+    """
+    settings = get_settings()
+    max_chars = max_chars or settings.podcast_segment_max_chars
+    first_max_chars = min(first_max_chars or settings.podcast_first_segment_max_chars, max_chars)
+
+    segments: list[str] = []
+    for block in (b.strip() for b in script.splitlines()):
+        if not block:
+            continue
+        units = [s for s in _SENTENCE_RE.split(block) if s]
+        while units:
+            segment, units = _pack(units, first_max_chars if not segments else max_chars)
+            segments.append(segment)
+    return segments
+
+
+@dataclass
+class PipelineStats:
+    segments: int = 0
+    time_to_first_audio: float | None = None
+    total_seconds: float = 0.0
+    ready_order: list[int] = field(default_factory=list)
+
+
+def segment_key(prefix: str, position: int, content_type: str) -> str:
+    ext = "wav" if content_type == "audio/wav" else "bin"
+    return f"{prefix.rstrip('/')}/{position:05d}.{ext}"
+
+
+async def synthesize_segments(
+    segments: Sequence[tuple[int, str]],
+    *,
+    tts: TextToSpeech,
+    storage: ObjectStorage,
+    key_prefix: str,
+    concurrency: int | None = None,
+    on_segment_ready: SegmentReadyCallback | None = None,
+) -> PipelineStats:
+    """
+        Synthesize (position, text) segments concurrently and upload each as soon as it is done.
+
+        Tasks are started in position order and the semaphore is FIFO, so segment 0
+        is always among the first in flight. Time-to-first-audio is measured when
+        segment 0 (the first one a player needs) is uploaded.
+    """
+    semaphore = asyncio.Semaphore(concurrency or get_settings().podcast_tts_concurrency)
+    stats = PipelineStats(segments=len(segments))
+    first_position = min((p for p, _ in segments), default=None)
+    started = time.perf_counter()
+
+    async def _one(position: int, text: str) -> None:
+        async with semaphore:
+            audio = await tts.synthesize(text)
+        key = segment_key(key_prefix, position, audio.content_type)
+        await storage.put_bytes(key, audio.data, content_type=audio.content_type)
+        if position == first_position:
+            stats.time_to_first_audio = time.perf_counter() - started
+        stats.ready_order.append(position)
+        if on_segment_ready is not None:
+            await on_segment_ready(position, key, audio)
+
+    tasks = [asyncio.create_task(_one(position, text)) for position, text in segments]
+    try:
+        await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
+    stats.total_seconds = time.perf_counter() - started
+    return stats
@@ -0,0 +1,135 @@
+# --- Standard Library Imports ---
+import uuid
+from collections.abc import Sequence
+
+# --- Third-Party Imports ---
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+# --- Local Imports ---
+from app.modules.podcasts.models import Podcast, PodcastSegment, PodcastStatus, SegmentStatus
+
+
+# --- Podcasts Repository Class ---
+class PodcastsRepository:
+    """
+        Repository for podcasts and their audio segments.
+    """
+
+    # --- CREATE Operation ---
+    async def create(
+        self,
+        db: AsyncSession,
+        *,
+        owner_id: uuid.UUID,
+        title: str | None,
+        script: str,
+        segments: Sequence[str],
+    ) -> Podcast:
+        podcast = Podcast(
+            owner_id=owner_id,
+            title=title,
+            script=script,
+            status=PodcastStatus.pending,
+            segment_count=len(segments),
+        )
+        db.add(podcast)
+        await db.flush()
+        db.add_all(
+            PodcastSegment(podcast_id=podcast.id, position=i, text=text, status=SegmentStatus.pending)
+            for i, text in enumerate(segments)
+        )
+        await db.commit()
+        await db.refresh(podcast)
+        return podcast
+
+    # --- READ Operations ---
+    async def get_by_id(
+        self,
+        db: AsyncSession,
+        *,
+        podcast_id: uuid.UUID,
+        owner_id: uuid.UUID | None = None,
+        with_segments: bool = False,
+    ) -> Podcast | None:
+        stmt = select(Podcast).where(Podcast.id == podcast_id)
+        if owner_id is not None:
+            stmt = stmt.where(Podcast.owner_id == owner_id)
+        if with_segments:
+            stmt = stmt.options(selectinload(Podcast.segments))
+        res = await db.execute(stmt)
+        return res.scalar_one_or_none()
+
+    async def list_ready_segments(
+        self,
+        db: AsyncSession,
+        *,
+        podcast_id: uuid.UUID,
+    ) -> list[PodcastSegment]:
+        stmt = (
+            select(PodcastSegment)
+            .where(PodcastSegment.podcast_id == podcast_id, PodcastSegment.status == SegmentStatus.ready)
+            .order_by(PodcastSegment.position)
+        )
+        return list((await db.execute(stmt)).scalars().all())
+
+    async def get_segment(
+        self,
+        db: AsyncSession,
+        *,
+        podcast_id: uuid.UUID,
+        position: int,
+    ) -> PodcastSegment | None:
+        stmt = select(PodcastSegment).where(
+            PodcastSegment.podcast_id == podcast_id,
+            PodcastSegment.position == position,
+        )
+        res = await db.execute(stmt)
+        return res.scalar_one_or_none()
+
+    # --- UPDATE Operations ---
+    async def mark_segment_ready(
+        self,
+        db: AsyncSession,
+        *,
+        podcast_id: uuid.UUID,
+        position: int,
+        object_key: str,
+        content_type: str,
+        duration_ms: int,
+        byte_size: int,
+    ) -> None:
+        await db.execute(
+            update(PodcastSegment)
+            .where(PodcastSegment.podcast_id == podcast_id, PodcastSegment.position == position)
+            .values(
+                status=SegmentStatus.ready,
+                object_key=object_key,
+                content_type=content_type,
+                duration_ms=duration_ms,
+                byte_size=byte_size,
+                ready_at=func.now(),
+            )
+        )
+        if position == 0:
+            await db.execute(
+                update(Podcast)
+                .where(Podcast.id == podcast_id, Podcast.first_audio_at.is_(None))
+                .values(first_audio_at=func.now())
+            )
+        await db.commit()
+
+    async def set_status(
+        self,
+        db: AsyncSession,
+        *,
+        podcast_id: uuid.UUID,
+        status: PodcastStatus,
+        error: str | None = None,
+    ) -> None:
+        values: dict[str, object] = {"status": status, "error": error, "updated_at": func.now()}
+        if status == PodcastStatus.ready:
+            values["completed_at"] = func.now()
+        await db.execute(update(Podcast).where(Podcast.id == podcast_id).values(**values))
+        await db.commit()
@@ -0,0 +1,89 @@
+import uuid
+
+from fastapi import APIRouter, Depends, Request, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.v1.deps import get_db, get_current_user, CurrentUser
+from app.modules.podcasts.schemas import (
+    PlaylistOut,
+    PlaylistSegment,
+    PodcastAccepted,
+    PodcastCreate,
+    PodcastOut,
+)
+from app.modules.podcasts.service import PodcastsService
+from app.services.storage import get_storage
+
+router = APIRouter(prefix="/podcasts", tags=["podcasts"])
+service = PodcastsService()
+
+
+@router.post("", status_code=status.HTTP_202_ACCEPTED, response_model=PodcastAccepted)
+async def create_podcast(
+    payload: PodcastCreate,
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    user: CurrentUser = Depends(get_current_user),
+) -> PodcastAccepted:
+    podcast, job = await service.create_podcast(db, owner_id=user.id, payload=payload)
+    return PodcastAccepted(
+        podcast=PodcastOut.model_validate(podcast),
+        job_id=job.id,
+        status_url=str(request.url_for("get_job", job_id=job.id)),
+        playlist_url=str(request.url_for("get_podcast_playlist", podcast_id=podcast.id)),
+    )
+
+
+@router.get("/{podcast_id}", response_model=PodcastOut)
+async def get_podcast(
+    podcast_id: uuid.UUID,
+    db: AsyncSession = Depends(get_db),
+    user: CurrentUser = Depends(get_current_user),
+) -> PodcastOut:
+    podcast = await service.get_podcast(db, owner_id=user.id, podcast_id=podcast_id)
+    return PodcastOut.model_validate(podcast)
+
+
+@router.get("/{podcast_id}/playlist", response_model=PlaylistOut)
+async def get_podcast_playlist(
+    podcast_id: uuid.UUID,
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    user: CurrentUser = Depends(get_current_user),
+) -> PlaylistOut:
+    podcast, segments = await service.get_playlist(db, owner_id=user.id, podcast_id=podcast_id)
+    return PlaylistOut(
+        podcast_id=podcast.id,
+        status=podcast.status,
+        segment_count=podcast.segment_count,
+        segments=[
+            PlaylistSegment(
+                position=s.position,
+                url=str(request.url_for("stream_podcast_segment", podcast_id=podcast.id, position=s.position)),
+                content_type=s.content_type,
+                duration_ms=s.duration_ms,
+            )
+            for s in segments
+        ],
+        complete=len(segments) == podcast.segment_count,
+    )
+
+
+@router.get("/{podcast_id}/segments/{position}")
+async def stream_podcast_segment(
+    podcast_id: uuid.UUID,
+    position: int,
+    db: AsyncSession = Depends(get_db),
+    user: CurrentUser = Depends(get_current_user),
+) -> StreamingResponse:
+    segment = await service.get_ready_segment(db, owner_id=user.id, podcast_id=podcast_id, position=position)
+    body = await service.open_segment_audio(segment, get_storage())
+    headers = {"Cache-Control": "private, max-age=31536000, immutable"}
+    if segment.byte_size is not None:
+        headers["Content-Length"] = str(segment.byte_size)
+    return StreamingResponse(
+        body,
+        media_type=segment.content_type or "application/octet-stream",
+        headers=headers,
+    )
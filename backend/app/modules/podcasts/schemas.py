@@ -0,0 +1,54 @@
+from datetime import datetime
+import uuid
+
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+
+from app.modules.podcasts.models import PodcastStatus
+
+class PodcastCreate(BaseModel):
+    title: str | None = Field(default=None, max_length=255)
+    script: str = Field(min_length=1, max_length=100_000)
+
+    @field_validator("title")
+    @classmethod
+    def normalize_title(cls, v: str | None) -> str | None:
+        if v is None:
+            return None
+        v = v.strip()
+        return v or None
+
+    model_config = ConfigDict(extra="ignore")
+
+class PodcastOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: uuid.UUID
+    owner_id: uuid.UUID
+    title: str | None
+    status: PodcastStatus
+    segment_count: int
+    error: str | None
+    created_at: datetime
+    updated_at: datetime
+    first_audio_at: datetime | None
+    completed_at: datetime | None
+
+class PodcastAccepted(BaseModel):
+    podcast: PodcastOut
+    job_id: uuid.UUID
+    status_url: str
+    playlist_url: str
+
+class PlaylistSegment(BaseModel):
+    position: int
+    url: str
+    content_type: str | None
+    duration_ms: int | None
+
+class PlaylistOut(BaseModel):
+    podcast_id: uuid.UUID
+    status: PodcastStatus
+    segment_count: int
+    # --- Only the contiguous ready prefix is listed so players never skip a gap ---
+    segments: list[PlaylistSegment]
+    complete: bool
@@ -0,0 +1,168 @@
+import asyncio
+import uuid
+from collections.abc import AsyncIterator, Awaitable, Callable
+
+from fastapi import HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.modules.jobs.models import Job
+from app.modules.jobs.service import JobsService
+from app.modules.podcasts.models import Podcast, PodcastSegment, PodcastStatus, SegmentStatus
+from app.modules.podcasts.pipeline import PipelineStats, split_script, synthesize_segments
+from app.modules.podcasts.repository import PodcastsRepository
+from app.modules.podcasts.schemas import PodcastCreate
+from app.modules.podcasts.tts import SynthesizedAudio, TextToSpeech
+from app.services.storage import ObjectNotFoundError, ObjectStorage
+
+SYNTHESIZE_JOB_KIND = "podcasts.synthesize"
+
+class PodcastsService:
+    def __init__(
+        self,
+        repo: PodcastsRepository | None = None,
+        jobs: JobsService | None = None,
+    ) -> None:
+        self.repo = repo or PodcastsRepository()
+        self.jobs = jobs or JobsService()
+
+    async def create_podcast(
+        self,
+        db: AsyncSession,
+        *,
+        owner_id: uuid.UUID,
+        payload: PodcastCreate,
+    ) -> tuple[Podcast, Job]:
+        segments = split_script(payload.script)
+        if not segments:
+            raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Script is empty")
+        podcast = await self.repo.create(
+            db,
+            owner_id=owner_id,
+            title=payload.title,
+            script=payload.script,
+            segments=segments,
+        )
+        job = await self.jobs.enqueue_job(
+            db,
+            kind=SYNTHESIZE_JOB_KIND,
+            owner_id=owner_id,
+            payload={"podcast_id": str(podcast.id)},
+        )
+        return podcast, job
+
+    async def get_podcast(
+        self,
+        db: AsyncSession,
+        *,
+        owner_id: uuid.UUID,
+        podcast_id: uuid.UUID,
+    ) -> Podcast:
+        podcast = await self.repo.get_by_id(db, podcast_id=podcast_id, owner_id=owner_id)
+        if not podcast:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Podcast not found")
+        return podcast
+
+    async def get_playlist(
+        self,
+        db: AsyncSession,
+        *,
+        owner_id: uuid.UUID,
+        podcast_id: uuid.UUID,
+    ) -> tuple[Podcast, list[PodcastSegment]]:
+        """
+            Returns the podcast and its contiguous run of ready segments from position 0.
+        """
+        podcast = await self.get_podcast(db, owner_id=owner_id, podcast_id=podcast_id)
+        playable: list[PodcastSegment] = []
+        for segment in await self.repo.list_ready_segments(db, podcast_id=podcast_id):
+            if segment.position != len(playable):
+                break
+            playable.append(segment)
+        return podcast, playable
+
+    async def get_ready_segment(
+        self,
+        db: AsyncSession,
+        *,
+        owner_id: uuid.UUID,
+        podcast_id: uuid.UUID,
+        position: int,
+    ) -> PodcastSegment:
+        await self.get_podcast(db, owner_id=owner_id, podcast_id=podcast_id)
+        segment = await self.repo.get_segment(db, podcast_id=podcast_id, position=position)
+        if not segment:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Segment not found")
+        if segment.status != SegmentStatus.ready or not segment.object_key:
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Segment is not ready yet")
+        return segment
+
+    async def open_segment_audio(self, segment: PodcastSegment, storage: ObjectStorage) -> AsyncIterator[bytes]:
+        """
+            Start reading the segment's object before any response header goes out: a
+            missing object is a 404 here, not a 200 whose body stops short of Content-Length.
+        """
+        chunks = storage.iter_chunks(segment.object_key)
+        try:
+            first = await anext(chunks, b"")
+        except ObjectNotFoundError:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Segment audio not found") from None
+        return _prepend(first, chunks)
+
+    async def synthesize(
+        self,
+        db: AsyncSession,
+        *,
+        podcast_id: uuid.UUID,
+        tts: TextToSpeech,
+        storage: ObjectStorage,
+        on_progress: Callable[[int, int], Awaitable[None]] | None = None,
+    ) -> PipelineStats:
+        """
+            Synthesize every pending segment; already-ready segments are kept (safe to retry).
+        """
+        podcast = await self.repo.get_by_id(db, podcast_id=podcast_id, with_segments=True)
+        if podcast is None:
+            raise LookupError(f"Podcast {podcast_id} not found")
+        pending = [(s.position, s.text) for s in podcast.segments if s.status == SegmentStatus.pending]
+        total = len(podcast.segments)
+        done = total - len(pending)
+        await self.repo.set_status(db, podcast_id=podcast_id, status=PodcastStatus.generating)
+
+        # --- Callbacks fire concurrently; one AsyncSession must not be used concurrently ---
+        db_lock = asyncio.Lock()
+
+        async def _ready(position: int, key: str, audio: SynthesizedAudio) -> None:
+            nonlocal done
+            async with db_lock:
+                await self.repo.mark_segment_ready(
+                    db,
+                    podcast_id=podcast_id,
+                    position=position,
+                    object_key=key,
+                    content_type=audio.content_type,
+                    duration_ms=audio.duration_ms,
+                    byte_size=len(audio.data),
+                )
+            done += 1
+            if on_progress is not None:
+                await on_progress(done, total)
+
+        stats = await synthesize_segments(
+            pending,
+            tts=tts,
+            storage=storage,
+            key_prefix=f"podcasts/{podcast_id}",
+            on_segment_ready=_ready,
+        )
+        await self.repo.set_status(db, podcast_id=podcast_id, status=PodcastStatus.ready)
+        return stats
+
+    async def mark_failed(self, db: AsyncSession, *, podcast_id: uuid.UUID, error: str) -> None:
+        await self.repo.set_status(db, podcast_id=podcast_id, status=PodcastStatus.failed, error=error)
+
+
+async def _prepend(first: bytes, rest: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    if first:
+        yield first
+    async for chunk in rest:
+        yield chunk
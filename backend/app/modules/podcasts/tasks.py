@@ -0,0 +1,41 @@
+import uuid
+
+from app.core.database import async_session_maker
+from app.modules.jobs.registry import PermanentJobError, job_handler
+from app.modules.jobs.worker import JobContext
+from app.modules.podcasts.service import SYNTHESIZE_JOB_KIND, PodcastsService
+from app.modules.podcasts.tts import GeminiTTS
+from app.services.storage import get_storage
+
+service = PodcastsService()
+
+
+@job_handler(SYNTHESIZE_JOB_KIND)
+async def synthesize_podcast(ctx: JobContext, payload: dict) -> dict:
+    podcast_id = uuid.UUID(payload["podcast_id"])
+
+    async def _progress(done: int, total: int) -> None:
+        await ctx.report_progress(done / max(total, 1), f"{done}/{total} segments")
+
+    async with async_session_maker() as db:
+        try:
+            stats = await service.synthesize(
+                db,
+                podcast_id=podcast_id,
+                tts=GeminiTTS(),
+                storage=get_storage(),
+                on_progress=_progress,
+            )
+        except LookupError as exc:
+            raise PermanentJobError(str(exc)) from exc
+        except Exception as exc:
+            if ctx.is_last_attempt:
+                await db.rollback()
+                await service.mark_failed(db, podcast_id=podcast_id, error=f"{type(exc).__name__}: {exc}")
+            raise
+    return {
+        "podcast_id": str(podcast_id),
+        "segments": stats.segments,
+        "time_to_first_audio": stats.time_to_first_audio,
+        "total_seconds": stats.total_seconds,
+    }
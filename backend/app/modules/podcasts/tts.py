@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import asyncio
+import io
+import wave
+from dataclasses import dataclass
+from typing import Protocol
+
+from app.core.config import get_settings
+from app.services.artifacts import ArtifactRegistry, get_artifact_registry
+
+# --- Gemini TTS returns 24 kHz / 16-bit / mono PCM; the fake matches it ---
+SAMPLE_RATE = 24_000
+SAMPLE_WIDTH = 2
+CHANNELS = 1
+
+
+@dataclass(frozen=True)
+class SynthesizedAudio:
+    data: bytes
+    content_type: str
+    duration_ms: int
+
+
+def pcm_to_wav(pcm: bytes, *, sample_rate: int = SAMPLE_RATE) -> bytes:
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as wav:
+        wav.setnchannels(CHANNELS)
+        wav.setsampwidth(SAMPLE_WIDTH)
+        wav.setframerate(sample_rate)
+        wav.writeframes(pcm)
+    return buf.getvalue()
+
+
+def pcm_duration_ms(pcm: bytes, *, sample_rate: int = SAMPLE_RATE) -> int:
+    return int(len(pcm) / (SAMPLE_WIDTH * CHANNELS) / sample_rate * 1000)
+
+
+class TextToSpeech(Protocol):
+    async def synthesize(self, text: str) -> SynthesizedAudio: ...
+
+
+class FakeTTS:
+    """
+        Local stand-in for tests and benchmarks: silent WAV whose length tracks the text,
+        with a latency model of `base_latency + per_char_latency * len(text)`.
+    """
+
+    def __init__(
+        self,
+        *,
+        base_latency: float = 0.0,
+        per_char_latency: float = 0.0,
+        ms_per_char: int = 60,
+    ) -> None:
+        self.base_latency = base_latency
+        self.per_char_latency = per_char_latency
+        self.ms_per_char = ms_per_char
+        self.calls = 0
+
+    async def synthesize(self, text: str) -> SynthesizedAudio:
+        self.calls += 1
+        delay = self.base_latency + self.per_char_latency * len(text)
+        if delay:
+            await asyncio.sleep(delay)
+        duration_ms = len(text) * self.ms_per_char
+        frames = SAMPLE_RATE * duration_ms // 1000
+        pcm = bytes(frames * SAMPLE_WIDTH * CHANNELS)
+        return SynthesizedAudio(data=pcm_to_wav(pcm), content_type="audio/wav", duration_ms=duration_ms)
+
+
+# --- Built-in prompt: the segment as is. A template published under TTS_PROMPT_NAME can add
+# --- delivery directions ("Read warmly, at a relaxed pace: {text}") ---
+TTS_PROMPT_NAME = "podcasts.tts"
+TTS_PROMPT = "{text}"
+
+
+class GeminiTTS:
+    def __init__(
+        self,
+        *,
+        model: str | None = None,
+        voice: str | None = None,
+        api_key: str | None = None,
+        registry: ArtifactRegistry | None = None,
+    ) -> None:
+        from google import genai
+
+        settings = get_settings()
+        self.model = model or settings.podcast_tts_model
+        self.voice = voice or settings.podcast_tts_voice
+        self._client = genai.Client(api_key=api_key or settings.gemini_api_key)
+        self.registry = registry or get_artifact_registry()
+
+    async def synthesize(self, text: str) -> SynthesizedAudio:
+        from google.genai import types
+
+        template = await self.registry.get_prompt_or(TTS_PROMPT_NAME, TTS_PROMPT)
+        response = await self._client.aio.models.generate_content(
+            model=self.model,
+            contents=template.format(text=text),
+            config=types.GenerateContentConfig(
+                response_modalities=["AUDIO"],
+                speech_config=types.SpeechConfig(
+                    voice_config=types.VoiceConfig(
+                        prebuilt_voice_config=types.PrebuiltVoiceConfig(voice_name=self.voice),
+                    ),
+                ),
+            ),
+        )
+        pcm = response.candidates[0].content.parts[0].inline_data.data
+        return SynthesizedAudio(data=pcm_to_wav(pcm), content_type="audio/wav", duration_ms=pcm_duration_ms(pcm))
@@ -0,0 +1,55 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import DateTime, ForeignKey, Integer, String, Text, func
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from app.core.database import Base
+
+class Project(Base):
+    __tablename__ = "projects"
+
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    owner_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), index=True)
+
+    name: Mapped[str] = mapped_column(String(255), nullable=False)
+    description: Mapped[str | None] = mapped_column(Text, nullable=True)
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+        onupdate=func.now(),
+    )
+
+    stats: Mapped["ProjectStats"] = relationship(
+        back_populates="project",
+        cascade="all, delete-orphan",
+        uselist=False,
+        lazy="raise",
+    )
+
+class ProjectStats(Base):
+    """
+        Per-project aggregates maintained on every child write (see ProjectsService.record_membership_change),
+        so dashboards never COUNT(*) child tables. `refresh_stats` recomputes them if they drift.
+        Conversations are the only children that belong to a project so far: add a counter
+        here together with the writes that maintain it.
+    """
+    __tablename__ = "project_stats"
+
+    project_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("projects.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    conversations_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    last_activity_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    project: Mapped[Project] = relationship(back_populates="stats")
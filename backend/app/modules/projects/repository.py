@@ -0,0 +1,215 @@
+# --- Standard Library Imports ---
+import uuid
+from collections.abc import Sequence
+
+# --- Third-Party Imports ---
+from sqlalchemy import Select, delete, func, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# --- Local Imports ---
+from app.modules.conversations.models import NOT_DELETED, Conversation
+from app.modules.projects.models import Project, ProjectStats
+
+STAT_COLUMNS = {
+    "conversations": "conversations_count",
+}
+
+
+# --- Projects Repository Class ---
+class ProjectsRepository:
+    """
+        Repository for projects and their precomputed aggregates.
+    """
+
+    # --- CREATE Operation ---
+    async def create(
+        self,
+        db: AsyncSession,
+        *,
+        owner_id: uuid.UUID,
+        name: str,
+        description: str | None,
+    ) -> Project:
+        project = Project(owner_id=owner_id, name=name, description=description)
+        db.add(project)
+        await db.flush()
+        db.add(ProjectStats(project_id=project.id))
+        await db.commit()
+        await db.refresh(project)
+        return project
+
+    # --- READ Operations ---
+    async def get_by_id(
+        self,
+        db: AsyncSession,
+        *,
+        owner_id: uuid.UUID,
+        project_id: uuid.UUID,
+    ) -> Project | None:
+        stmt = select(Project).where(Project.id == project_id, Project.owner_id == owner_id)
+        res = await db.execute(stmt)
+        return res.scalar_one_or_none()
+
+    async def list_with_stats(
+        self,
+        db: AsyncSession,
+        *,
+        owner_id: uuid.UUID,
+        page: int,
+        limit: int,
+    ) -> tuple[list[tuple[Project, ProjectStats | None]], int]:
+        """
+            One page of projects joined to their stats row (2 queries: count + page).
+        """
+        count_stmt = select(func.count()).select_from(Project).where(Project.owner_id == owner_id)
+        total_items = int((await db.execute(count_stmt)).scalar_one())
+
+        activity = func.coalesce(ProjectStats.last_activity_at, Project.updated_at)
+        stmt = (
+            select(Project, ProjectStats)
+            .outerjoin(ProjectStats, ProjectStats.project_id == Project.id)
+            .where(Project.owner_id == owner_id)
+            .order_by(activity.desc(), Project.id)
+            .offset((page - 1) * limit)
+            .limit(limit)
+        )
+        rows = [(row[0], row[1]) for row in (await db.execute(stmt)).all()]
+        return rows, total_items
+
+    @staticmethod
+    def recent_conversations_stmt(project_ids: Sequence[uuid.UUID], per_project: int) -> Select:
+        """
+            Top-N most recent conversations for every project in one query (window function),
+            instead of one query per project.
+        """
+        rank = func.row_number().over(
+            partition_by=Conversation.project_id,
+            order_by=(Conversation.updated_at.desc(), Conversation.id),
+        )
+        ranked = (
+            select(
+                Conversation.project_id,
+                Conversation.id,
+                Conversation.title,
+                Conversation.updated_at,
+                rank.label("rn"),
+            )
+            .where(
+                Conversation.project_id.in_(project_ids),
+                NOT_DELETED,
+            )
+            .subquery()
+        )
+        return (
+            select(ranked.c.project_id, ranked.c.id, ranked.c.title, ranked.c.updated_at)
+            .where(ranked.c.rn <= per_project)
+            .order_by(ranked.c.project_id, ranked.c.rn)
+        )
+
+    async def recent_conversations(
+        self,
+        db: AsyncSession,
+        *,
+        project_ids: Sequence[uuid.UUID],
+        per_project: int,
+    ) -> dict[uuid.UUID, list[dict]]:
+        grouped: dict[uuid.UUID, list[dict]] = {pid: [] for pid in project_ids}
+        if not project_ids or per_project <= 0:
+            return grouped
+        rows = (await db.execute(self.recent_conversations_stmt(project_ids, per_project))).all()
+        for row in rows:
+            grouped[row.project_id].append({"id": row.id, "title": row.title, "updated_at": row.updated_at})
+        return grouped
+
+    # --- UPDATE Operations ---
+    async def update(
+        self,
+        db: AsyncSession,
+        *,
+        project: Project,
+        values: dict[str, object],
+    ) -> Project:
+        for key, value in values.items():
+            setattr(project, key, value)
+        await db.commit()
+        await db.refresh(project)
+        return project
+
+    async def apply_stat_deltas(
+        self,
+        db: AsyncSession,
+        *,
+        kind: str,
+        deltas: dict[uuid.UUID, int],
+    ) -> None:
+        """
+            Adjust counters and bump last_activity_at. Does NOT commit: callers run it in the
+            same transaction as the child write so aggregates and rows move together.
+        """
+        column = STAT_COLUMNS[kind]
+        for project_id, delta in deltas.items():
+            stmt = insert(ProjectStats).values(
+                project_id=project_id,
+                **{column: max(delta, 0)},
+                last_activity_at=func.now(),
+            )
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[ProjectStats.project_id],
+                set_={
+                    column: func.greatest(getattr(ProjectStats, column) + delta, 0),
+                    "last_activity_at": func.now(),
+                },
+            )
+            await db.execute(stmt)
+
+    async def refresh_stats(
+        self,
+        db: AsyncSession,
+        *,
+        project_ids: Sequence[uuid.UUID],
+    ) -> None:
+        """
+            Recompute conversation aggregates from source rows for the given projects
+            (repair path after bulk imports or drift). One statement regardless of count.
+            Does NOT commit: run it in the transaction that changed the rows.
+        """
+        if not project_ids:
+            return
+        counts = (
+            select(
+                Conversation.project_id.label("project_id"),
+                func.count().label("n"),
+                func.max(Conversation.updated_at).label("last"),
+            )
+            .where(
+                Conversation.project_id.in_(project_ids),
+                NOT_DELETED,
+            )
+            .group_by(Conversation.project_id)
+            .subquery()
+        )
+        await db.execute(
+            update(ProjectStats)
+            .where(ProjectStats.project_id.in_(project_ids))
+            .values(
+                conversations_count=func.coalesce(
+                    select(counts.c.n).where(counts.c.project_id == ProjectStats.project_id).scalar_subquery(),
+                    0,
+                ),
+                last_activity_at=func.greatest(
+                    ProjectStats.last_activity_at,
+                    select(counts.c.last).where(counts.c.project_id == ProjectStats.project_id).scalar_subquery(),
+                ),
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+    # --- DELETE Operation ---
+    async def delete(self, db: AsyncSession, *, project: Project) -> None:
+        """
+            Hard delete; conversations keep existing with project_id set to NULL (FK ON DELETE SET NULL).
+        """
+        # --- Core DELETE: the DB cascades project_stats, no need to load the relationship ---
+        await db.execute(delete(Project).where(Project.id == project.id))
+        await db.commit()
@@ -0,0 +1,86 @@
+import math
+import uuid
+
+from fastapi import APIRouter, Depends, Query, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.v1.deps import get_db, get_current_user, CurrentUser
+from app.modules.conversations.schemas import Pagination
+from app.modules.projects.schemas import (
+    ProjectCreate,
+    ProjectDashboardResponse,
+    ProjectOut,
+    ProjectUpdate,
+)
+from app.modules.projects.service import ProjectsService
+
+router = APIRouter(prefix="/projects", tags=["projects"])
+service = ProjectsService()
+
+
+@router.get("/dashboard", response_model=ProjectDashboardResponse)
+async def get_projects_dashboard(
+    page: int = Query(1, ge=1),
+    limit: int = Query(20, ge=1, le=50),
+    recent: int = Query(3, ge=0, le=10),
+    db: AsyncSession = Depends(get_db),
+    user: CurrentUser = Depends(get_current_user),
+) -> ProjectDashboardResponse:
+    items, total_items = await service.get_dashboard(
+        db,
+        owner_id=user.id,
+        page=page,
+        limit=limit,
+        recent=recent,
+    )
+    total_pages = max(1, math.ceil(total_items / limit)) if limit else 1
+    pagination = Pagination(
+        page=page,
+        limit=limit,
+        total_items=total_items,
+        total_pages=total_pages,
+        has_next=page < total_pages,
+        has_previous=page > 1,
+    )
+    return ProjectDashboardResponse(data=items, pagination=pagination)
+
+
+@router.post("", status_code=status.HTTP_201_CREATED, response_model=ProjectOut)
+async def create_project(
+    payload: ProjectCreate,
+    db: AsyncSession = Depends(get_db),
+    user: CurrentUser = Depends(get_current_user),
+) -> ProjectOut:
+    project = await service.create_project(db, owner_id=user.id, payload=payload)
+    return ProjectOut.model_validate(project)
+
+
+@router.get("/{project_id}", response_model=ProjectOut)
+async def get_project(
+    project_id: uuid.UUID,
+    db: AsyncSession = Depends(get_db),
+    user: CurrentUser = Depends(get_current_user),
+) -> ProjectOut:
+    project = await service.get_project(db, owner_id=user.id, project_id=project_id)
+    return ProjectOut.model_validate(project)
+
+
+@router.patch("/{project_id}", response_model=ProjectOut)
+async def update_project(
+    project_id: uuid.UUID,
+    payload: ProjectUpdate,
+    db: AsyncSession = Depends(get_db),
+    user: CurrentUser = Depends(get_current_user),
+) -> ProjectOut:
+    project = await service.update_project(db, owner_id=user.id, project_id=project_id, payload=payload)
+    return ProjectOut.model_validate(project)
+
+
+@router.delete("/{project_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_project(
+    project_id: uuid.UUID,
+    db: AsyncSession = Depends(get_db),
+    user: CurrentUser = Depends(get_current_user),
+) -> Response:
+    await service.delete_project(db, owner_id=user.id, project_id=project_id)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
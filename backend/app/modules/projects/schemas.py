@@ -0,0 +1,66 @@
+from datetime import datetime
+import uuid
+
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+
+from app.modules.conversations.schemas import Pagination
+
+class ProjectCreate(BaseModel):
+    name: str = Field(min_length=1, max_length=255)
+    description: str | None = Field(default=None, max_length=5000)
+
+    @field_validator("name")
+    @classmethod
+    def normalize_name(cls, v: str) -> str:
+        v = v.strip()
+        if not v:
+            raise ValueError("name must not be blank")
+        return v
+
+    model_config = ConfigDict(extra="ignore")
+
+class ProjectUpdate(BaseModel):
+    name: str | None = Field(default=None, min_length=1, max_length=255)
+    description: str | None = Field(default=None, max_length=5000)
+
+    @field_validator("name")
+    @classmethod
+    def normalize_name(cls, v: str | None) -> str | None:
+        if v is None:
+            return None
+        v = v.strip()
+        if not v:
+            raise ValueError("name must not be blank")
+        return v
+
+    model_config = ConfigDict(extra="ignore")
+
+class ProjectOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: uuid.UUID
+    owner_id: uuid.UUID
+    name: str
+    description: str | None
+    created_at: datetime
+    updated_at: datetime
+
+class ProjectStatsOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    conversations_count: int = 0
+    last_activity_at: datetime | None = None
+
+class RecentConversation(BaseModel):
+    id: uuid.UUID
+    title: str | None
+    updated_at: datetime
+
+class ProjectDashboardItem(BaseModel):
+    project: ProjectOut
+    stats: ProjectStatsOut
+    recent_conversations: list[RecentConversation]
+
+class ProjectDashboardResponse(BaseModel):
+    data: list[ProjectDashboardItem]
+    pagination: Pagination
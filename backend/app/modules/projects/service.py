@@ -0,0 +1,138 @@
+import uuid
+
+from fastapi import HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.modules.projects.models import Project
+from app.modules.projects.repository import ProjectsRepository
+from app.modules.projects.schemas import (
+    ProjectCreate,
+    ProjectDashboardItem,
+    ProjectOut,
+    ProjectStatsOut,
+    ProjectUpdate,
+    RecentConversation,
+)
+
+def membership_deltas(
+    before: uuid.UUID | None,
+    after: uuid.UUID | None,
+) -> dict[uuid.UUID, int]:
+    """
+        Counter changes when a child moves from project `before` to `after`
+        (None = not counted: no project, or soft-deleted).
+    """
+    deltas: dict[uuid.UUID, int] = {}
+    if before is not None:
+        deltas[before] = deltas.get(before, 0) - 1
+    if after is not None:
+        deltas[after] = deltas.get(after, 0) + 1
+    return deltas
+
+class ProjectsService:
+    def __init__(self, repo: ProjectsRepository | None = None) -> None:
+        self.repo = repo or ProjectsRepository()
+
+    async def create_project(
+        self,
+        db: AsyncSession,
+        *,
+        owner_id: uuid.UUID,
+        payload: ProjectCreate,
+    ) -> Project:
+        return await self.repo.create(db, owner_id=owner_id, name=payload.name, description=payload.description)
+
+    async def get_project(
+        self,
+        db: AsyncSession,
+        *,
+        owner_id: uuid.UUID,
+        project_id: uuid.UUID,
+    ) -> Project:
+        project = await self.repo.get_by_id(db, owner_id=owner_id, project_id=project_id)
+        if not project:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
+        return project
+
+    async def update_project(
+        self,
+        db: AsyncSession,
+        *,
+        owner_id: uuid.UUID,
+        project_id: uuid.UUID,
+        payload: ProjectUpdate,
+    ) -> Project:
+        project = await self.get_project(db, owner_id=owner_id, project_id=project_id)
+        values = {k: getattr(payload, k) for k in payload.model_fields_set}
+        if values.get("name", "") is None:
+            raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="name cannot be null")
+        return await self.repo.update(db, project=project, values=values)
+
+    async def delete_project(
+        self,
+        db: AsyncSession,
+        *,
+        owner_id: uuid.UUID,
+        project_id: uuid.UUID,
+    ) -> None:
+        project = await self.get_project(db, owner_id=owner_id, project_id=project_id)
+        await self.repo.delete(db, project=project)
+
+    async def get_dashboard(
+        self,
+        db: AsyncSession,
+        *,
+        owner_id: uuid.UUID,
+        page: int,
+        limit: int,
+        recent: int,
+    ) -> tuple[list[ProjectDashboardItem], int]:
+        """
+            Always 3 queries (count, projects+stats page, batched recent children),
+            independent of how many projects are on the page.
+        """
+        rows, total_items = await self.repo.list_with_stats(db, owner_id=owner_id, page=page, limit=limit)
+        recent_by_project = await self.repo.recent_conversations(
+            db,
+            project_ids=[project.id for project, _ in rows],
+            per_project=recent,
+        )
+        items = [
+            ProjectDashboardItem(
+                project=ProjectOut.model_validate(project),
+                stats=ProjectStatsOut.model_validate(stats) if stats is not None else ProjectStatsOut(),
+                recent_conversations=[RecentConversation(**c) for c in recent_by_project[project.id]],
+            )
+            for project, stats in rows
+        ]
+        return items, total_items
+
+    async def ensure_owned(
+        self,
+        db: AsyncSession,
+        *,
+        owner_id: uuid.UUID,
+        project_id: uuid.UUID | None,
+    ) -> None:
+        if project_id is not None:
+            await self.get_project(db, owner_id=owner_id, project_id=project_id)
+
+    async def record_membership_change(
+        self,
+        db: AsyncSession,
+        *,
+        kind: str,
+        before: uuid.UUID | None,
+        after: uuid.UUID | None,
+        touched: uuid.UUID | None = None,
+    ) -> None:
+        """
+            Keep aggregates in step with a child write. Call before the child's commit.
+            `touched` bumps last_activity_at for a project whose membership did not change.
+        """
+        deltas = membership_deltas(before, after)
+        if touched is not None:
+            deltas.setdefault(touched, 0)
+        deltas = {pid: d for pid, d in deltas.items() if d or pid == touched}
+        if deltas:
+            await self.repo.apply_stat_deltas(db, kind=kind, deltas=deltas)
@@ -0,0 +1,221 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import re
+import unicodedata
+from collections.abc import Awaitable, Callable, Sequence
+from difflib import SequenceMatcher
+from typing import Protocol
+
+from app.core.config import get_settings
+from app.services.artifacts import ArtifactRegistry, get_artifact_registry
+from app.modules.quizzes.models import QuizDifficulty
+from app.modules.quizzes.schemas import QuizQuestion, QuizQuestionBatch
+
+ProgressCallback = Callable[[int, int], Awaitable[None]]
+
+# --- Stop generating for a chunk after this many batches that add nothing new ---
+MAX_BATCHES_PER_CHUNK = 3
+
+# --- Built-in prompt; a template published under QUESTIONS_PROMPT_NAME replaces it ---
+QUESTIONS_PROMPT_NAME = "quizzes.questions"
+QUESTIONS_PROMPT = (
+    "Write {count} distinct {difficulty} multiple-choice questions that test "
+    "understanding of the source text below. Each question needs 4 options, the index "
+    "of the correct option and a one-sentence explanation.\n"
+    "{avoid}"
+    "\nSOURCE TEXT:\n{source}"
+)
+
+_PUNCTUATION_RE = re.compile(r"[^\w\s]")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_question_text(text: str) -> str:
+    text = unicodedata.normalize("NFKC", text).casefold()
+    text = _PUNCTUATION_RE.sub(" ", text)
+    return _WHITESPACE_RE.sub(" ", text).strip()
+
+
+def source_fingerprint(chunks: Sequence[str]) -> str:
+    digest = hashlib.sha256()
+    for chunk in chunks:
+        digest.update(chunk.encode("utf-8"))
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+
+class QuestionDeduplicator:
+    """
+        Rejects questions already seen: exact match on the normalized-text hash first,
+        then a similarity ratio for near-duplicates ("What is X?" vs "What's X").
+    """
+
+    def __init__(self, threshold: float | None = None) -> None:
+        self.threshold = threshold if threshold is not None else get_settings().quiz_similarity_threshold
+        self._hashes: set[str] = set()
+        self._normalized: list[str] = []
+
+    def __len__(self) -> int:
+        return len(self._hashes)
+
+    def add(self, question: str) -> bool:
+        """
+            Record the question; returns False if it duplicates one already added.
+        """
+        normalized = normalize_question_text(question)
+        key = hashlib.sha1(normalized.encode("utf-8")).hexdigest()
+        if key in self._hashes or self._is_similar(normalized):
+            return False
+        self._hashes.add(key)
+        self._normalized.append(normalized)
+        return True
+
+    def _is_similar(self, normalized: str) -> bool:
+        matcher = SequenceMatcher(autojunk=False)
+        matcher.set_seq2(normalized)
+        for seen in self._normalized:
+            matcher.set_seq1(seen)
+            # --- Cheap upper bounds first, full ratio only when they pass ---
+            if (
+                matcher.real_quick_ratio() >= self.threshold
+                and matcher.quick_ratio() >= self.threshold
+                and matcher.ratio() >= self.threshold
+            ):
+                return True
+        return False
+
+
+class QuestionGenerator(Protocol):
+    async def generate(
+        self,
+        *,
+        chunk: str,
+        difficulty: QuizDifficulty,
+        count: int,
+        avoid: Sequence[str],
+    ) -> list[QuizQuestion]: ...
+
+
+class GeminiQuestionGenerator:
+    """
+        Asks Gemini for `count` questions in one call using structured (JSON schema) output.
+    """
+
+    def __init__(
+        self,
+        *,
+        model: str | None = None,
+        api_key: str | None = None,
+        registry: ArtifactRegistry | None = None,
+    ) -> None:
+        from google import genai
+
+        settings = get_settings()
+        self.model = model or settings.gemini_model
+        self._client = genai.Client(api_key=api_key or settings.gemini_api_key)
+        self.registry = registry or get_artifact_registry()
+
+    async def generate(
+        self,
+        *,
+        chunk: str,
+        difficulty: QuizDifficulty,
+        count: int,
+        avoid: Sequence[str],
+    ) -> list[QuizQuestion]:
+        avoid_block = ""
+        if avoid:
+            avoid_block = "Do not repeat or rephrase these existing questions:\n" + "\n".join(
+                f"- {q}" for q in avoid[-30:]
+            ) + "\n"
+        template = await self.registry.get_prompt_or(QUESTIONS_PROMPT_NAME, QUESTIONS_PROMPT)
+        prompt = template.format(count=count, difficulty=difficulty.value, avoid=avoid_block, source=chunk)
+
+        response = await self._client.aio.models.generate_content(
+            model=self.model,
+            contents=prompt,
+            config={
+                "response_mime_type": "application/json",
+                "response_schema": QuizQuestionBatch,
+            },
+        )
+        batch = response.parsed
+        if batch is None:
+            batch = QuizQuestionBatch.model_validate_json(response.text or '{"questions": []}')
+        return list(batch.questions)
+
+
+def allocate_questions(total: int, num_chunks: int) -> list[int]:
+    """
+        Spread `total` questions over chunks as evenly as possible.
+    """
+    base, extra = divmod(total, num_chunks)
+    return [base + (1 if i < extra else 0) for i in range(num_chunks)]
+
+
+async def generate_question_pool(
+    *,
+    chunks: Sequence[str],
+    difficulty: QuizDifficulty,
+    target: int,
+    generator: QuestionGenerator,
+    existing: Sequence[QuizQuestion] = (),
+    per_call: int | None = None,
+    concurrency: int | None = None,
+    deduplicator: QuestionDeduplicator | None = None,
+    on_progress: ProgressCallback | None = None,
+) -> list[QuizQuestion]:
+    """
+        Generate `target` new, deduplicated questions.
+
+        Each chunk is a section generated in parallel (bounded by `concurrency`);
+        inside a section questions are requested `per_call` at a time.
+    """
+    settings = get_settings()
+    per_call = per_call or settings.quiz_questions_per_call
+    semaphore = asyncio.Semaphore(concurrency or settings.quiz_generation_concurrency)
+    dedup = deduplicator if deduplicator is not None else QuestionDeduplicator()
+    for question in existing:
+        dedup.add(question.question)
+    accepted_texts = [q.question for q in existing]
+
+    # --- Skip empty chunks, but keep original indexes for source_chunk ---
+    sections = [(i, chunk) for i, chunk in enumerate(chunks) if chunk.strip()]
+    if not sections or target <= 0:
+        return []
+    quotas = allocate_questions(target, len(sections))
+    produced = 0
+
+    async def _section(index: int, chunk: str, quota: int) -> list[QuizQuestion]:
+        nonlocal produced
+        section: list[QuizQuestion] = []
+        fruitless = 0
+        while len(section) < quota and fruitless < MAX_BATCHES_PER_CHUNK:
+            async with semaphore:
+                batch = await generator.generate(
+                    chunk=chunk,
+                    difficulty=difficulty,
+                    count=min(per_call, quota - len(section)),
+                    avoid=accepted_texts,
+                )
+            added = 0
+            for question in batch:
+                if len(section) >= quota:
+                    break
+                # --- Single event loop: check-and-add is atomic across sections ---
+                if dedup.add(question.question):
+                    section.append(question.model_copy(update={"source_chunk": index}))
+                    accepted_texts.append(question.question)
+                    added += 1
+            fruitless = 0 if added else fruitless + 1
+            produced += added
+            if added and on_progress is not None:
+                await on_progress(produced, target)
+        return section
+
+    results = await asyncio.gather(
+        *(_section(index, chunk, quota) for (index, chunk), quota in zip(sections, quotas) if quota)
+    )
+    return [question for section in results for question in section]
@@ -0,0 +1,57 @@
+import enum
+import uuid
+from datetime import datetime
+
+from sqlalchemy import Boolean, DateTime, Enum, String, UniqueConstraint, func
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base
+
+class QuizDifficulty(str, enum.Enum):
+    easy = "easy"
+    medium = "medium"
+    hard = "hard"
+
+class QuizQuestionPool(Base):
+    """
+        Deduplicated questions generated for one (document, difficulty, source).
+        Shared by every student who requests a quiz on the same source text: a caller
+        only ever reads questions generated from the chunks it sent, and different
+        chunks under the same document id get their own pool instead of replacing it.
+    """
+    __tablename__ = "quiz_question_pools"
+    __table_args__ = (
+        UniqueConstraint(
+            "document_id",
+            "difficulty",
+            "source_fingerprint",
+            name="uq_quiz_question_pools_document_difficulty_source",
+        ),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    document_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=False)
+    difficulty: Mapped[QuizDifficulty] = mapped_column(
+        Enum(QuizDifficulty, name="quiz_difficulty"),
+        nullable=False,
+    )
+    questions: Mapped[list[dict]] = mapped_column(JSONB, nullable=False, default=list)
+
+    # --- Hash of the source chunks: a re-uploaded document gets a fresh pool ---
+    source_fingerprint: Mapped[str] = mapped_column(String(64), nullable=False)
+
+    # --- Generation stalled short of its target: serve what there is, don't regenerate ---
+    exhausted: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+        onupdate=func.now(),
+    )
@@ -0,0 +1,73 @@
+# --- Standard Library Imports ---
+import uuid
+
+# --- Third-Party Imports ---
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# --- Local Imports ---
+from app.modules.quizzes.models import QuizDifficulty, QuizQuestionPool
+
+
+# --- Quizzes Repository Class ---
+class QuizzesRepository:
+    """
+        Repository for cached question pools.
+    """
+
+    # --- READ Operation ---
+    async def get_pool(
+        self,
+        db: AsyncSession,
+        *,
+        document_id: uuid.UUID,
+        difficulty: QuizDifficulty,
+        source_fingerprint: str,
+    ) -> QuizQuestionPool | None:
+        stmt = select(QuizQuestionPool).where(
+            QuizQuestionPool.document_id == document_id,
+            QuizQuestionPool.difficulty == difficulty,
+            QuizQuestionPool.source_fingerprint == source_fingerprint,
+        )
+        res = await db.execute(stmt)
+        return res.scalar_one_or_none()
+
+    # --- UPSERT Operation ---
+    async def save_pool(
+        self,
+        db: AsyncSession,
+        *,
+        document_id: uuid.UUID,
+        difficulty: QuizDifficulty,
+        questions: list[dict],
+        source_fingerprint: str,
+        exhausted: bool = False,
+    ) -> QuizQuestionPool:
+        """
+            Insert or replace the pool for (document, difficulty, source) in one statement.
+        """
+        stmt = (
+            insert(QuizQuestionPool)
+            .values(
+                id=uuid.uuid4(),
+                document_id=document_id,
+                difficulty=difficulty,
+                questions=questions,
+                source_fingerprint=source_fingerprint,
+                exhausted=exhausted,
+            )
+            .on_conflict_do_update(
+                constraint="uq_quiz_question_pools_document_difficulty_source",
+                set_={
+                    "questions": questions,
+                    "exhausted": exhausted,
+                    "updated_at": func.now(),
+                },
+            )
+            .returning(QuizQuestionPool)
+            .execution_options(populate_existing=True)
+        )
+        pool = (await db.execute(stmt)).scalar_one()
+        await db.commit()
+        return pool
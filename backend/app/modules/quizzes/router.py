@@ -0,0 +1,35 @@
+from fastapi import APIRouter, Depends, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.v1.deps import get_db, get_current_user, CurrentUser
+from app.modules.jobs.schemas import JobAccepted
+from app.modules.quizzes.schemas import QuizGenerateRequest, QuizOut
+from app.modules.quizzes.service import QuizzesService
+
+router = APIRouter(prefix="/quizzes", tags=["quizzes"])
+service = QuizzesService()
+
+
+@router.post(
+    "/generate",
+    response_model=QuizOut | JobAccepted,
+    responses={status.HTTP_202_ACCEPTED: {"model": JobAccepted}},
+)
+async def generate_quiz(
+    payload: QuizGenerateRequest,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_db),
+    user: CurrentUser = Depends(get_current_user),
+) -> QuizOut | JobAccepted:
+    result = await service.request_quiz(db, owner_id=user.id, payload=payload)
+    if isinstance(result, QuizOut):
+        return result
+
+    # --- Cache miss: generation runs on the job worker ---
+    response.status_code = status.HTTP_202_ACCEPTED
+    return JobAccepted(
+        job_id=result.id,
+        status=result.status,
+        status_url=str(request.url_for("get_job", job_id=result.id)),
+    )
@@ -0,0 +1,44 @@
+import uuid
+
+from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
+
+from app.modules.quizzes.models import QuizDifficulty
+
+class QuizQuestion(BaseModel):
+    question: str = Field(min_length=1)
+    options: list[str] = Field(min_length=2, max_length=6)
+    answer_index: int = Field(ge=0)
+    explanation: str | None = None
+    # --- Index of the source chunk the question was generated from ---
+    source_chunk: int | None = None
+
+    @field_validator("question")
+    @classmethod
+    def normalize_question(cls, v: str) -> str:
+        return v.strip()
+
+    @model_validator(mode="after")
+    def check_answer_index(self) -> "QuizQuestion":
+        if self.answer_index >= len(self.options):
+            raise ValueError("answer_index out of range")
+        return self
+
+class QuizQuestionBatch(BaseModel):
+    """
+        Structured-output schema for a single model call.
+    """
+    questions: list[QuizQuestion]
+
+class QuizGenerateRequest(BaseModel):
+    document_id: uuid.UUID
+    difficulty: QuizDifficulty = QuizDifficulty.medium
+    num_questions: int = Field(default=10, ge=1, le=50)
+    # --- Source text chunks (until the rag module serves them by document_id) ---
+    chunks: list[str] = Field(min_length=1, max_length=200)
+
+    model_config = ConfigDict(extra="ignore")
+
+class QuizOut(BaseModel):
+    document_id: uuid.UUID
+    difficulty: QuizDifficulty
+    questions: list[QuizQuestion]
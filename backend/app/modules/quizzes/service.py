@@ -0,0 +1,126 @@
+import random
+import uuid
+from collections.abc import Sequence
+
+from fastapi import HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.modules.jobs.models import Job
+from app.modules.jobs.service import JobsService
+from app.modules.quizzes.generation import (
+    ProgressCallback,
+    QuestionGenerator,
+    generate_question_pool,
+    source_fingerprint,
+)
+from app.modules.quizzes.models import QuizDifficulty, QuizQuestionPool
+from app.modules.quizzes.repository import QuizzesRepository
+from app.modules.quizzes.schemas import QuizGenerateRequest, QuizOut, QuizQuestion
+
+GENERATE_JOB_KIND = "quizzes.generate"
+
+class QuizzesService:
+    def __init__(
+        self,
+        repo: QuizzesRepository | None = None,
+        jobs: JobsService | None = None,
+    ) -> None:
+        self.repo = repo or QuizzesRepository()
+        self.jobs = jobs or JobsService()
+
+    @staticmethod
+    def _servable(pool: QuizQuestionPool | None, wanted: int) -> bool:
+        """
+            Covers the request, or is as large as this source allows (exhausted, non-empty).
+        """
+        if pool is None:
+            return False
+        return len(pool.questions) >= wanted or (pool.exhausted and bool(pool.questions))
+
+    @staticmethod
+    def _dedupe_key(document_id: uuid.UUID, difficulty: QuizDifficulty, fingerprint: str) -> str:
+        return f"{document_id}:{difficulty.value}:{fingerprint}"
+
+    async def request_quiz(
+        self,
+        db: AsyncSession,
+        *,
+        owner_id: uuid.UUID,
+        payload: QuizGenerateRequest,
+    ) -> QuizOut | Job:
+        """
+            Serve from the cached pool when it covers the request (or is all this source
+            yields), otherwise hand back the generation job, shared by every caller who
+            asks for the same pool while it runs.
+        """
+        fingerprint = source_fingerprint(payload.chunks)
+        pool = await self.repo.get_pool(
+            db,
+            document_id=payload.document_id,
+            difficulty=payload.difficulty,
+            source_fingerprint=fingerprint,
+        )
+        if self._servable(pool, payload.num_questions):
+            questions = random.sample(pool.questions, min(payload.num_questions, len(pool.questions)))
+            return QuizOut(
+                document_id=payload.document_id,
+                difficulty=payload.difficulty,
+                questions=[QuizQuestion.model_validate(q) for q in questions],
+            )
+        if pool is not None and pool.exhausted:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="No questions could be generated from this source",
+            )
+
+        return await self.jobs.enqueue_job(
+            db,
+            kind=GENERATE_JOB_KIND,
+            owner_id=owner_id,
+            payload=payload.model_dump(mode="json"),
+            dedupe_key=self._dedupe_key(payload.document_id, payload.difficulty, fingerprint),
+        )
+
+    async def build_pool(
+        self,
+        db: AsyncSession,
+        *,
+        document_id: uuid.UUID,
+        difficulty: QuizDifficulty,
+        chunks: Sequence[str],
+        num_questions: int,
+        generator: QuestionGenerator,
+        on_progress: ProgressCallback | None = None,
+    ) -> QuizQuestionPool:
+        """
+            Top the pool for this source up to `num_questions`. When generation stalls
+            short of that, the pool is saved as exhausted and served as is from then on.
+        """
+        fingerprint = source_fingerprint(chunks)
+        pool = await self.repo.get_pool(
+            db,
+            document_id=document_id,
+            difficulty=difficulty,
+            source_fingerprint=fingerprint,
+        )
+        if self._servable(pool, num_questions):
+            return pool
+
+        existing = [QuizQuestion.model_validate(q) for q in pool.questions] if pool is not None else []
+        fresh = await generate_question_pool(
+            chunks=chunks,
+            difficulty=difficulty,
+            target=num_questions - len(existing),
+            generator=generator,
+            existing=existing,
+            on_progress=on_progress,
+        )
+        questions = existing + fresh
+        return await self.repo.save_pool(
+            db,
+            document_id=document_id,
+            difficulty=difficulty,
+            questions=[q.model_dump(mode="json") for q in questions],
+            source_fingerprint=fingerprint,
+            exhausted=len(questions) < num_questions,
+        )
@@ -0,0 +1,35 @@
+from app.core.database import async_session_maker
+from app.modules.jobs.registry import PermanentJobError, job_handler
+from app.modules.jobs.worker import JobContext
+from app.modules.quizzes.generation import GeminiQuestionGenerator
+from app.modules.quizzes.schemas import QuizGenerateRequest
+from app.modules.quizzes.service import GENERATE_JOB_KIND, QuizzesService
+
+service = QuizzesService()
+
+
+@job_handler(GENERATE_JOB_KIND)
+async def generate_quiz(ctx: JobContext, payload: dict) -> dict:
+    try:
+        request = QuizGenerateRequest.model_validate(payload)
+    except ValueError as exc:
+        raise PermanentJobError(f"Invalid quiz payload: {exc}") from exc
+
+    async def _progress(done: int, total: int) -> None:
+        await ctx.report_progress(done / max(total, 1), f"{done}/{total} questions")
+
+    async with async_session_maker() as db:
+        pool = await service.build_pool(
+            db,
+            document_id=request.document_id,
+            difficulty=request.difficulty,
+            chunks=request.chunks,
+            num_questions=request.num_questions,
+            generator=GeminiQuestionGenerator(),
+            on_progress=_progress,
+        )
+    return {
+        "document_id": str(pool.document_id),
+        "difficulty": pool.difficulty.value,
+        "pool_size": len(pool.questions),
+    }
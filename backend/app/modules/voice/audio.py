@@ -0,0 +1,244 @@
+from __future__ import annotations
+
+import math
+import time
+from dataclasses import dataclass, field
+
+SAMPLE_WIDTH = 2  # --- PCM16 ---
+
+BytesLike = bytes | bytearray | memoryview
+
+
+def _sum_of_squares(samples: memoryview) -> float:
+    return math.sumprod(samples, samples)
+
+
+class BufferPool:
+    """
+        Reuses fixed-size bytearrays so per-utterance buffers are not reallocated.
+    """
+
+    def __init__(self, size: int, *, max_pooled: int = 8) -> None:
+        self.size = size
+        self.max_pooled = max_pooled
+        self._free: list[bytearray] = []
+
+    def acquire(self) -> bytearray:
+        return self._free.pop() if self._free else bytearray(self.size)
+
+    def release(self, buf: bytearray) -> None:
+        if len(buf) == self.size and len(self._free) < self.max_pooled:
+            self._free.append(buf)
+
+
+class RingBuffer:
+    """
+        Fixed-capacity byte ring. Writes never allocate; when full the oldest bytes are
+        overwritten (and counted) so a stalled consumer cannot grow memory.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self._buf = bytearray(capacity)
+        self._view = memoryview(self._buf)
+        self._start = 0
+        self._size = 0
+        self.overwritten = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def clear(self) -> None:
+        self._start = 0
+        self._size = 0
+
+    def write(self, data: BytesLike) -> int:
+        """
+            Append bytes; returns how many old bytes were overwritten.
+        """
+        mv = memoryview(data).cast("B")
+        n = len(mv)
+        if n == 0:
+            return 0
+        cap = self.capacity
+        dropped = 0
+        if n >= cap:
+            dropped = self._size + n - cap
+            self._view[:] = mv[n - cap:]
+            self._start, self._size = 0, cap
+            self.overwritten += dropped
+            return dropped
+
+        overflow = self._size + n - cap
+        if overflow > 0:
+            self._start = (self._start + overflow) % cap
+            self._size -= overflow
+            dropped = overflow
+
+        end = (self._start + self._size) % cap
+        first = min(n, cap - end)
+        self._view[end:end + first] = mv[:first]
+        if first < n:
+            self._view[: n - first] = mv[first:]
+        self._size += n
+        self.overwritten += dropped
+        return dropped
+
+    def read_into(self, out: memoryview | bytearray, n: int | None = None) -> int:
+        """
+            Move up to `n` bytes (default len(out)) into `out`; returns bytes copied.
+        """
+        out_view = memoryview(out).cast("B")
+        n = min(self._size, len(out_view) if n is None else n)
+        if n == 0:
+            return 0
+        first = min(n, self.capacity - self._start)
+        out_view[:first] = self._view[self._start:self._start + first]
+        if first < n:
+            out_view[first:n] = self._view[: n - first]
+        self._start = (self._start + n) % self.capacity
+        self._size -= n
+        return n
+
+
+class EnergyVAD:
+    """
+        RMS-energy voice activity detector for PCM16 frames.
+    """
+
+    def __init__(self, threshold: float) -> None:
+        self.threshold = threshold
+
+    @staticmethod
+    def rms(frame: memoryview) -> float:
+        samples = frame.cast("B").cast("h")
+        if not len(samples):
+            return 0.0
+        return math.sqrt(_sum_of_squares(samples) / len(samples))
+
+    def is_speech(self, frame: memoryview) -> bool:
+        return self.rms(frame) >= self.threshold
+
+
+@dataclass
+class Utterance:
+    """
+        A detected utterance backed by a pooled buffer; call `release()` once consumed.
+    """
+    buffer: bytearray
+    length: int
+    ended_at: float = field(default_factory=time.perf_counter)
+    forced: bool = False
+    _pool: BufferPool | None = field(default=None, repr=False)
+
+    @property
+    def audio(self) -> memoryview:
+        return memoryview(self.buffer)[: self.length]
+
+    def release(self) -> None:
+        if self._pool is not None:
+            self._pool.release(self.buffer)
+            self._pool = None
+
+
+class UtteranceSegmenter:
+    """
+        Frames incoming PCM, runs VAD per frame and emits whole utterances.
+
+        - Speech starts after `start_frames` consecutive voiced frames; the pre-roll
+          ring keeps the audio just before that so word onsets are not clipped.
+        - Speech ends after `hangover_frames` consecutive silent frames, or when the
+          utterance buffer is full (emitted with `forced=True`).
+    """
+
+    def __init__(
+        self,
+        *,
+        sample_rate: int,
+        frame_ms: int,
+        vad: EnergyVAD,
+        start_ms: int,
+        hangover_ms: int,
+        preroll_ms: int,
+        max_utterance_ms: int,
+        inbound_buffer_ms: int,
+        pool: BufferPool | None = None,
+    ) -> None:
+        bytes_per_ms = sample_rate * SAMPLE_WIDTH // 1000
+        self.frame_bytes = bytes_per_ms * frame_ms
+        self.vad = vad
+        self.start_frames = max(1, start_ms // frame_ms)
+        self.hangover_frames = max(1, hangover_ms // frame_ms)
+        self.max_utterance_bytes = bytes_per_ms * max_utterance_ms
+        self.pool = pool or BufferPool(self.max_utterance_bytes)
+
+        self._inbound = RingBuffer(max(self.frame_bytes, bytes_per_ms * inbound_buffer_ms))
+        self._preroll = RingBuffer(self.frame_bytes * self.start_frames + bytes_per_ms * preroll_ms)
+        self._frame = bytearray(self.frame_bytes)
+        self._frame_view = memoryview(self._frame)
+
+        self._speaking = False
+        self._voiced_run = 0
+        self._silent_run = 0
+        self._current: bytearray | None = None
+        self._length = 0
+
+    @property
+    def dropped_bytes(self) -> int:
+        return self._inbound.overwritten
+
+    def feed(self, data: BytesLike) -> list[Utterance]:
+        self._inbound.write(data)
+        utterances: list[Utterance] = []
+        while len(self._inbound) >= self.frame_bytes:
+            self._inbound.read_into(self._frame_view, self.frame_bytes)
+            utterance = self._process_frame(self._frame_view)
+            if utterance is not None:
+                utterances.append(utterance)
+        return utterances
+
+    def flush(self) -> Utterance | None:
+        """
+            Emit whatever speech is in progress (e.g. client closed mid-sentence).
+        """
+        return self._emit(forced=True) if self._speaking and self._length else None
+
+    def _process_frame(self, frame: memoryview) -> Utterance | None:
+        voiced = self.vad.is_speech(frame)
+        if not self._speaking:
+            self._preroll.write(frame)
+            self._voiced_run = self._voiced_run + 1 if voiced else 0
+            if self._voiced_run >= self.start_frames:
+                self._start_utterance()
+            return None
+
+        self._append(frame)
+        self._silent_run = 0 if voiced else self._silent_run + 1
+        if self._silent_run >= self.hangover_frames:
+            return self._emit(forced=False)
+        if self._length + self.frame_bytes > self.max_utterance_bytes:
+            return self._emit(forced=True)
+        return None
+
+    def _start_utterance(self) -> None:
+        self._speaking = True
+        self._silent_run = 0
+        self._current = self.pool.acquire()
+        self._length = self._preroll.read_into(memoryview(self._current))
+        self._preroll.clear()
+
+    def _append(self, frame: memoryview) -> None:
+        end = self._length + len(frame)
+        memoryview(self._current)[self._length:end] = frame
+        self._length = end
+
+    def _emit(self, *, forced: bool) -> Utterance:
+        utterance = Utterance(buffer=self._current, length=self._length, forced=forced, _pool=self.pool)
+        self._speaking = False
+        self._voiced_run = 0
+        self._silent_run = 0
+        self._current = None
+        self._length = 0
+        return utterance
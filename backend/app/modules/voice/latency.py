@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import math
+from collections import deque
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    """
+        Nearest-rank percentile of an already sorted list.
+    """
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class LatencyRecorder:
+    """
+        Bounded window of per-utterance latencies (seconds): utterance end -> first reply frame sent.
+    """
+
+    def __init__(self, window: int = 1000) -> None:
+        self._samples: deque[float] = deque(maxlen=window)
+        self.total = 0
+
+    def record(self, seconds: float) -> None:
+        self._samples.append(seconds)
+        self.total += 1
+
+    def snapshot(self) -> dict[str, float | int]:
+        values = sorted(self._samples)
+        return {
+            "count": self.total,
+            "window": len(values),
+            "p50_ms": percentile(values, 50) * 1000,
+            "p90_ms": percentile(values, 90) * 1000,
+            "p99_ms": percentile(values, 99) * 1000,
+            "max_ms": (values[-1] if values else 0.0) * 1000,
+        }
@@ -0,0 +1,31 @@
+from fastapi import APIRouter, Depends, HTTPException, WebSocket, status
+
+from app.api.v1.deps import get_current_user, get_websocket_user, websocket_subprotocol, CurrentUser
+from app.core.config import get_settings
+from app.modules.voice.schemas import VoiceLatencyStats
+from app.modules.voice.service import VoiceService
+
+router = APIRouter(prefix="/voice", tags=["voice"])
+service = VoiceService()
+
+
+@router.websocket("/ws")
+async def voice_ws(
+    websocket: WebSocket,
+    user: CurrentUser = Depends(get_websocket_user),
+) -> None:
+    # --- Binary frames: PCM16 mono at settings.voice_sample_rate; text "flush" ends an utterance ---
+    await service.run_session(websocket, subprotocol=websocket_subprotocol(websocket))
+
+
+def require_latency_stats() -> None:
+    # --- Process-wide timings from every user's sessions: off unless an operator enables them ---
+    if not get_settings().voice_latency_stats_enabled:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+
+
+@router.get("/latency", response_model=VoiceLatencyStats, dependencies=[Depends(require_latency_stats)])
+async def get_voice_latency(
+    user: CurrentUser = Depends(get_current_user),
+) -> VoiceLatencyStats:
+    return VoiceLatencyStats(**service.stats())
@@ -0,0 +1,12 @@
+from pydantic import BaseModel
+
+class VoiceLatencyStats(BaseModel):
+    count: int
+    window: int
+    p50_ms: float
+    p90_ms: float
+    p99_ms: float
+    max_ms: float
+    dropped_inbound_bytes: int
+    dropped_outbound_frames: int
+    dropped_utterances: int
@@ -0,0 +1,210 @@
+import asyncio
+import enum
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Callable
+from dataclasses import dataclass
+from typing import Generic, Protocol, TypeVar
+
+from fastapi import WebSocket
+from loguru import logger
+from starlette.websockets import WebSocketDisconnect
+
+from app.core.config import get_settings
+from app.modules.voice.audio import BufferPool, EnergyVAD, Utterance, UtteranceSegmenter
+from app.modules.voice.latency import LatencyRecorder
+
+T = TypeVar("T")
+
+class DropPolicy(str, enum.Enum):
+    drop_oldest = "drop_oldest"
+    drop_newest = "drop_newest"
+
+class DropQueue(Generic[T]):
+    """
+        Bounded queue that never blocks the producer: when full it drops according to `policy`.
+        Real-time audio is better late-dropped than late-delivered.
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        policy: DropPolicy = DropPolicy.drop_oldest,
+        on_drop: Callable[[T], None] | None = None,
+    ) -> None:
+        self.maxsize = max(1, maxsize)
+        self.policy = policy
+        self.on_drop = on_drop
+        self.dropped = 0
+        self._items: deque[T] = deque()
+        self._ready = asyncio.Event()
+        self._closed = False
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def put_nowait(self, item: T) -> bool:
+        """
+            Returns False if `item` itself was dropped.
+        """
+        if self._closed:
+            self._drop(item)
+            return False
+        if len(self._items) >= self.maxsize:
+            if self.policy == DropPolicy.drop_newest:
+                self._drop(item)
+                return False
+            self._drop(self._items.popleft())
+        self._items.append(item)
+        self._ready.set()
+        return True
+
+    async def get(self) -> T | None:
+        """
+            Next item, or None once closed and drained.
+        """
+        while not self._items:
+            if self._closed:
+                return None
+            self._ready.clear()
+            await self._ready.wait()
+        return self._items.popleft()
+
+    def close(self) -> None:
+        self._closed = True
+        self._ready.set()
+
+    def _drop(self, item: T) -> None:
+        self.dropped += 1
+        if self.on_drop is not None:
+            self.on_drop(item)
+
+class VoiceModel(Protocol):
+    def respond(self, audio: memoryview) -> AsyncIterator[bytes]:
+        """
+            Stream reply audio for one utterance. `audio` is only valid until the iterator
+            finishes (its buffer is pooled), so implementations must not keep it.
+        """
+        ...
+
+class EchoVoiceModel:
+    """
+        Echoes the utterance back in frame-sized chunks. Used for tests and local wiring
+        until the Gemini Live model is plugged in.
+    """
+
+    def __init__(self, chunk_bytes: int = 640) -> None:
+        self.chunk_bytes = chunk_bytes
+
+    async def respond(self, audio: memoryview) -> AsyncIterator[bytes]:
+        for start in range(0, len(audio), self.chunk_bytes):
+            yield bytes(audio[start:start + self.chunk_bytes])
+
+@dataclass(slots=True)
+class _Outgoing:
+    data: bytes
+    # --- Set on the first reply frame of an utterance: latency is measured when it is sent ---
+    utterance_ended_at: float | None = None
+
+class VoiceService:
+    def __init__(
+        self,
+        model_factory: Callable[[], VoiceModel] = EchoVoiceModel,
+        recorder: LatencyRecorder | None = None,
+    ) -> None:
+        self.model_factory = model_factory
+        self.recorder = recorder or LatencyRecorder()
+        self.dropped_inbound_bytes = 0
+        self.dropped_outbound_frames = 0
+        self.dropped_utterances = 0
+        settings = get_settings()
+        self._pool = BufferPool(settings.voice_sample_rate * 2 * settings.voice_max_utterance_ms // 1000)
+
+    def _segmenter(self) -> UtteranceSegmenter:
+        settings = get_settings()
+        return UtteranceSegmenter(
+            sample_rate=settings.voice_sample_rate,
+            frame_ms=settings.voice_frame_ms,
+            vad=EnergyVAD(settings.voice_vad_rms_threshold),
+            start_ms=settings.voice_vad_start_ms,
+            hangover_ms=settings.voice_vad_hangover_ms,
+            preroll_ms=settings.voice_preroll_ms,
+            max_utterance_ms=settings.voice_max_utterance_ms,
+            inbound_buffer_ms=settings.voice_inbound_buffer_ms,
+            pool=self._pool,
+        )
+
+    def stats(self) -> dict[str, float | int]:
+        return {
+            **self.recorder.snapshot(),
+            "dropped_inbound_bytes": self.dropped_inbound_bytes,
+            "dropped_outbound_frames": self.dropped_outbound_frames,
+            "dropped_utterances": self.dropped_utterances,
+        }
+
+    async def run_session(self, websocket: WebSocket, *, subprotocol: str | None = None) -> None:
+        """
+            Three cooperating loops per connection:
+            receive (PCM -> VAD -> utterances), model (utterance -> reply frames), send.
+            Queues between them are bounded and drop instead of blocking.
+        """
+        settings = get_settings()
+        segmenter = self._segmenter()
+        utterances: DropQueue[Utterance] = DropQueue(
+            settings.voice_pending_utterances,
+            DropPolicy.drop_oldest,
+            on_drop=lambda u: u.release(),
+        )
+        outbound: DropQueue[_Outgoing] = DropQueue(settings.voice_outbound_queue_frames, DropPolicy.drop_oldest)
+        model = self.model_factory()
+
+        async def _receive() -> None:
+            try:
+                while True:
+                    message = await websocket.receive()
+                    if message["type"] == "websocket.disconnect":
+                        return
+                    data = message.get("bytes")
+                    if data:
+                        for utterance in segmenter.feed(data):
+                            utterances.put_nowait(utterance)
+                    # --- Client-side push-to-talk release: end the utterance now ---
+                    elif message.get("text") == "flush" and (tail := segmenter.flush()) is not None:
+                        utterances.put_nowait(tail)
+            finally:
+                utterances.close()
+
+        async def _model() -> None:
+            try:
+                while (utterance := await utterances.get()) is not None:
+                    try:
+                        first = True
+                        async for chunk in model.respond(utterance.audio):
+                            outbound.put_nowait(_Outgoing(chunk, utterance.ended_at if first else None))
+                            first = False
+                    finally:
+                        utterance.release()
+            finally:
+                outbound.close()
+
+        async def _send() -> None:
+            while (item := await outbound.get()) is not None:
+                await websocket.send_bytes(item.data)
+                if item.utterance_ended_at is not None:
+                    self.recorder.record(time.perf_counter() - item.utterance_ended_at)
+
+        await websocket.accept(subprotocol=subprotocol)
+        tasks = [asyncio.create_task(coro) for coro in (_receive(), _model(), _send())]
+        try:
+            results = await asyncio.gather(*tasks, return_exceptions=True)
+            for result in results:
+                if isinstance(result, Exception) and not isinstance(result, (WebSocketDisconnect, RuntimeError)):
+                    logger.opt(exception=result).warning("Voice session ended with an error")
+        finally:
+            for task in tasks:
+                task.cancel()
+            if (tail := segmenter.flush()) is not None:
+                tail.release()
+            self.dropped_inbound_bytes += segmenter.dropped_bytes
+            self.dropped_outbound_frames += outbound.dropped
+            self.dropped_utterances += utterances.dropped
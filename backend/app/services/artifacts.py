@@ -0,0 +1,265 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import json
+import sys
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+
+from app.core.config import get_settings
+from app.services.storage import LocalStorage, ObjectNotFoundError, ObjectStorage, get_storage
+
+
+class ArtifactNotFoundError(LookupError):
+    pass
+
+
+class ArtifactIntegrityError(Exception):
+    pass
+
+
+@dataclass(frozen=True)
+class ArtifactRef:
+    name: str
+    version: str  # --- sha256 of the artifact bytes ---
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def canonical_json(value: Any) -> bytes:
+    """
+        Stable serialization: the same program state always hashes to the same version.
+        Non-JSON values raise TypeError rather than being stringified into state that
+        would no longer load back.
+    """
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def program_document(state: Any) -> dict[str, Any]:
+    return {"kind": "dspy_program", "state": state}
+
+
+class ArtifactRegistry:
+    """
+        Content-addressed store for compiled DSPy programs and prompt templates.
+
+        Layout under `prefix`:
+          {name}/{sha256}.json   immutable blobs, cached in-process forever once loaded
+          {name}/current         pointer to the promoted version, re-read at most every `pointer_ttl`
+
+        Compilation happens offline (`save_program`); every worker then loads the same
+        promoted version lazily on first use. `pins` (name -> version) freeze a deploy.
+        Generation call sites read their prompts through `get_prompt_or`, so a published
+        template replaces the built-in one without a deploy.
+    """
+
+    def __init__(
+        self,
+        storage: ObjectStorage,
+        *,
+        prefix: str = "artifacts",
+        pointer_ttl: float = 60.0,
+        pins: dict[str, str] | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.storage = storage
+        self.prefix = prefix.strip("/")
+        self.pointer_ttl = pointer_ttl
+        self.pins = dict(pins or {})
+        self.clock = clock
+        self._blobs: dict[ArtifactRef, bytes] = {}
+        self._pointers: dict[str, tuple[float, str]] = {}
+        self._programs: dict[ArtifactRef, Any] = {}
+        # --- name -> when it was last found unpublished; rechecked after `pointer_ttl` ---
+        self._unpublished: dict[str, float] = {}
+        # --- Single-flight: concurrent first uses of one key share a single load ---
+        self._locks: dict[Any, asyncio.Lock] = {}
+        self.loads = 0
+
+    def _blob_key(self, ref: ArtifactRef) -> str:
+        return f"{self.prefix}/{ref.name}/{ref.version}.json"
+
+    def _pointer_key(self, name: str) -> str:
+        return f"{self.prefix}/{name}/current"
+
+    def _lock(self, key: Any) -> asyncio.Lock:
+        return self._locks.setdefault(key, asyncio.Lock())
+
+    # --- Publishing ---
+    async def publish(self, name: str, data: bytes, *, promote: bool = True) -> ArtifactRef:
+        ref = ArtifactRef(name=name, version=content_hash(data))
+        if not await self.storage.exists(self._blob_key(ref)):
+            await self.storage.put_bytes(self._blob_key(ref), data, content_type="application/json")
+        self._blobs[ref] = data
+        if promote:
+            await self.promote(ref)
+        return ref
+
+    async def promote(self, ref: ArtifactRef) -> None:
+        if ref not in self._blobs and not await self.storage.exists(self._blob_key(ref)):
+            raise ArtifactNotFoundError(f"{ref.name}@{ref.version}")
+        await self.storage.put_bytes(self._pointer_key(ref.name), ref.version.encode("ascii"), content_type="text/plain")
+        self._pointers[ref.name] = (self.clock(), ref.version)
+        logger.info("Promoted artifact {}@{}", ref.name, ref.version[:12])
+
+    # --- Resolving and loading ---
+    async def resolve(self, name: str, version: str | None = None) -> ArtifactRef:
+        version = version or self.pins.get(name)
+        if version:
+            return ArtifactRef(name=name, version=version)
+        cached = self._pointers.get(name)
+        if cached is not None and self.clock() - cached[0] < self.pointer_ttl:
+            return ArtifactRef(name=name, version=cached[1])
+        try:
+            current = (await self.storage.get_bytes(self._pointer_key(name))).decode("ascii").strip()
+        except ObjectNotFoundError:
+            raise ArtifactNotFoundError(f"No promoted version of artifact '{name}'") from None
+        self._pointers[name] = (self.clock(), current)
+        return ArtifactRef(name=name, version=current)
+
+    async def get_bytes(self, ref: ArtifactRef) -> bytes:
+        data = self._blobs.get(ref)
+        if data is not None:
+            return data
+        async with self._lock(ref):
+            if (data := self._blobs.get(ref)) is not None:
+                return data
+            try:
+                data = await self.storage.get_bytes(self._blob_key(ref))
+            except ObjectNotFoundError:
+                raise ArtifactNotFoundError(f"{ref.name}@{ref.version}") from None
+            if content_hash(data) != ref.version:
+                raise ArtifactIntegrityError(f"{ref.name}@{ref.version} does not match its content hash")
+            self.loads += 1
+            self._blobs[ref] = data
+            return data
+
+    async def get_json(self, name: str, version: str | None = None) -> tuple[ArtifactRef, Any]:
+        ref = await self.resolve(name, version)
+        return ref, json.loads(await self.get_bytes(ref))
+
+    # --- Prompt templates ---
+    async def publish_prompt(self, name: str, template: str, *, promote: bool = True) -> ArtifactRef:
+        return await self.publish(name, canonical_json({"kind": "prompt", "template": template}), promote=promote)
+
+    async def get_prompt(self, name: str, version: str | None = None) -> str:
+        _, document = await self.get_json(name, version)
+        return document["template"]
+
+    async def get_prompt_or(self, name: str, default: str) -> str:
+        """
+            The promoted template for `name`, or the caller's built-in `default` while none
+            is published. A miss is remembered for `pointer_ttl`, like a resolved pointer.
+        """
+        missed_at = self._unpublished.get(name)
+        if missed_at is not None and self.clock() - missed_at < self.pointer_ttl:
+            return default
+        try:
+            template = await self.get_prompt(name)
+        except ArtifactNotFoundError:
+            self._unpublished[name] = self.clock()
+            return default
+        self._unpublished.pop(name, None)
+        return template
+
+    # --- DSPy programs ---
+    async def save_program(self, name: str, program: Any, *, promote: bool = True) -> ArtifactRef:
+        """
+            Persist a compiled DSPy program's learned state (demos, instructions), not its code.
+        """
+        return await self.publish(name, canonical_json(program_document(program.dump_state())), promote=promote)
+
+    async def load_program(self, name: str, factory: Callable[[], Any], version: str | None = None) -> Any:
+        """
+            Build the program with `factory` (the uncompiled module) and apply the stored state.
+            The loaded program is cached per version, so compilation is never on the hot path.
+            Callers share the instance: DSPy modules are safe to call concurrently once loaded.
+        """
+        ref = await self.resolve(name, version)
+        program = self._programs.get(ref)
+        if program is not None:
+            return program
+        async with self._lock(("program", ref)):
+            if (program := self._programs.get(ref)) is not None:
+                return program
+            document = json.loads(await self.get_bytes(ref))
+            if document.get("kind") != "dspy_program":
+                raise ArtifactIntegrityError(f"{name}@{ref.version} is not a DSPy program")
+            program = factory()
+            program.load_state(document["state"])
+            self._programs[ref] = program
+            logger.info("Loaded DSPy program {}@{}", name, ref.version[:12])
+            return program
+
+
+@lru_cache
+def get_artifact_registry() -> ArtifactRegistry:
+    settings = get_settings()
+    storage: ObjectStorage = (
+        LocalStorage(settings.artifacts_local_dir) if settings.artifacts_backend == "local" else get_storage()
+    )
+    return ArtifactRegistry(
+        storage,
+        prefix=settings.artifacts_prefix,
+        pointer_ttl=settings.artifacts_pointer_ttl_seconds,
+        pins=settings.artifacts_pins,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Publish, promote and inspect AI artifacts")
+    sub = parser.add_subparsers(dest="command", required=True)
+    publish = sub.add_parser("publish", help="store a JSON document verbatim (read back with get_json)")
+    program = sub.add_parser(
+        "publish-program",
+        help="store a DSPy program state (JSON from module.dump_state() or module.save(...)) for load_program",
+    )
+    prompt = sub.add_parser("publish-prompt", help="store a prompt template from a text file")
+    for command in (publish, program, prompt):
+        command.add_argument("name")
+        command.add_argument("path", type=Path)
+        command.add_argument("--no-promote", action="store_true")
+    promote = sub.add_parser("promote")
+    promote.add_argument("name")
+    promote.add_argument("version")
+    show = sub.add_parser("show")
+    show.add_argument("name")
+    args = parser.parse_args()
+
+    registry = get_artifact_registry()
+
+    async def _run() -> None:
+        if args.command == "publish":
+            data = canonical_json(json.loads(args.path.read_bytes()))
+            ref = await registry.publish(args.name, data, promote=not args.no_promote)
+        elif args.command == "publish-program":
+            data = canonical_json(program_document(json.loads(args.path.read_bytes())))
+            ref = await registry.publish(args.name, data, promote=not args.no_promote)
+        elif args.command == "publish-prompt":
+            template = args.path.read_text(encoding="utf-8")
+            ref = await registry.publish_prompt(args.name, template, promote=not args.no_promote)
+        elif args.command == "promote":
+            ref = ArtifactRef(args.name, args.version)
+            await registry.promote(ref)
+        else:
+            ref = await registry.resolve(args.name)
+        sys.stdout.write(f"{ref.name}@{ref.version}\n")
+
+    try:
+        asyncio.run(_run())
+    except ArtifactNotFoundError as exc:
+        sys.exit(f"Artifact not found: {exc}")
+
+
+if __name__ == "__main__":
+    main()
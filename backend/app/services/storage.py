@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import asyncio
+import io
+from collections.abc import AsyncIterator
+from functools import lru_cache
+from pathlib import Path
+from typing import Protocol
+
+from app.core.config import get_settings
+
+DEFAULT_READ_CHUNK = 64 * 1024
+
+
+class ObjectNotFoundError(Exception):
+    pass
+
+
+class ObjectStorage(Protocol):
+    """
+        Minimal async object store used by the generation modules.
+    """
+
+    async def put_bytes(self, key: str, data: bytes, *, content_type: str = "application/octet-stream") -> None: ...
+
+    async def get_bytes(self, key: str) -> bytes: ...
+
+    def iter_chunks(self, key: str, *, chunk_size: int = DEFAULT_READ_CHUNK) -> AsyncIterator[bytes]: ...
+
+    async def exists(self, key: str) -> bool: ...
+
+
+class MinioStorage:
+    """
+        MinIO / S3 backend. The minio client is blocking, so calls run in a thread.
+    """
+
+    def __init__(
+        self,
+        *,
+        endpoint: str,
+        access_key: str,
+        secret_key: str,
+        bucket: str,
+        secure: bool = False,
+    ) -> None:
+        from minio import Minio
+
+        self.bucket = bucket
+        self._client = Minio(endpoint, access_key=access_key, secret_key=secret_key, secure=secure)
+        self._bucket_checked = False
+
+    async def _ensure_bucket(self) -> None:
+        if self._bucket_checked:
+            return
+        if not await asyncio.to_thread(self._client.bucket_exists, self.bucket):
+            await asyncio.to_thread(self._client.make_bucket, self.bucket)
+        self._bucket_checked = True
+
+    async def put_bytes(self, key: str, data: bytes, *, content_type: str = "application/octet-stream") -> None:
+        await self._ensure_bucket()
+        await asyncio.to_thread(
+            self._client.put_object,
+            self.bucket,
+            key,
+            io.BytesIO(data),
+            len(data),
+            content_type=content_type,
+        )
+
+    async def get_bytes(self, key: str) -> bytes:
+        return b"".join([chunk async for chunk in self.iter_chunks(key)])
+
+    async def iter_chunks(self, key: str, *, chunk_size: int = DEFAULT_READ_CHUNK) -> AsyncIterator[bytes]:
+        from minio.error import S3Error
+
+        try:
+            response = await asyncio.to_thread(self._client.get_object, self.bucket, key)
+        except S3Error as exc:
+            if exc.code in {"NoSuchKey", "NoSuchBucket"}:
+                raise ObjectNotFoundError(key) from exc
+            raise
+        try:
+            while chunk := await asyncio.to_thread(response.read, chunk_size):
+                yield chunk
+        finally:
+            response.close()
+            response.release_conn()
+
+    async def exists(self, key: str) -> bool:
+        from minio.error import S3Error
+
+        try:
+            await asyncio.to_thread(self._client.stat_object, self.bucket, key)
+        except S3Error as exc:
+            if exc.code in {"NoSuchKey", "NoSuchBucket"}:
+                return False
+            raise
+        return True
+
+
+class LocalStorage:
+    """
+        Filesystem backend for local development and tests.
+    """
+
+    def __init__(self, root: str | Path) -> None:
+        self.root = Path(root)
+
+    def _path(self, key: str) -> Path:
+        path = (self.root / key).resolve()
+        if not path.is_relative_to(self.root.resolve()):
+            raise ValueError(f"Invalid object key: {key}")
+        return path
+
+    async def put_bytes(self, key: str, data: bytes, *, content_type: str = "application/octet-stream") -> None:
+        path = self._path(key)
+
+        def _write() -> None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(path.suffix + ".tmp")
+            tmp.write_bytes(data)
+            tmp.replace(path)  # --- atomic: readers never see a partial object ---
+
+        await asyncio.to_thread(_write)
+
+    async def get_bytes(self, key: str) -> bytes:
+        path = self._path(key)
+        if not path.exists():
+            raise ObjectNotFoundError(key)
+        return await asyncio.to_thread(path.read_bytes)
+
+    async def iter_chunks(self, key: str, *, chunk_size: int = DEFAULT_READ_CHUNK) -> AsyncIterator[bytes]:
+        path = self._path(key)
+        if not path.exists():
+            raise ObjectNotFoundError(key)
+        with path.open("rb") as fh:
+            while chunk := await asyncio.to_thread(fh.read, chunk_size):
+                yield chunk
+
+    async def exists(self, key: str) -> bool:
+        return self._path(key).exists()
+
+
+@lru_cache
+def get_storage() -> ObjectStorage:
+    settings = get_settings()
+    return MinioStorage(
+        endpoint=settings.minio_endpoint,
+        access_key=settings.minio_access_key,
+        secret_key=settings.minio_secret_key,
+        bucket=settings.minio_bucket,
+        secure=settings.minio_secure,
+    )
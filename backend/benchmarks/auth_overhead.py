@@ -0,0 +1,44 @@
+"""
+Per-request auth overhead: full JWT verification vs. the cached path taken by repeat
+requests carrying the same token.
+
+    cd backend && python -m benchmarks.auth_overhead --iterations 100000
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+import uuid
+
+from app.core.config import Settings
+from app.core.security import KeyProvider, TokenVerifier, issue_token
+
+
+def _per_call_us(fn, iterations: int) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - started) / iterations * 1e6
+
+
+def main(args: argparse.Namespace) -> None:
+    keys = KeyProvider(Settings(auth_jwt_keys={"bench": "benchmark-secret"}))
+    verifier = TokenVerifier(keys, algorithms=["HS256"], cache_size=args.cache_size)
+    claims = {"sub": str(uuid.uuid4()), "exp": time.time() + 3600, "iss": "bench", "scope": "read write"}
+    token = issue_token(claims, key="benchmark-secret", kid="bench")
+
+    cold = _per_call_us(lambda: verifier._verify_uncached(token, time.time()), args.iterations)
+    verifier.verify(token)
+    cached = _per_call_us(lambda: verifier.verify(token), args.iterations)
+
+    print(f"token: {len(token)} bytes, iterations={args.iterations}")
+    print(f"uncached verify: {cold:8.2f} us/request")
+    print(f"cached verify:   {cached:8.2f} us/request  ({cold / cached:.1f}x faster)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=100_000)
+    parser.add_argument("--cache-size", type=int, default=10_000)
+    main(parser.parse_args())
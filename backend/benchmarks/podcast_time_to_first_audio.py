@@ -0,0 +1,60 @@
+"""
+Time-to-first-audio: serial single TTS call vs. the chunked, concurrent pipeline.
+
+Uses FakeTTS (latency = base + per_char * len(text)) and LocalStorage in a temp dir,
+so it runs without Gemini or MinIO:
+
+    cd backend && python -m benchmarks.podcast_time_to_first_audio --chars 12000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import tempfile
+import time
+
+from app.modules.podcasts.pipeline import split_script, synthesize_segments
+from app.modules.podcasts.tts import FakeTTS
+from app.services.storage import LocalStorage
+
+SENTENCE = "Photosynthesis turns light energy into chemical energy stored in glucose. "
+
+
+async def _serial(script: str, tts: FakeTTS, storage: LocalStorage) -> float:
+    started = time.perf_counter()
+    audio = await tts.synthesize(script)
+    await storage.put_bytes("serial/full.wav", audio.data, content_type=audio.content_type)
+    return time.perf_counter() - started
+
+
+async def _main(args: argparse.Namespace) -> None:
+    script = "\n".join(SENTENCE * 4 for _ in range(max(1, args.chars // (len(SENTENCE) * 4))))
+    tts = FakeTTS(base_latency=args.base_latency, per_char_latency=args.per_char_latency)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = LocalStorage(tmp)
+        serial = await _serial(script, tts, storage)
+
+        segments = list(enumerate(split_script(script)))
+        stats = await synthesize_segments(
+            segments,
+            tts=tts,
+            storage=storage,
+            key_prefix="pipelined",
+            concurrency=args.concurrency,
+        )
+
+    print(f"script: {len(script)} chars, {len(segments)} segments, concurrency={args.concurrency}")
+    print(f"serial     time-to-first-audio: {serial * 1000:8.1f} ms (= total)")
+    print(f"pipelined  time-to-first-audio: {stats.time_to_first_audio * 1000:8.1f} ms")
+    print(f"pipelined  total:               {stats.total_seconds * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chars", type=int, default=12_000)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--base-latency", type=float, default=0.3, help="seconds per TTS call")
+    parser.add_argument("--per-char-latency", type=float, default=0.0002, help="seconds per character")
+    asyncio.run(_main(parser.parse_args()))
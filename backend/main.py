@@ -1,18 +1,42 @@
 from __future__ import annotations
 
+import asyncio
+import contextlib
+from collections.abc import AsyncIterator
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.api.v1.api import api_router
+from app.core.compression import CompressionMiddleware
 from app.core.config import get_settings
 from app.core.exceptions import register_exception_handlers
 from app.core.logging import configure_logging
+from app.core.rate_limit import RateLimitHeadersMiddleware
+from app.core.security import get_key_provider
+from app.modules.conversations.feed import get_conversation_feed
+
+@contextlib.asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    # --- Key rotation runs off the request path: requests only read the in-memory key set ---
+    refresh = None
+    if get_settings().auth_jwt_keys_file:
+        refresh = asyncio.create_task(get_key_provider().run_refresh())
+    try:
+        yield
+    finally:
+        if refresh is not None:
+            refresh.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await refresh
+        # --- Closes this worker's shared LISTEN connection, if any client opened the feed ---
+        await get_conversation_feed().stop()
 
 def create_app() -> FastAPI:
     settings = get_settings()
     configure_logging(settings)
 
-    app = FastAPI(title=settings.app_name, debug=settings.debug)
+    app = FastAPI(title=settings.app_name, debug=settings.debug, lifespan=lifespan)
 
     if settings.cors_origins:
         app.add_middleware(
@@ -22,6 +46,14 @@ def create_app() -> FastAPI:
             allow_methods=["*"],
             allow_headers=["*"],
         )
+    app.add_middleware(RateLimitHeadersMiddleware)
+    if settings.compression_enabled:
+        app.add_middleware(
+            CompressionMiddleware,
+            encodings=settings.compression_encodings,
+            minimum_size=settings.compression_minimum_size,
+            offload_size=settings.compression_offload_size,
+        )
     register_exception_handlers(app)
     app.include_router(api_router, prefix=settings.api_v1_prefix)
     return app 
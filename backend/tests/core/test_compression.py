@@ -0,0 +1,155 @@
+import asyncio
+import gzip
+import zlib
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse, Response
+from fastapi.testclient import TestClient
+
+from app.core.compression import CompressionMiddleware, CompressionStats, level_for, negotiate
+
+
+def _app(stats: CompressionStats) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, encodings=["gzip"], minimum_size=500, stats=stats)
+
+    @app.get("/big")
+    async def big() -> JSONResponse:
+        return JSONResponse({"items": [{"metadata": {"title": "lecture notes", "n": i}} for i in range(200)]})
+
+    @app.get("/small")
+    async def small() -> dict:
+        return {"ok": True}
+
+    @app.get("/audio")
+    async def audio() -> Response:
+        return Response(b"\x00" * 4096, media_type="audio/wav")
+
+    return app
+
+
+def test_negotiate_respects_preference_and_q_values():
+    preferred = ("zstd", "br", "gzip")
+    assert negotiate("gzip, deflate, br", preferred) == "br"
+    assert negotiate("br;q=0, gzip;q=0.5", preferred) == "gzip"
+    assert negotiate("*", preferred) == "zstd"
+    assert negotiate("identity", preferred) is None
+    assert negotiate("*, gzip;q=0", ("gzip",)) is None
+
+
+def test_levels_are_tuned_per_content_type():
+    assert level_for("text/event-stream", "gzip") == 1
+    assert level_for("application/json", "gzip") == 6
+    assert level_for("text/plain", "gzip") == 6
+    assert level_for("application/vnd.custom+json", "zstd") == 3
+
+
+def test_buffered_json_is_compressed_above_threshold():
+    stats = CompressionStats()
+    client = TestClient(_app(stats))
+
+    response = client.get("/big", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.json()["items"][199]["metadata"]["n"] == 199
+
+    small = client.get("/small", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in small.headers
+    audio = client.get("/audio", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in audio.headers
+    identity = client.get("/big", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in identity.headers
+
+    snapshot = stats.snapshot()
+    assert snapshot["encodings"]["gzip"]["responses"] == 1
+    assert snapshot["encodings"]["gzip"]["ratio"] > 5
+    assert snapshot["skipped_below_minimum"] == 1
+    assert snapshot["skipped_not_compressible"] == 1
+    assert snapshot["skipped_not_accepted"] == 1
+
+
+def test_sse_chunks_are_flushed_as_they_arrive():
+    events = [f"id: {i}\ndata: {{\"n\": {i}}}\n\n".encode() for i in range(3)]
+
+    async def sse_app(scope, receive, send):
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [(b"content-type", b"text/event-stream"), (b"content-length", b"999")],
+        })
+        for event in events:
+            await send({"type": "http.response.body", "body": event, "more_body": True})
+        await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+    stats = CompressionStats()
+    middleware = CompressionMiddleware(sse_app, encodings=["gzip"], minimum_size=10_000, stats=stats)
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "headers": [(b"accept-encoding", b"gzip")]}
+    asyncio.run(middleware(scope, None, send))
+
+    headers = dict(sent[0]["headers"])
+    assert headers[b"content-encoding"] == b"gzip"
+    assert b"content-length" not in headers
+    # --- Every chunk decodes on its own: nothing is held back waiting for the next event ---
+    decoder = zlib.decompressobj(31)
+    for message, event in zip(sent[1:4], events):
+        assert message["more_body"] is True
+        assert decoder.decompress(message["body"]) == event
+    body = b"".join(message["body"] for message in sent[1:])
+    assert gzip.decompress(body) == b"".join(events)
+    assert stats.snapshot()["encodings"]["gzip"]["streamed"] == 1
+
+
+
+def _decoder(encoding):
+    """
+        Incremental decoder factory for an optional codec; skips when it is not installed.
+    """
+    if encoding == "br":
+        brotli = pytest.importorskip("brotli")
+        return lambda: brotli.Decompressor().process
+    zstandard = pytest.importorskip("zstandard")
+    return lambda: zstandard.ZstdDecompressor().decompressobj().decompress
+
+
+@pytest.mark.parametrize("encoding", ["br", "zstd"])
+def test_optional_codecs_buffered_and_streamed(encoding):
+    new_decoder = _decoder(encoding)
+
+    stats = CompressionStats()
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, encodings=[encoding, "gzip"], minimum_size=500, stats=stats)
+
+    @app.get("/big")
+    async def big() -> JSONResponse:
+        return JSONResponse({"items": [{"n": i} for i in range(500)]})
+
+    response = TestClient(app).get("/big", headers={"Accept-Encoding": f"gzip, {encoding}"})
+    assert response.headers["content-encoding"] == encoding
+
+    events = [f"data: {i}\n\n".encode() for i in range(3)]
+
+    async def sse_app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"text/event-stream")]})
+        for event in events:
+            await send({"type": "http.response.body", "body": event, "more_body": True})
+        await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    middleware = CompressionMiddleware(sse_app, encodings=[encoding], minimum_size=10_000, stats=stats)
+    asyncio.run(middleware({"type": "http", "headers": [(b"accept-encoding", encoding.encode())]}, None, send))
+
+    assert dict(sent[0]["headers"])[b"content-encoding"] == encoding.encode()
+    decode = new_decoder()
+    for message, event in zip(sent[1:4], events):
+        assert decode(message["body"]) == event
+    assert stats.snapshot()["encodings"][encoding]["streamed"] == 1
@@ -0,0 +1,23 @@
+import asyncio
+
+from app.core.notifications import PgListener
+
+
+def test_listener_keeps_and_cancels_its_background_tasks():
+    listener = PgListener("postgresql://unused")
+    started = asyncio.Event()
+
+    async def _slow(channel, payload):
+        started.set()
+        await asyncio.sleep(3600)
+
+    async def _run():
+        await listener.subscribe("jobs", _slow)
+        listener._dispatch(None, 0, "jobs", "payload")
+        await started.wait()
+        # --- Held by the listener, not just weakly by the loop ---
+        assert len(listener._tasks) == 1
+        await listener.stop()
+        assert not listener._tasks
+
+    asyncio.run(_run())
@@ -0,0 +1,177 @@
+import asyncio
+
+from fastapi import APIRouter, Depends, FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.api.v1.deps import rate_limit
+from app.core.exceptions import register_exception_handlers
+from app.core.rate_limit import (
+    LocalRateLimitBackend,
+    RateLimitHeadersMiddleware,
+    RateLimitRule,
+    rules_for_group,
+    set_rate_limit_backend,
+)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_token_bucket_allows_burst_then_refills():
+    clock = FakeClock()
+    backend = LocalRateLimitBackend(max_keys=10, idle_ttl=60, clock=clock)
+    rule = RateLimitRule(name="minute", limit=60, period=60, burst=3)
+
+    async def _run():
+        results = [await backend.hit("k", rule) for _ in range(4)]
+        clock.now += 1.0  # --- refill rate: 1 token / second ---
+        results.append(await backend.hit("k", rule))
+        return results
+
+    results = asyncio.run(_run())
+    assert [r.allowed for r in results] == [True, True, True, False, True]
+    assert results[3].retry_after == 1.0
+    assert results[3].headers()["Retry-After"] == "1"
+
+
+def test_sliding_window_weights_previous_window():
+    clock = FakeClock()
+    backend = LocalRateLimitBackend(max_keys=10, idle_ttl=60, clock=clock)
+    rule = RateLimitRule(name="quota", limit=10, period=100, algorithm="sliding_window")
+
+    async def _run():
+        first = [await backend.hit("k", rule) for _ in range(10)]
+        denied = await backend.hit("k", rule)
+        clock.now += 150  # --- half way into the next window: previous counts 50% ---
+        second = [await backend.hit("k", rule) for _ in range(6)]
+        return first, denied, second
+
+    first, denied, second = asyncio.run(_run())
+    assert all(r.allowed for r in first) and not denied.allowed
+    assert [r.allowed for r in second] == [True] * 5 + [False]
+
+
+def test_local_backend_is_memory_bounded():
+    clock = FakeClock()
+    backend = LocalRateLimitBackend(max_keys=3, idle_ttl=10, clock=clock)
+    rule = RateLimitRule(name="minute", limit=5, period=5)
+
+    async def _run():
+        for i in range(5):
+            await backend.hit(f"owner-{i}", rule)
+        assert len(backend) == 3
+        clock.now += 11
+        await backend.hit("fresh", rule)
+        assert len(backend) == 1
+
+    asyncio.run(_run())
+
+
+def test_mixed_ttls_still_expire_idle_keys():
+    clock = FakeClock()
+    backend = LocalRateLimitBackend(max_keys=100, idle_ttl=10, clock=clock)
+    daily = RateLimitRule(name="daily", limit=5, period=86_400, algorithm="sliding_window")
+    minute = RateLimitRule(name="minute", limit=5, period=60)
+
+    async def _run():
+        # --- A long-lived key accessed first must not shield short-lived ones behind it ---
+        await backend.hit("daily", daily)
+        for i in range(5):
+            await backend.hit(f"minute-{i}", minute)
+        clock.now += 61
+        await backend.hit("minute-fresh", minute)
+        assert len(backend) == 2
+
+    asyncio.run(_run())
+
+
+def test_generation_quota_only_applies_to_writes():
+    assert rules_for_group("conversations.context", method="POST")[0].name == "generation-daily"
+    assert [r.name for r in rules_for_group("podcasts", method="GET")] == ["minute"]
+    assert [r.name for r in rules_for_group("podcasts", method="POST")] == ["generation-daily", "generation-minute"]
+
+
+def test_dependency_sets_headers_and_returns_error_envelope(monkeypatch):
+    from app.core.config import get_settings
+
+    settings = get_settings()
+    monkeypatch.setattr(settings, "rate_limit_enabled", True)
+    monkeypatch.setattr(settings, "auth_dev_header_enabled", True)
+    monkeypatch.setattr(settings, "rate_limit_per_minute", 60)
+    monkeypatch.setattr(settings, "rate_limit_burst", 2)
+    set_rate_limit_backend(LocalRateLimitBackend(max_keys=100, idle_ttl=60))
+
+    router = APIRouter()
+
+    @router.get("/ping")
+    async def ping() -> dict:
+        return {"ok": True}
+
+    @router.get("/stream")
+    async def stream() -> StreamingResponse:
+        async def _body():
+            yield b"chunk"
+
+        return StreamingResponse(_body(), media_type="text/plain")
+
+    app = FastAPI()
+    app.add_middleware(RateLimitHeadersMiddleware)
+    register_exception_handlers(app)
+    app.include_router(router, dependencies=[Depends(rate_limit("tests"))])
+    client = TestClient(app)
+
+    try:
+        assert client.get("/ping").headers["RateLimit-Remaining"] == "1"
+        # --- Streaming responses get the headers too ---
+        assert client.get("/stream").headers["RateLimit-Remaining"] == "0"
+        # --- Another owner has its own bucket ---
+        assert client.get("/ping", headers={"X-User-Id": "00000000-0000-0000-0000-000000000002"}).status_code == 200
+        limited = client.get("/ping")
+        assert limited.status_code == 429
+        assert limited.headers["Retry-After"] == "1"
+        assert limited.json()["error"]["code"] == "RATE_LIMITED"
+    finally:
+        set_rate_limit_backend(None)
+
+
+def test_rejected_call_does_not_consume_daily_quota(monkeypatch):
+    from app.core.config import get_settings
+
+    settings = get_settings()
+    monkeypatch.setattr(settings, "rate_limit_enabled", True)
+    monkeypatch.setattr(settings, "auth_dev_header_enabled", True)
+    monkeypatch.setattr(settings, "rate_limit_generation_per_minute", 2)
+    monkeypatch.setattr(settings, "rate_limit_generation_daily_quota", 100)
+    backend = LocalRateLimitBackend(max_keys=100, idle_ttl=60)
+    set_rate_limit_backend(backend)
+
+    router = APIRouter()
+
+    @router.post("/generate")
+    async def generate() -> dict:
+        return {"ok": True}
+
+    app = FastAPI()
+    register_exception_handlers(app)
+    app.include_router(router, dependencies=[Depends(rate_limit("quizzes"))])
+    client = TestClient(app)
+
+    try:
+        assert [client.post("/generate").status_code for _ in range(5)] == [200, 200, 429, 429, 429]
+        daily = rules_for_group("quizzes", settings, method="POST")[0]
+        owner = "00000000-0000-0000-0000-000000000001"
+
+        async def _remaining():
+            decision = await backend.hit(f"quizzes:{daily.name}:{owner}", daily)
+            return decision.remaining
+
+        # --- Only the two calls that ran were charged (plus this probe) ---
+        assert asyncio.run(_remaining()) == 100 - 3
+    finally:
+        set_rate_limit_backend(None)
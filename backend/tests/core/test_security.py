@@ -0,0 +1,205 @@
+import json
+import uuid
+
+import pytest
+from fastapi import Depends, FastAPI, WebSocket
+from fastapi.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+
+from app.api.v1.deps import CurrentUser, get_current_user, get_websocket_user, websocket_subprotocol
+from app.core.config import Settings
+from app.core.exceptions import AppException, register_exception_handlers
+from app.core.security import KeyProvider, TokenVerifier, _b64url_encode, issue_token
+
+USER_ID = "00000000-0000-0000-0000-0000000000aa"
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _verifier(clock: FakeClock, **settings) -> TokenVerifier:
+    keys = KeyProvider(Settings(auth_jwt_keys={"k1": "secret-one"}, **settings))
+    return TokenVerifier(keys, algorithms=["HS256"], leeway=0, cache_size=2, clock=clock)
+
+
+def _token(clock: FakeClock, *, key: str = "secret-one", kid: str = "k1", ttl: float = 60, **claims) -> str:
+    return issue_token({"sub": USER_ID, "exp": clock.now + ttl, **claims}, key=key, kid=kid)
+
+
+def test_verify_valid_token_and_cache_hit():
+    clock = FakeClock()
+    verifier = _verifier(clock)
+    token = _token(clock)
+
+    assert verifier.verify(token)["sub"] == USER_ID
+    assert verifier.verify(token)["sub"] == USER_ID
+    assert (verifier.misses, verifier.hits) == (1, 1)
+
+
+@pytest.mark.parametrize(
+    "token_kwargs",
+    [
+        {"key": "wrong-secret"},
+        {"kid": "unknown"},
+        {"ttl": -1},
+    ],
+)
+def test_verify_rejects_bad_tokens(token_kwargs):
+    clock = FakeClock()
+    verifier = _verifier(clock)
+
+    with pytest.raises(AppException) as exc:
+        verifier.verify(_token(clock, **token_kwargs))
+    assert exc.value.status_code == 401
+    assert exc.value.headers == {"WWW-Authenticate": "Bearer"}
+
+
+def test_cached_claims_expire_with_the_token():
+    clock = FakeClock()
+    verifier = _verifier(clock)
+    token = _token(clock, ttl=10)
+    verifier.verify(token)
+
+    clock.now += 11
+    with pytest.raises(AppException):
+        verifier.verify(token)
+
+
+def test_cache_is_bounded():
+    clock = FakeClock()
+    verifier = _verifier(clock)
+    for i in range(5):
+        verifier.verify(_token(clock, jti=str(i)))
+    assert len(verifier._cache) == 2
+
+
+def test_key_rotation_invalidates_cache(tmp_path):
+    keys_file = tmp_path / "keys.json"
+    keys_file.write_text(json.dumps({"k2": "secret-two"}))
+    clock = FakeClock()
+    verifier = _verifier(clock, auth_jwt_keys_file=str(keys_file))
+    token = _token(clock, key="secret-two", kid="k2")
+    verifier.verify(token)
+
+    # --- k2 is retired: the cached claims must not outlive the key ---
+    keys_file.write_text(json.dumps({"k3": "secret-three"}))
+    verifier.keys._mtime = None
+    assert verifier.keys.reload() is True
+    with pytest.raises(AppException):
+        verifier.verify(token)
+    assert verifier.verify(_token(clock, key="secret-three", kid="k3"))["sub"] == USER_ID
+
+
+def test_issuer_and_audience_are_checked():
+    clock = FakeClock()
+    verifier = _verifier(clock)
+    verifier.issuer, verifier.audience = "idp", "api"
+
+    assert verifier.verify(_token(clock, iss="idp", aud=["api", "web"]))["sub"] == USER_ID
+    with pytest.raises(AppException):
+        verifier.verify(_token(clock, iss="other", aud="api"))
+
+
+def test_get_current_user_resolves_bearer_once_per_request(monkeypatch):
+    import app.api.v1.deps as deps
+
+    clock = FakeClock()
+    verifier = _verifier(clock)
+    monkeypatch.setattr(deps, "get_token_verifier", lambda: verifier)
+
+    async def _other(user: CurrentUser = Depends(get_current_user)) -> CurrentUser:
+        return user
+
+    app = FastAPI()
+    register_exception_handlers(app)
+
+    @app.get("/me")
+    async def me(user: CurrentUser = Depends(get_current_user), other: CurrentUser = Depends(_other)) -> dict:
+        return {"id": str(user.id), "same": user is other}
+
+    client = TestClient(app)
+    response = client.get("/me", headers={"Authorization": f"Bearer {_token(clock)}"})
+    assert response.json() == {"id": USER_ID, "same": True}
+    assert verifier.misses == 1
+
+    bad = client.get("/me", headers={"Authorization": "Bearer not.a.token"})
+    assert bad.status_code == 401
+    assert bad.headers["WWW-Authenticate"] == "Bearer"
+    assert bad.json()["error"]["code"] == "UNAUTHORIZED"
+
+
+def test_dev_header_is_ignored_in_prod(monkeypatch):
+    from app.core.config import get_settings
+
+    settings = get_settings()
+    monkeypatch.setattr(settings, "environment", "prod")
+
+    app = FastAPI()
+    register_exception_handlers(app)
+
+    @app.get("/me")
+    async def me(user: CurrentUser = Depends(get_current_user)) -> dict:
+        return {"id": str(user.id)}
+
+    response = TestClient(app).get("/me", headers={"X-User-Id": str(uuid.uuid4())})
+    assert response.status_code == 401
+
+
+def _segment(value) -> str:
+    return _b64url_encode(json.dumps(value).encode())
+
+
+@pytest.mark.parametrize(
+    "token",
+    [
+        # --- kid must be a string: a list is unhashable in the key lookup ---
+        f'{_segment({"alg": "HS256", "kid": ["x"]})}.{_segment({"sub": USER_ID})}.c2ln',
+        # --- Non-ASCII payload segment ---
+        f'{_segment({"alg": "HS256", "kid": "k1"})}.é.c2ln',
+    ],
+)
+def test_malformed_tokens_are_unauthorized_not_errors(token):
+    verifier = _verifier(FakeClock())
+
+    with pytest.raises(AppException) as exc:
+        verifier.verify(token)
+    assert exc.value.status_code == 401
+
+
+def test_dev_header_is_off_by_default():
+    assert Settings().auth_dev_header_enabled is False
+
+
+def test_websocket_user_reads_token_from_subprotocol_or_query(monkeypatch):
+    import app.api.v1.deps as deps
+
+    clock = FakeClock()
+    monkeypatch.setattr(deps, "get_token_verifier", lambda: _verifier(clock))
+
+    app = FastAPI()
+    register_exception_handlers(app)
+
+    @app.websocket("/ws")
+    async def ws(websocket: WebSocket, user: CurrentUser = Depends(get_websocket_user)):
+        await websocket.accept(subprotocol=websocket_subprotocol(websocket))
+        await websocket.send_text(str(user.id))
+        await websocket.close()
+
+    client = TestClient(app)
+    token = _token(clock)
+    with client.websocket_connect("/ws", subprotocols=["bearer", token]) as session:
+        assert session.accepted_subprotocol == "bearer"
+        assert session.receive_text() == USER_ID
+    with client.websocket_connect(f"/ws?access_token={token}") as session:
+        assert session.receive_text() == USER_ID
+
+    for url, protocols in (("/ws", None), ("/ws?access_token=not.a.token", None), ("/ws", ["bearer"])):
+        with pytest.raises(WebSocketDisconnect) as exc:
+            with client.websocket_connect(url, subprotocols=protocols):
+                pass
+        assert exc.value.code == 1008
@@ -0,0 +1,669 @@
+import asyncio
+import json
+import os
+import uuid
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+from sqlalchemy.dialects import postgresql
+
+from app.modules.conversations.context import (
+    ConversationContext,
+    EmptySummaryError,
+    assemble_context,
+    estimate_tokens,
+    part_tokens,
+)
+from app.modules.conversations.feed import ChangeEvent, ConversationFeed, parse_cursor
+from app.modules.conversations.models import Conversation, ConversationStatus, status_is
+from app.modules.conversations.repository import IMPORT_COLUMNS, ConversationsRepository, merge_patch_expr
+from app.modules.conversations.retention import ConversationRetention
+from app.modules.conversations.schemas import (
+    ContextMessage,
+    ConversationContextRequest,
+    ConversationSummaryJob,
+    ConversationUpdate,
+)
+from app.modules.conversations.service import ConversationsService
+from app.modules.conversations.tasks import run_retention
+from app.modules.conversations.transfer import ConversationTransfer, iter_lines
+from app.modules.jobs.registry import PermanentJobError
+
+
+def _sql(stmt) -> str:
+    return str(stmt.compile(dialect=postgresql.dialect()))
+
+
+def test_purge_statement_archives_in_one_statement():
+    cutoff = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    sql = _sql(ConversationsRepository.purge_deleted_stmt(deleted_before=cutoff, batch_size=100))
+
+    assert "FOR UPDATE SKIP LOCKED" in sql
+    assert "DELETE FROM conversations" in sql
+    assert "INSERT INTO conversations_archive" in sql
+    # --- Literal predicate: matches the partial index on deleted rows ---
+    assert "conversations.status = 'deleted'" in sql
+
+    purge = _sql(ConversationsRepository.purge_deleted_stmt(deleted_before=cutoff, batch_size=100, archive=False))
+    assert "conversations_archive" not in purge
+
+
+class FakeRepo:
+    def __init__(self, pending: int) -> None:
+        self.pending = pending
+        self.calls = []
+
+    async def purge_deleted_batch(self, db, *, deleted_before, batch_size, archive):
+        self.calls.append((deleted_before, batch_size, archive))
+        rows = min(self.pending, batch_size)
+        self.pending -= rows
+        return rows
+
+
+@asynccontextmanager
+async def _session():
+    yield object()
+
+
+def test_retention_drains_in_batches_and_reports():
+    repo = FakeRepo(pending=250)
+    seen = []
+
+    async def _on_batch(batch):
+        seen.append(batch.rows)
+
+    now = datetime(2026, 10, 19, tzinfo=timezone.utc)
+    report = asyncio.run(
+        ConversationRetention(repo, session_factory=_session).run(
+            older_than=timedelta(days=30),
+            mode="purge",
+            batch_size=100,
+            pause_seconds=0,
+            now=now,
+            on_batch=_on_batch,
+        )
+    )
+
+    assert seen == [100, 100, 50]
+    assert report.total_rows == 250
+    assert report.as_dict()["batches"] == 3
+    assert all(call == (now - timedelta(days=30), 100, False) for call in repo.calls)
+
+
+def test_retention_respects_max_batches():
+    repo = FakeRepo(pending=1_000)
+    report = asyncio.run(
+        ConversationRetention(repo, session_factory=_session).run(
+            batch_size=10,
+            max_batches=3,
+            pause_seconds=0,
+        )
+    )
+    assert report.total_rows == 30
+    assert repo.pending == 970
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [{"mode": "purgee"}, {"older_than_days": -1}, {"batch_size": 0}, {"older_than": 30}],
+)
+def test_retention_job_rejects_bad_payloads(payload):
+    with pytest.raises(PermanentJobError):
+        asyncio.run(run_retention(None, payload))
+
+
+def test_retention_only_purges_on_an_explicit_purge():
+    repo = FakeRepo(pending=0)
+    retention = ConversationRetention(repo, session_factory=_session)
+
+    asyncio.run(retention.run(mode="archive", pause_seconds=0))
+    assert repo.calls[-1][2] is True
+    with pytest.raises(ValueError):
+        asyncio.run(retention.run(mode="purgee", pause_seconds=0))
+    with pytest.raises(ValueError):
+        asyncio.run(retention.run(older_than=timedelta(days=-1), pause_seconds=0))
+    assert len(repo.calls) == 1
+
+def test_merge_patch_expression_follows_rfc7396():
+    expr = merge_patch_expr(Conversation.metadata_, {"drop": None, "tags": ["a"], "ui": {"theme": None}})
+    sql = _sql(expr)
+
+    # --- null removes, arrays/scalars replace, objects merge recursively into the existing value ---
+    assert sql.count(" - CAST(ARRAY[") == 2
+    assert sql.count("::JSONB") == 1
+    assert "jsonb_build_object(" in sql
+    assert "conversations.metadata -> " in sql
+    assert "ELSE '{}'::jsonb" in sql
+
+
+class CapturingSession:
+    def __init__(self):
+        self.sql = None
+
+    async def execute(self, stmt):
+        self.sql = _sql(stmt)
+        return SimpleNamespace(scalar_one_or_none=lambda: None)
+
+
+def test_merge_metadata_is_one_guarded_update():
+    db = CapturingSession()
+    result = asyncio.run(
+        ConversationsRepository().merge_metadata(
+            db, owner_id=uuid.uuid4(), conversation_id=uuid.uuid4(), patch={"k": 1}, max_bytes=1024
+        )
+    )
+    assert result is None
+    assert db.sql.startswith("UPDATE conversations SET metadata=")
+    assert "octet_length(CAST(" in db.sql
+    assert "conversations.status != 'deleted'" in db.sql
+    assert "RETURNING" in db.sql
+
+
+def test_metadata_replacement_is_bounded_like_a_merge(monkeypatch):
+    from app.core.config import get_settings
+
+    monkeypatch.setattr(get_settings(), "conversation_metadata_max_bytes", 16)
+    service = ConversationsService(repo=SimpleNamespace(), projects=SimpleNamespace())
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(
+            service.update_conversation(
+                None,
+                owner_id=uuid.uuid4(),
+                conversation_id=uuid.uuid4(),
+                payload=ConversationUpdate(metadata={"note": "é" * 8}),
+            )
+        )
+    assert exc.value.status_code == 413
+
+
+@pytest.mark.skipif("TEST_DATABASE_URL" not in os.environ, reason="needs a local Postgres (TEST_DATABASE_URL)")
+def test_merge_metadata_patches_nested_objects_against_postgres():
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    from app.modules.projects.models import Project
+
+    async def _run():
+        engine = create_async_engine(os.environ["TEST_DATABASE_URL"])
+        async with engine.begin() as conn:
+            await conn.run_sync(Conversation.__table__.drop, checkfirst=True)
+            await conn.run_sync(Project.__table__.create, checkfirst=True)
+            await conn.run_sync(Conversation.__table__.create)
+        maker = async_sessionmaker(engine, expire_on_commit=False)
+        repo = ConversationsRepository()
+        owner = uuid.uuid4()
+        async with maker() as db:
+            conv = await repo.create(
+                db,
+                owner_id=owner,
+                title=None,
+                metadata={"ui": {"theme": "dark", "font": 12}, "tags": ["a"], "drop": 1},
+            )
+
+        async def _merge(patch):
+            async with maker() as db:
+                merged = await repo.merge_metadata(db, owner_id=owner, conversation_id=conv.id, patch=patch)
+                await db.commit()
+                return merged
+
+        # --- Concurrent patches to sibling keys serialize on the row: neither is lost ---
+        await asyncio.gather(
+            _merge({"ui": {"theme": None, "lang": "ar"}, "drop": None}),
+            _merge({"ui": {"font": 14}, "tags": ["b"]}),
+        )
+        async with maker() as db:
+            row = await repo.get_by_id(db, owner_id=owner, conversation_id=conv.id)
+            assert row.metadata_ == {"ui": {"font": 14, "lang": "ar"}, "tags": ["b"]}
+            # --- Over the bound: nothing is written ---
+            assert await repo.merge_metadata(
+                db, owner_id=owner, conversation_id=conv.id, patch={"big": "x" * 100}, max_bytes=64
+            ) is None
+        await engine.dispose()
+
+    asyncio.run(_run())
+
+
+def test_export_renders_json_lines_in_postgres():
+    sql = _sql(ConversationsRepository.export_stmt(owner_id=uuid.uuid4()))
+    assert sql.startswith("SELECT CAST(json_build_object(")
+    assert "conversations.status != 'deleted'" in sql
+    assert sql.endswith("ORDER BY conversations.created_at, conversations.id")
+
+
+async def _chunks(*parts):
+    for part in parts:
+        yield part
+
+
+def test_iter_lines_rejoins_split_chunks():
+    async def _collect():
+        return [line async for line in iter_lines(_chunks(b'{"a"', b': 1}\n{"b": 2}\n', b'{"c": 3}'))]
+
+    assert asyncio.run(_collect()) == [b'{"a": 1}', b'{"b": 2}', b'{"c": 3}']
+
+
+def test_iter_lines_cuts_oversize_lines_without_buffering_them():
+    async def _collect():
+        parts = (b"x" * 6, b"x" * 6, b"x\nok\n", b"y" * 20)
+        return [line async for line in iter_lines(_chunks(*parts), max_line_bytes=4)]
+
+    assert asyncio.run(_collect()) == [b"xxxxx", b"ok", b"yyyyy"]
+
+
+class FakeImportRepo:
+    def __init__(self):
+        self.staged = []
+
+    async def stage_import_rows(self, db, *, records):
+        self.staged.append(list(records))
+
+    async def merge_staged(self, db, *, owner_id):
+        batch = self.staged[-1]
+        # --- Pretend the first row of every batch belongs to another owner ---
+        return len(batch) - 1, 0, []
+
+
+class FakeProjectsRepo:
+    async def refresh_stats(self, db, *, project_ids):
+        pass
+
+
+@asynccontextmanager
+async def _committing_session():
+    async def _commit():
+        pass
+
+    async def _execute(stmt):
+        _executed.append(stmt)
+
+    yield SimpleNamespace(commit=_commit, execute=_execute)
+
+
+_executed: list = []
+
+
+def test_import_validates_dedupes_and_batches():
+    repo = FakeImportRepo()
+    transfer = ConversationTransfer(repo, FakeProjectsRepo(), session_factory=_committing_session)
+    dup = str(uuid.uuid4())
+    lines = [
+        f'{{"id": "{dup}", "title": "first"}}',
+        f'{{"id": "{dup}", "title": "  second  ", "metadata": {{"k": 1}}}}',
+        '{"title": "' + "x" * 300 + '"}',
+        "not json",
+        "",
+        '{"status": "archived", "created_at": "2026-01-01T00:00:00"}',
+        '{"title": "fourth"}',
+    ]
+
+    async def _lines():
+        for line in lines:
+            yield line.encode()
+
+    report = asyncio.run(transfer.import_ndjson(owner_id=uuid.uuid4(), lines=_lines(), batch_size=2))
+
+    assert (report.received, report.invalid, report.batches) == (6, 2, 2)
+    assert [error.line for error in report.errors] == [3, 4]
+    assert "title" in report.errors[0].message
+    # --- Duplicate id within a batch: last one wins ---
+    first = dict(zip(IMPORT_COLUMNS, repo.staged[0][0]))
+    assert (first["title"], first["metadata"]) == ("second", '{"k": 1}')
+    archived = dict(zip(IMPORT_COLUMNS, repo.staged[0][1]))
+    assert archived["status"] == "archived"
+    assert archived["created_at"].tzinfo is not None
+    assert (report.inserted, report.skipped) == (1, 2)
+
+
+def test_import_rejects_oversize_lines_and_resets_the_feed(monkeypatch):
+    from app.core.config import get_settings
+
+    monkeypatch.setattr(get_settings(), "conversation_import_max_line_bytes", 32)
+    _executed.clear()
+    transfer = ConversationTransfer(FakeImportRepo(), FakeProjectsRepo(), session_factory=_committing_session)
+
+    async def _lines():
+        yield b'{"title": "' + b"x" * 64 + b'"}\n'
+        yield b'{"title": "a"}\n{"title": "b"}\n'
+
+    report = asyncio.run(transfer.import_ndjson(owner_id=uuid.uuid4(), lines=iter_lines(_lines())))
+
+    assert (report.invalid, report.inserted) == (1, 1)
+    assert "longer than 32 bytes" in report.errors[0].message
+    # --- One reset notification for the batch, not one event per row ---
+    notify = [_sql(stmt) for stmt in _executed]
+    assert len(notify) == 1 and "pg_notify" in notify[0]
+
+
+class FakeListener:
+    def __init__(self):
+        self.callbacks = {}
+        self.started = 0
+
+    async def subscribe(self, channel, callback):
+        self.callbacks[channel] = callback
+
+    async def unsubscribe(self, channel, callback):
+        self.callbacks.pop(channel, None)
+
+    async def start(self):
+        self.started += 1
+
+    async def stop(self):
+        pass
+
+
+class FakeChangesRepo:
+    def __init__(self, rows):
+        self.rows = rows
+        self.since = None
+
+    async def changes_since(self, db, *, owner_id, updated_at, conversation_id, limit):
+        self.since = (updated_at, conversation_id)
+        return self.rows[: limit + 1]
+
+
+def _event(owner_id, seconds, status=ConversationStatus.active):
+    return ChangeEvent(
+        id=uuid.uuid4(),
+        owner_id=owner_id,
+        status=status,
+        updated_at=datetime(2026, 10, 19, 12, 0, seconds, tzinfo=timezone.utc),
+    )
+
+
+def test_cursor_round_trip():
+    event = _event(uuid.uuid4(), 5)
+    assert parse_cursor(event.cursor) == (event.updated_at, event.id)
+    payload = '{"id": "%s", "owner_id": "%s", "status": "deleted", "updated_at": "2026-10-19T12:00:05+00:00"}' % (
+        event.id,
+        event.owner_id,
+    )
+    assert ChangeEvent.from_payload(payload).status is ConversationStatus.deleted
+
+
+def test_feed_replays_from_cursor_then_streams_live_events_once():
+    owner = uuid.uuid4()
+    missed = _event(owner, 2)
+    live = _event(owner, 3)
+    listener = FakeListener()
+    feed = ConversationFeed(
+        FakeChangesRepo([(missed.id, missed.status, missed.updated_at)]),
+        session_factory=_session,
+        listener=listener,
+    )
+
+    async def _run():
+        stream = feed.stream(owner_id=owner, cursor=_event(owner, 1).cursor)
+        chunks = [await anext(stream)]
+        # --- The replayed change also arrives live (committed during catch-up): sent once ---
+        feed.dispatch(missed)
+        feed.dispatch(live)
+        feed.dispatch(_event(uuid.uuid4(), 4))  # --- another owner ---
+        chunks += [await anext(stream), await anext(stream)]
+        assert feed.subscriber_count == 1
+        await stream.aclose()
+        assert feed.subscriber_count == 0
+        return chunks
+
+    chunks = asyncio.run(_run())
+    assert chunks[0].startswith(b"retry:")
+    assert chunks[1].startswith(f"id: {missed.cursor}\nevent: change".encode())
+    assert chunks[2].startswith(f"id: {live.cursor}\n".encode())
+    assert listener.started == 1
+
+
+def test_feed_polls_when_listen_is_unavailable(monkeypatch):
+    from app.core.config import get_settings
+
+    monkeypatch.setattr(get_settings(), "conversation_feed_poll_seconds", 0)
+    owner = uuid.uuid4()
+    changed = _event(owner, 2)
+    listener = FakeListener()
+
+    async def _refuse():
+        raise OSError("connection refused")
+
+    listener.start = _refuse
+    repo = FakeChangesRepo([(changed.id, changed.status, changed.updated_at)])
+    feed = ConversationFeed(repo, session_factory=_session, listener=listener)
+
+    async def _run():
+        stream = feed.stream(owner_id=owner, cursor=_event(owner, 1).cursor)
+        chunks = [await anext(stream) for _ in range(4)]
+        # --- Polling streams take no live events ---
+        assert feed.subscriber_count == 0
+        await stream.aclose()
+        return chunks
+
+    chunks = asyncio.run(_run())
+    assert chunks[0].startswith(b"retry:")
+    assert chunks[1].startswith(f"id: {changed.cursor}\n".encode())
+    # --- Re-polls overlap what was sent and drop it ---
+    assert chunks[2:] == [b": keepalive\n\n", b": keepalive\n\n"]
+    assert len(listener.callbacks) == 1
+
+
+def test_lagging_subscriber_gets_reset(monkeypatch):
+    from app.core.config import get_settings
+
+    monkeypatch.setattr(get_settings(), "conversation_feed_queue_size", 2)
+    owner = uuid.uuid4()
+    feed = ConversationFeed(FakeChangesRepo([]), session_factory=_session, listener=FakeListener())
+
+    async def _run():
+        stream = feed.stream(owner_id=owner)
+        await anext(stream)
+        for second in range(5):
+            feed.dispatch(_event(owner, second))
+        # --- Queued events are abandoned: the client resumes from its last cursor instead ---
+        chunks = [chunk async for chunk in stream]
+        return chunks
+
+    chunks = asyncio.run(_run())
+    assert chunks == [b'event: reset\ndata: {"reason": "lagging"}\n\n']
+    assert feed.subscriber_count == 0
+
+
+def test_reset_notification_ends_the_owners_streams():
+    owner = uuid.uuid4()
+    feed = ConversationFeed(FakeChangesRepo([]), session_factory=_session, listener=FakeListener())
+
+    async def _run():
+        stream = feed.stream(owner_id=owner)
+        await anext(stream)
+        feed._on_notify("conversation_changes", json.dumps({"owner_id": str(owner), "reset": "import"}))
+        return [chunk async for chunk in stream]
+
+    assert asyncio.run(_run()) == [b'event: reset\ndata: {"reason": "import"}\n\n']
+    assert feed.subscriber_count == 0
+
+
+def _turns(count, words=50):
+    return [
+        ContextMessage(role="user" if i % 2 == 0 else "model", content=f"turn {i} " + "word " * words)
+        for i in range(count)
+    ]
+
+
+def test_token_estimate_is_denser_for_non_latin_scripts():
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("a" * 400) == 100
+    assert estimate_tokens("م" * 400) == 200
+
+
+def test_short_history_is_sent_whole():
+    messages = _turns(4)
+    context = assemble_context(messages=messages, snippets=["fact"], budget=8_000, snippet_share=0.3)
+    assert (context.messages, context.snippets, context.summary) == (messages, ["fact"], None)
+    assert context.saved_tokens == 0
+
+
+def test_long_history_is_compacted_within_budget():
+    messages = _turns(60)
+    per_turn = part_tokens(messages[-1].content)
+    snippets = ["s" * 4_000, "relevant " * 40, "also relevant " * 20]
+    context = assemble_context(
+        messages=messages,
+        snippets=snippets,
+        summary="Earlier: the user is studying thermodynamics.",
+        summarized_count=40,
+        budget=30 * per_turn,
+        snippet_share=0.2,
+    )
+
+    assert context.prompt_tokens <= 30 * per_turn
+    assert context.summary is not None
+    # --- Oversized top snippet is skipped, smaller ones still fit ---
+    assert context.snippets == snippets[1:]
+    # --- Turns already in the summary are never repeated; the newest are contiguous ---
+    assert context.messages == messages[-len(context.messages):]
+    assert len(messages) - len(context.messages) == context.summarized_count + context.dropped_messages
+    assert context.saved_tokens == context.full_tokens - context.prompt_tokens > 0
+
+
+def test_summary_claim_is_a_guarded_upsert():
+    sql = _sql(ConversationsRepository.request_summary_stmt(conversation_id=uuid.uuid4(), through=30, every=20))
+    assert sql.startswith("INSERT INTO conversation_summaries")
+    assert "ON CONFLICT (conversation_id) DO UPDATE" in sql
+    assert "WHERE conversation_summaries.requested_count + " in sql
+    assert sql.endswith("<= excluded.requested_count RETURNING conversation_summaries.summarized_count")
+
+
+class FakeSummaryRepo:
+    def __init__(self, summarized_count=0):
+        self.row = SimpleNamespace(summary="old", summarized_count=summarized_count)
+        self.claims = []
+        self.applied = []
+
+    async def get_summary(self, db, *, conversation_id):
+        return self.row
+
+    async def request_summary(self, db, *, conversation_id, through, every):
+        self.claims.append(through)
+        return self.row.summarized_count
+
+    async def apply_summary(self, db, *, conversation_id, base_count, summarized_count, summary, summary_tokens):
+        self.applied.append((base_count, summarized_count, summary))
+        return True
+
+
+class FakeJobs:
+    def __init__(self):
+        self.payloads = []
+
+    async def enqueue_job(self, db, *, kind, owner_id, payload):
+        self.payloads.append(payload)
+        return SimpleNamespace(id=uuid.uuid4())
+
+
+def test_summary_job_carries_only_unsummarized_turns(monkeypatch):
+    from app.core.config import get_settings
+
+    monkeypatch.setattr(get_settings(), "conversation_summary_every_messages", 10)
+    monkeypatch.setattr(get_settings(), "conversation_summary_keep_recent", 4)
+    repo, jobs = FakeSummaryRepo(summarized_count=6), FakeJobs()
+    context = ConversationContext(repo, conversations=object(), jobs=jobs, session_factory=_session)
+    messages = _turns(19, words=1)
+
+    async def _schedule(count):
+        return await context.schedule_summary(
+            object(), owner_id=uuid.uuid4(), conversation_id=uuid.uuid4(), messages=messages[:count]
+        )
+
+    assert asyncio.run(_schedule(13)) is None  # --- 9 turns outside the recent window ---
+    assert asyncio.run(_schedule(19)) is not None
+    job = ConversationSummaryJob.model_validate(jobs.payloads[0])
+    assert job.base_count == 6
+    assert [m.content for m in job.messages] == [m.content for m in messages[6:15]]
+
+
+class FakeSummarizer:
+    def __init__(self):
+        self.calls = []
+
+    async def summarize(self, *, summary, messages, max_tokens):
+        self.calls.append((summary, len(messages)))
+        return f"{summary} + {len(messages)} turns"
+
+
+def test_refresh_summary_folds_new_turns_and_drops_stale_jobs():
+    repo, summarizer = FakeSummaryRepo(summarized_count=6), FakeSummarizer()
+    context = ConversationContext(repo, conversations=object(), jobs=object(), session_factory=_session)
+    conversation_id = uuid.uuid4()
+
+    fresh = ConversationSummaryJob(conversation_id=conversation_id, base_count=6, messages=_turns(9, words=1))
+    assert asyncio.run(context.refresh_summary(fresh, summarizer)) is True
+    assert repo.applied == [(6, 15, "old + 9 turns")]
+
+    stale = ConversationSummaryJob(conversation_id=conversation_id, base_count=0, messages=_turns(6, words=1))
+    assert asyncio.run(context.refresh_summary(stale, summarizer)) is False
+    assert summarizer.calls == [("old", 9)]
+
+
+def test_empty_model_reply_is_retried_not_dropped():
+    class EmptySummarizer:
+        async def summarize(self, *, summary, messages, max_tokens):
+            return "  "
+
+    repo = FakeSummaryRepo(summarized_count=0)
+    context = ConversationContext(repo, conversations=object(), jobs=object(), session_factory=_session)
+    job = ConversationSummaryJob(conversation_id=uuid.uuid4(), base_count=0, messages=_turns(3, words=1))
+
+    with pytest.raises(EmptySummaryError):
+        asyncio.run(context.refresh_summary(job, EmptySummarizer()))
+    assert repo.applied == []
+
+
+def test_context_request_is_bounded(monkeypatch):
+    from pydantic import ValidationError
+
+    from app.core.config import get_settings
+
+    monkeypatch.setattr(get_settings(), "conversation_context_max_messages", 3)
+    monkeypatch.setattr(get_settings(), "conversation_context_max_chars", 10)
+    turn = {"role": "user", "content": "hi"}
+
+    assert len(ConversationContextRequest(messages=[turn] * 3).messages) == 3
+    for payload in (
+        {"messages": [turn] * 4},
+        {"messages": [{"role": "user", "content": "x" * 11}]},
+        {"messages": [turn], "snippets": ["x" * 11]},
+    ):
+        with pytest.raises(ValidationError):
+            ConversationContextRequest.model_validate(payload)
+
+
+def test_replay_overlaps_the_cursor_for_late_commits(monkeypatch):
+    from app.core.config import get_settings
+
+    monkeypatch.setattr(get_settings(), "conversation_feed_replay_overlap_seconds", 5.0)
+    owner = uuid.uuid4()
+    cursor = _event(owner, 30)
+    repo = FakeChangesRepo([])
+    feed = ConversationFeed(repo, session_factory=_session, listener=FakeListener())
+
+    async def _run():
+        stream = feed.stream(owner_id=owner, cursor=cursor.cursor)
+        await anext(stream)
+        feed.dispatch(_event(owner, 31))
+        await anext(stream)
+        await stream.aclose()
+
+    asyncio.run(_run())
+    # --- A write stamped before the cursor but committed after it is still replayed ---
+    assert repo.since == (cursor.updated_at - timedelta(seconds=5), uuid.UUID(int=0))
+
+
+def test_soft_delete_uses_the_database_clock():
+    conversation = Conversation(owner_id=uuid.uuid4())
+    conversation.soft_delete()
+    assert "now()" in _sql(conversation.deleted_at)
+
+
+def test_status_filters_are_literal_so_partial_indexes_apply():
+    archived = _sql(status_is(ConversationStatus.archived))
+    assert archived == "conversations.status != 'deleted' AND conversations.status = 'archived'"
+    assert _sql(status_is(ConversationStatus.deleted)) == "conversations.status = 'deleted'"
@@ -0,0 +1,167 @@
+import asyncio
+import os
+import uuid
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+import pytest
+
+from app.modules.jobs.models import JobStatus
+from app.modules.jobs.registry import PermanentJobError, job_handler
+from app.modules.jobs.worker import JobWorker, compute_backoff
+
+
+@asynccontextmanager
+async def _no_session():
+    yield None
+
+
+class FakeJobsRepository:
+    def __init__(self, jobs):
+        self.pending = list(jobs)
+        self.completed: dict[uuid.UUID, dict | None] = {}
+        self.failed: dict[uuid.UUID, tuple[str, bool]] = {}
+        self.progress: list[float] = []
+
+    async def fail_exhausted(self, db):
+        return 0
+
+    async def claim(self, db, *, worker_id, limit, visibility_timeout, kinds=None):
+        claimed = [j for j in self.pending if j.kind in kinds][:limit]
+        for job in claimed:
+            self.pending.remove(job)
+            job.attempts += 1
+        return claimed
+
+    async def heartbeat(self, db, *, job_id, worker_id, visibility_timeout, progress=None, progress_message=None):
+        if progress is not None:
+            self.progress.append(progress)
+        return True
+
+    async def complete(self, db, *, job_id, worker_id, result):
+        self.completed[job_id] = result
+        return True
+
+    async def fail(self, db, *, job, worker_id, error, retry_delay):
+        self.failed[job.id] = (error, retry_delay is not None)
+        return JobStatus.queued if retry_delay is not None else JobStatus.failed
+
+
+def _job(kind: str, payload: dict | None = None):
+    return SimpleNamespace(id=uuid.uuid4(), kind=kind, payload=payload or {}, attempts=0, max_attempts=3, owner_id=None)
+
+
+@job_handler("tests.echo")
+async def _echo(ctx, payload):
+    await ctx.report_progress(0.5, "halfway")
+    return {"echo": payload["value"]}
+
+
+@job_handler("tests.boom")
+async def _boom(ctx, payload):
+    if payload.get("permanent"):
+        raise PermanentJobError("bad payload")
+    raise RuntimeError("transient")
+
+
+def test_compute_backoff_is_exponential_and_capped():
+    assert compute_backoff(1, base=2, cap=100, jitter=False) == 2
+    assert compute_backoff(3, base=2, cap=100, jitter=False) == 8
+    assert compute_backoff(10, base=2, cap=100, jitter=False) == 100
+    assert 1 <= compute_backoff(1, base=2, cap=100) <= 2
+
+
+def test_worker_runs_handlers_and_records_outcomes():
+    ok, transient, permanent = _job("tests.echo", {"value": 42}), _job("tests.boom"), _job("tests.boom", {"permanent": True})
+    repo = FakeJobsRepository([ok, transient, permanent])
+
+    async def _run():
+        worker = JobWorker(
+            session_maker=_no_session,
+            repo=repo,
+            concurrency=2,
+            kinds=["tests.echo", "tests.boom"],
+            use_listen=False,
+        )
+        assert await worker.run_once() == 2  # --- bounded by concurrency ---
+        await asyncio.gather(*worker._tasks)
+        assert await worker.run_once() == 1
+        await asyncio.gather(*worker._tasks)
+
+    asyncio.run(_run())
+
+    assert repo.completed == {ok.id: {"echo": 42}}
+    assert repo.progress == [0.5]
+    assert repo.failed[transient.id] == ("RuntimeError: transient", True)
+    assert repo.failed[permanent.id] == ("bad payload", False)
+
+
+@pytest.mark.skipif("TEST_DATABASE_URL" not in os.environ, reason="needs a local Postgres (TEST_DATABASE_URL)")
+def test_claim_skips_locked_rows_against_postgres():
+    from datetime import timedelta
+
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    from app.modules.jobs.models import Job
+    from app.modules.jobs.repository import JobsRepository
+
+    async def _run():
+        engine = create_async_engine(os.environ["TEST_DATABASE_URL"])
+        async with engine.begin() as conn:
+            await conn.run_sync(Job.__table__.drop, checkfirst=True)
+            await conn.run_sync(Job.__table__.create)
+        maker = async_sessionmaker(engine, expire_on_commit=False)
+        repo = JobsRepository()
+        async with maker() as db:
+            for i in range(4):
+                await repo.enqueue(db, kind="tests.echo", payload={"i": i}, owner_id=None, max_attempts=3)
+
+        async def _claim(worker_id):
+            async with maker() as db:
+                return await repo.claim(db, worker_id=worker_id, limit=3, visibility_timeout=timedelta(seconds=30))
+
+        first, second = await asyncio.gather(_claim("a"), _claim("b"))
+        ids = [j.id for j in first] + [j.id for j in second]
+        assert len(ids) == 4 and len(set(ids)) == 4
+        await engine.dispose()
+
+    asyncio.run(_run())
+
+
+@pytest.mark.skipif("TEST_DATABASE_URL" not in os.environ, reason="needs a local Postgres (TEST_DATABASE_URL)")
+def test_enqueue_with_dedupe_key_reuses_the_in_flight_job_against_postgres():
+    from sqlalchemy import update
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    from app.modules.jobs.models import Job
+    from app.modules.jobs.repository import JobsRepository
+
+    async def _run():
+        engine = create_async_engine(os.environ["TEST_DATABASE_URL"])
+        async with engine.begin() as conn:
+            await conn.run_sync(Job.__table__.drop, checkfirst=True)
+            await conn.run_sync(Job.__table__.create)
+        maker = async_sessionmaker(engine, expire_on_commit=False)
+        repo = JobsRepository()
+
+        async def _enqueue(owner_id):
+            async with maker() as db:
+                return await repo.enqueue(
+                    db, kind="tests.echo", payload={}, owner_id=owner_id, max_attempts=3, dedupe_key="k"
+                )
+
+        jobs = await asyncio.gather(*(_enqueue(uuid.uuid4()) for _ in range(5)))
+        assert len({j.id for j in jobs}) == 1
+        async with maker() as db:
+            # --- Visible to a caller that did not create it ---
+            assert await repo.get_by_id(db, job_id=jobs[0].id, owner_id=uuid.uuid4()) is not None
+            await db.execute(update(Job).values(status=JobStatus.succeeded))
+            await db.commit()
+        assert (await _enqueue(None)).id != jobs[0].id
+        await engine.dispose()
+
+    asyncio.run(_run())
+
+def test_empty_kinds_filter_means_all_registered_kinds():
+    worker = JobWorker(session_maker=_no_session, repo=FakeJobsRepository([]), kinds=[], use_listen=False)
+    assert "tests.echo" in worker.kinds
@@ -0,0 +1,64 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+from app.modules.podcasts.pipeline import split_script, synthesize_segments
+from app.modules.podcasts.service import PodcastsService
+from app.modules.podcasts.tts import FakeTTS
+from app.services.storage import LocalStorage
+
+
+def test_split_script_keeps_first_segment_short_and_respects_limits():
+    sentence = "This sentence is exactly fifty characters long ok. "
+    script = (sentence * 10).strip() + "\n\n" + (sentence * 3).strip()
+
+    segments = split_script(script, max_chars=160, first_max_chars=60)
+
+    assert len(segments[0]) <= 60
+    assert all(len(s) <= 160 for s in segments)
+    assert " ".join(segments).split() == script.split()
+
+
+def test_pipeline_uploads_segments_and_reports_first_audio_early(tmp_path):
+    storage = LocalStorage(tmp_path)
+    tts = FakeTTS(base_latency=0.02)
+    segments = [(i, f"Segment number {i}.") for i in range(8)]
+    ready: list[int] = []
+
+    async def _on_ready(position, key, audio):
+        assert await storage.exists(key)
+        ready.append(position)
+
+    stats = asyncio.run(
+        synthesize_segments(
+            segments,
+            tts=tts,
+            storage=storage,
+            key_prefix="podcasts/test",
+            concurrency=2,
+            on_segment_ready=_on_ready,
+        )
+    )
+
+    assert sorted(ready) == list(range(8))
+    assert tts.calls == 8
+    # --- 8 segments at 2-way concurrency take ~4 rounds; segment 0 is ready after ~1 ---
+    assert stats.time_to_first_audio < stats.total_seconds / 2
+    assert (tmp_path / "podcasts/test/00000.wav").read_bytes()[:4] == b"RIFF"
+
+
+def test_segment_audio_is_opened_before_the_response_starts(tmp_path):
+    storage = LocalStorage(tmp_path)
+    service = PodcastsService(repo=object(), jobs=object())
+
+    async def _run():
+        await storage.put_bytes("podcasts/p/0.wav", b"RIFF" + b"\0" * 10)
+        body = await service.open_segment_audio(SimpleNamespace(object_key="podcasts/p/0.wav"), storage)
+        return b"".join([chunk async for chunk in body])
+
+    assert asyncio.run(_run()) == b"RIFF" + b"\0" * 10
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(service.open_segment_audio(SimpleNamespace(object_key="podcasts/p/gone.wav"), storage))
+    assert exc.value.status_code == 404
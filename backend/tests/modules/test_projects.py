@@ -0,0 +1,86 @@
+import asyncio
+import uuid
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+from sqlalchemy.dialects import postgresql
+
+from app.modules.projects.repository import ProjectsRepository
+from app.modules.projects.service import ProjectsService, membership_deltas
+
+
+class RecordingSession:
+    """
+        Counts statements; returns canned rows for the three dashboard queries.
+    """
+
+    def __init__(self, projects):
+        self.projects = projects
+        self.statements = []
+
+    async def execute(self, stmt):
+        self.statements.append(stmt)
+        sql = str(stmt.compile(dialect=postgresql.dialect()))
+        if sql.startswith("SELECT count(*)"):
+            return SimpleNamespace(scalar_one=lambda: len(self.projects))
+        if "row_number()" in sql:
+            now = datetime.now(timezone.utc)
+            rows = [
+                SimpleNamespace(project_id=p.id, id=uuid.uuid4(), title=f"chat {i}", updated_at=now)
+                for p in self.projects
+                for i in range(2)
+            ]
+            return SimpleNamespace(all=lambda: rows)
+        return SimpleNamespace(all=lambda: [(p, None) for p in self.projects])
+
+
+def _project():
+    now = datetime.now(timezone.utc)
+    return SimpleNamespace(
+        id=uuid.uuid4(),
+        owner_id=uuid.uuid4(),
+        name="Biology",
+        description=None,
+        created_at=now,
+        updated_at=now,
+    )
+
+
+def test_membership_deltas():
+    a, b = uuid.uuid4(), uuid.uuid4()
+    assert membership_deltas(None, a) == {a: 1}
+    assert membership_deltas(a, b) == {a: -1, b: 1}
+    assert membership_deltas(a, a) == {a: 0}
+    assert membership_deltas(a, None) == {a: -1}
+
+
+def test_dashboard_query_count_is_constant():
+    service = ProjectsService()
+    for count in (1, 25):
+        db = RecordingSession([_project() for _ in range(count)])
+        items, total = asyncio.run(
+            service.get_dashboard(db, owner_id=uuid.uuid4(), page=1, limit=50, recent=3)
+        )
+        assert total == count and len(items) == count
+        assert all(len(item.recent_conversations) == 2 for item in items)
+        assert len(db.statements) == 3
+
+
+def test_recent_conversations_uses_single_windowed_query():
+    sql = str(
+        ProjectsRepository.recent_conversations_stmt([uuid.uuid4(), uuid.uuid4()], 3).compile(
+            dialect=postgresql.dialect()
+        )
+    )
+    assert "row_number() OVER (PARTITION BY conversations.project_id" in sql
+    assert "conversations.project_id IN" in sql
+
+
+def test_refresh_stats_leaves_the_commit_to_the_caller():
+    session = RecordingSession([])
+    asyncio.run(ProjectsRepository().refresh_stats(session, project_ids=[uuid.uuid4()]))
+
+    # --- RecordingSession has no commit(): calling it would raise ---
+    assert len(session.statements) == 1
+    sql = str(session.statements[0].compile(dialect=postgresql.dialect()))
+    assert sql.startswith("UPDATE project_stats SET conversations_count=")
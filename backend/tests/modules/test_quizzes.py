@@ -0,0 +1,168 @@
+import asyncio
+import uuid
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+from app.modules.quizzes.generation import (
+    QuestionDeduplicator,
+    allocate_questions,
+    generate_question_pool,
+    normalize_question_text,
+    source_fingerprint,
+)
+from app.modules.quizzes.models import QuizDifficulty
+from app.modules.quizzes.schemas import QuizGenerateRequest, QuizOut, QuizQuestion
+from app.modules.quizzes.service import GENERATE_JOB_KIND, QuizzesService
+
+
+def _q(text: str) -> QuizQuestion:
+    return QuizQuestion(question=text, options=["a", "b", "c", "d"], answer_index=0)
+
+
+class FakeGenerator:
+    """
+        Returns `count` questions per call, repeating a duplicate in every batch.
+    """
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def generate(self, *, chunk, difficulty, count, avoid):
+        self.calls += 1
+        call = self.calls
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        batch = [_q(f"Question {call}-{i} about {chunk} with id {call * 100 + i}?") for i in range(count)]
+        return batch + [_q("What is the capital of France?")]
+
+
+def test_normalize_question_text():
+    assert normalize_question_text("  What's  the CAPITAL of France?? ") == "what s the capital of france"
+
+
+def test_deduplicator_rejects_exact_and_near_duplicates():
+    dedup = QuestionDeduplicator(threshold=0.85)
+    assert dedup.add("What is the capital of France?")
+    assert not dedup.add("what is the capital of france")
+    assert not dedup.add("What is the capital city of France?")
+    assert dedup.add("Which river flows through Paris?")
+    assert len(dedup) == 2
+
+
+def test_allocate_questions_spreads_remainder():
+    assert allocate_questions(10, 3) == [4, 3, 3]
+    assert sum(allocate_questions(7, 7)) == 7
+
+
+def test_generate_question_pool_batches_dedupes_and_caps_concurrency():
+    generator = FakeGenerator()
+
+    async def _run():
+        return await generate_question_pool(
+            chunks=["alpha", "beta", "gamma", "delta"],
+            difficulty=QuizDifficulty.easy,
+            target=20,
+            generator=generator,
+            per_call=5,
+            concurrency=2,
+            deduplicator=QuestionDeduplicator(threshold=0.99),
+        )
+
+    pool = asyncio.run(_run())
+
+    assert len(pool) == 20
+    # --- One call per section: 5 questions each, not one call per question ---
+    assert generator.calls == 4
+    assert generator.max_in_flight <= 2
+    assert sum(q.question == "What is the capital of France?" for q in pool) <= 1
+    assert {q.source_chunk for q in pool} == {0, 1, 2, 3}
+
+
+class FakePoolRepository:
+    def __init__(self, pool=None):
+        self.pool = pool
+        self.lookups: list[dict] = []
+        self.saved: dict | None = None
+
+    async def get_pool(self, db, **key):
+        self.lookups.append(key)
+        return self.pool
+
+    async def save_pool(self, db, **values):
+        self.saved = values
+        return SimpleNamespace(**values)
+
+
+class FakeJobs:
+    def __init__(self):
+        self.enqueued: list[dict] = []
+
+    async def enqueue_job(self, db, **kwargs):
+        self.enqueued.append(kwargs)
+        return SimpleNamespace(id=uuid.uuid4(), **kwargs)
+
+
+def _pool(count: int, *, exhausted: bool = False):
+    questions = [_q(f"Pool question {i}?").model_dump(mode="json") for i in range(count)]
+    return SimpleNamespace(questions=questions, exhausted=exhausted)
+
+
+def _request(num_questions: int = 5) -> QuizGenerateRequest:
+    return QuizGenerateRequest(document_id=uuid.uuid4(), num_questions=num_questions, chunks=["alpha", "beta"])
+
+
+def test_request_quiz_queues_a_deduplicated_job_keyed_on_the_source():
+    repo, jobs = FakePoolRepository(_pool(2)), FakeJobs()
+    payload = _request()
+
+    job = asyncio.run(QuizzesService(repo, jobs).request_quiz(None, owner_id=uuid.uuid4(), payload=payload))
+
+    fingerprint = source_fingerprint(payload.chunks)
+    assert repo.lookups[0]["source_fingerprint"] == fingerprint
+    assert job.kind == GENERATE_JOB_KIND
+    assert job.dedupe_key == f"{payload.document_id}:medium:{fingerprint}"
+
+
+def test_request_quiz_serves_an_exhausted_pool_short():
+    jobs = FakeJobs()
+    service = QuizzesService(FakePoolRepository(_pool(3, exhausted=True)), jobs)
+
+    result = asyncio.run(service.request_quiz(None, owner_id=uuid.uuid4(), payload=_request(5)))
+
+    assert isinstance(result, QuizOut) and len(result.questions) == 3
+    assert jobs.enqueued == []
+
+
+def test_request_quiz_rejects_an_empty_exhausted_pool():
+    service = QuizzesService(FakePoolRepository(_pool(0, exhausted=True)), FakeJobs())
+
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(service.request_quiz(None, owner_id=uuid.uuid4(), payload=_request()))
+    assert exc.value.status_code == 422
+
+
+def test_build_pool_marks_a_stalled_pool_exhausted():
+    class StallingGenerator:
+        async def generate(self, *, chunk, difficulty, count, avoid):
+            return [_q("The only question there is?")]
+
+    repo = FakePoolRepository()
+    pool = asyncio.run(
+        QuizzesService(repo, FakeJobs()).build_pool(
+            None,
+            document_id=uuid.uuid4(),
+            difficulty=QuizDifficulty.easy,
+            chunks=["alpha"],
+            num_questions=5,
+            generator=StallingGenerator(),
+        )
+    )
+
+    assert len(pool.questions) == 1
+    assert pool.exhausted is True
@@ -0,0 +1,126 @@
+import array
+import asyncio
+
+import pytest
+from fastapi import FastAPI, WebSocket
+from fastapi.testclient import TestClient
+
+from app.modules.voice.audio import EnergyVAD, RingBuffer, UtteranceSegmenter
+from app.modules.voice.latency import LatencyRecorder, percentile
+from app.modules.voice.service import DropPolicy, DropQueue, VoiceService
+
+FRAME_SAMPLES = 160  # --- 20 ms at 8 kHz ---
+
+
+def _frames(amplitude: int, count: int) -> bytes:
+    return array.array("h", [amplitude, -amplitude] * (FRAME_SAMPLES // 2) * count).tobytes()
+
+
+def _segmenter() -> UtteranceSegmenter:
+    return UtteranceSegmenter(
+        sample_rate=8000,
+        frame_ms=20,
+        vad=EnergyVAD(threshold=500),
+        start_ms=40,
+        hangover_ms=60,
+        preroll_ms=40,
+        max_utterance_ms=1000,
+        inbound_buffer_ms=500,
+    )
+
+
+def test_ring_buffer_wraps_and_overwrites_oldest():
+    ring = RingBuffer(8)
+    assert ring.write(b"abcdef") == 0
+    out = bytearray(4)
+    assert ring.read_into(out) == 4 and out == b"abcd"
+    assert ring.write(b"123456789") == 3  # --- 2 old bytes + 1 byte of the oversized write ---
+    out = bytearray(8)
+    assert ring.read_into(out) == 8 and out == b"23456789"
+    assert len(ring) == 0
+
+
+def test_segmenter_emits_utterance_with_preroll_after_hangover():
+    seg = _segmenter()
+    frame_bytes = FRAME_SAMPLES * 2
+    audio = _frames(0, 5) + _frames(3000, 10) + _frames(0, 3)
+
+    # --- Feed in odd-sized pieces: framing must not depend on message boundaries ---
+    utterances = []
+    for start in range(0, len(audio), 333):
+        utterances += seg.feed(audio[start:start + 333])
+
+    assert len(utterances) == 1
+    utterance = utterances[0]
+    # --- 2 pre-roll silent frames + 10 voiced + 3 hangover frames ---
+    assert utterance.length == 15 * frame_bytes
+    assert not utterance.forced
+    assert EnergyVAD.rms(utterance.audio[2 * frame_bytes:3 * frame_bytes]) >= 500
+    utterance.release()
+    assert seg.pool.acquire() is utterance.buffer
+
+
+def test_drop_queue_policies():
+    async def _run():
+        dropped = []
+        oldest = DropQueue(2, DropPolicy.drop_oldest, on_drop=dropped.append)
+        for i in range(4):
+            oldest.put_nowait(i)
+        newest = DropQueue(2, DropPolicy.drop_newest)
+        for i in range(4):
+            newest.put_nowait(i)
+        oldest.close()
+        return dropped, [await oldest.get(), await oldest.get(), await oldest.get()], await newest.get()
+
+    dropped, drained, first = asyncio.run(_run())
+    assert dropped == [0, 1]
+    assert drained == [2, 3, None]
+    assert first == 0
+
+
+def test_percentiles():
+    recorder = LatencyRecorder(window=100)
+    for ms in range(1, 101):
+        recorder.record(ms / 1000)
+    snap = recorder.snapshot()
+    assert round(snap["p50_ms"]) == 50 and round(snap["p99_ms"]) == 99
+    assert percentile([], 50) == 0.0
+
+
+def test_websocket_echoes_utterance_and_records_latency(monkeypatch):
+    from app.core.config import get_settings
+
+    settings = get_settings()
+    monkeypatch.setattr(settings, "voice_sample_rate", 8000)
+    monkeypatch.setattr(settings, "voice_vad_hangover_ms", 60)
+    service = VoiceService()
+
+    app = FastAPI()
+
+    @app.websocket("/ws")
+    async def ws(websocket: WebSocket):
+        await service.run_session(websocket)
+
+    speech = _frames(3000, 10)
+    with TestClient(app).websocket_connect("/ws") as client:
+        client.send_bytes(_frames(0, 2) + speech + _frames(0, 5))
+        received = b""
+        # --- Reply = pre-roll + speech + hangover frames ---
+        while len(received) < len(speech) + 5 * FRAME_SAMPLES * 2:
+            received += client.receive_bytes()
+
+    assert speech in received
+    assert service.stats()["count"] == 1
+
+
+def test_latency_endpoint_is_off_by_default(monkeypatch):
+    from fastapi import HTTPException
+
+    from app.core.config import get_settings
+    from app.modules.voice.router import require_latency_stats
+
+    with pytest.raises(HTTPException) as exc:
+        require_latency_stats()
+    assert exc.value.status_code == 404
+    monkeypatch.setattr(get_settings(), "voice_latency_stats_enabled", True)
+    require_latency_stats()
@@ -0,0 +1,168 @@
+import asyncio
+
+import pytest
+
+from app.services.artifacts import (
+    ArtifactIntegrityError,
+    ArtifactNotFoundError,
+    ArtifactRegistry,
+    canonical_json,
+    content_hash,
+)
+from app.services.storage import LocalStorage
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeProgram:
+    """
+        Stands in for a dspy.Module: only dump_state/load_state are used by the registry.
+    """
+    built = 0
+
+    def __init__(self, state=None) -> None:
+        FakeProgram.built += 1
+        self.state = state
+
+    def dump_state(self):
+        return self.state
+
+    def load_state(self, state):
+        self.state = state
+
+
+def test_publish_is_content_addressed_and_idempotent(tmp_path):
+    registry = ArtifactRegistry(LocalStorage(tmp_path))
+
+    async def _run():
+        first = await registry.publish_prompt("quiz.generate", "Write {n} questions about {topic}.")
+        again = await registry.publish_prompt("quiz.generate", "Write {n} questions about {topic}.")
+        return first, again
+
+    first, again = asyncio.run(_run())
+    assert first == again
+    assert first.version == content_hash(
+        canonical_json({"kind": "prompt", "template": "Write {n} questions about {topic}."})
+    )
+    assert (tmp_path / "artifacts" / "quiz.generate" / f"{first.version}.json").exists()
+
+
+def test_get_prompt_or_falls_back_until_a_template_is_promoted(tmp_path):
+    clock = FakeClock()
+    storage = LocalStorage(tmp_path)
+    publisher = ArtifactRegistry(storage)
+    worker = ArtifactRegistry(storage, pointer_ttl=60, clock=clock)
+
+    async def _run():
+        before = await worker.get_prompt_or("quiz.generate", "built-in")
+        await publisher.publish_prompt("quiz.generate", "published")
+        # --- The miss is cached like a pointer: picked up once the TTL lapses ---
+        cached = await worker.get_prompt_or("quiz.generate", "built-in")
+        clock.now += 61
+        after = await worker.get_prompt_or("quiz.generate", "built-in")
+        return before, cached, after
+
+    assert asyncio.run(_run()) == ("built-in", "built-in", "published")
+
+
+def test_summarizer_renders_the_promoted_prompt(tmp_path):
+    from types import SimpleNamespace
+
+    from app.modules.conversations.context import SUMMARY_PROMPT_NAME, GeminiSummarizer
+    from app.modules.conversations.schemas import ContextMessage
+
+    sent = []
+
+    async def _generate_content(*, model, contents, config):
+        sent.append(contents)
+        return SimpleNamespace(text=" summary ")
+
+    clock = FakeClock()
+    registry = ArtifactRegistry(LocalStorage(tmp_path), clock=clock)
+    summarizer = GeminiSummarizer(model="m", api_key="k", registry=registry)
+    summarizer._client = SimpleNamespace(aio=SimpleNamespace(models=SimpleNamespace(generate_content=_generate_content)))
+    turns = [ContextMessage(role="user", content="hello")]
+
+    async def _run():
+        await summarizer.summarize(summary="", messages=turns, max_tokens=10)
+        await registry.publish_prompt(SUMMARY_PROMPT_NAME, "S={summary} T={transcript}")
+        clock.now += 61
+        return await summarizer.summarize(summary="old", messages=turns, max_tokens=10)
+
+    assert asyncio.run(_run()) == "summary"
+    assert sent[0].startswith("You maintain the running summary") and sent[0].endswith("USER: hello")
+    assert sent[1] == "S=old T=USER: hello"
+
+def test_workers_share_the_promoted_program_and_load_it_once(tmp_path):
+    clock = FakeClock()
+    storage = LocalStorage(tmp_path)
+    compiler = ArtifactRegistry(storage)
+    worker = ArtifactRegistry(storage, pointer_ttl=60, clock=clock)
+
+    async def _run():
+        v1 = await compiler.save_program("podcast.script", FakeProgram({"demos": [1]}))
+        FakeProgram.built = 0
+        programs = await asyncio.gather(*(worker.load_program("podcast.script", FakeProgram) for _ in range(5)))
+        assert all(program is programs[0] for program in programs)
+        assert programs[0].state == {"demos": [1]}
+        assert (FakeProgram.built, worker.loads) == (1, 1)
+
+        # --- A newly promoted version is picked up once the pointer TTL lapses ---
+        v2 = await compiler.save_program("podcast.script", FakeProgram({"demos": [1, 2]}))
+        assert (await worker.resolve("podcast.script")).version == v1.version
+        clock.now += 61
+        assert (await worker.resolve("podcast.script")).version == v2.version
+        return await worker.load_program("podcast.script", FakeProgram)
+
+    assert asyncio.run(_run()).state == {"demos": [1, 2]}
+
+
+def test_pins_and_integrity_checks(tmp_path):
+    storage = LocalStorage(tmp_path)
+    registry = ArtifactRegistry(storage)
+
+    async def _run():
+        old = await registry.publish_prompt("flashcards", "v1")
+        await registry.publish_prompt("flashcards", "v2")
+        pinned = ArtifactRegistry(storage, pins={"flashcards": old.version})
+        assert await pinned.get_prompt("flashcards") == "v1"
+
+        with pytest.raises(ArtifactNotFoundError):
+            await pinned.resolve("missing")
+
+        (tmp_path / "artifacts" / "flashcards" / f"{old.version}.json").write_bytes(b'{"tampered": true}')
+        with pytest.raises(ArtifactIntegrityError):
+            await ArtifactRegistry(storage).get_bytes(old)
+
+    asyncio.run(_run())
+
+
+def test_real_dspy_program_round_trips(tmp_path):
+    dspy = pytest.importorskip("dspy")
+    registry = ArtifactRegistry(LocalStorage(tmp_path))
+
+    compiled = dspy.Predict("question -> answer")
+    compiled.demos = [dspy.Example(question="2+2?", answer="4").with_inputs("question")]
+
+    async def _run():
+        await registry.save_program("qa", compiled)
+        # --- A fresh registry: state comes back from storage, not the in-process cache ---
+        return await ArtifactRegistry(LocalStorage(tmp_path)).load_program(
+            "qa", lambda: dspy.Predict("question -> answer")
+        )
+
+    loaded = asyncio.run(_run())
+    assert loaded.dump_state() == compiled.dump_state()
+    assert [dict(demo) for demo in loaded.demos] == [{"question": "2+2?", "answer": "4"}]
+
+
+def test_non_json_state_is_rejected(tmp_path):
+    registry = ArtifactRegistry(LocalStorage(tmp_path))
+    with pytest.raises(TypeError):
+        asyncio.run(registry.save_program("bad", FakeProgram({"demo": object()})))